@@ -0,0 +1,99 @@
+"""
+Cache of data retrieved from remote services, which serves stale data while it is being refreshed.
+
+Each value is cached along with the time at which it should be refreshed. Once that time has passed, the first
+worker to read the value takes a short-lived lock and refreshes it, while all other workers keep being served the
+stale value. Values are only dropped once they have been stale for longer than their stale timeout, so popular
+entries never expire all at once. Items which the service reports as missing are cached as well, for a shorter
+time, so that lookups of unknown items do not all reach the service.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Value of the items which do not exist.
+MISSING = object()
+
+
+def _get_metadata_key(key):
+    return '{}_metadata'.format(key)
+
+
+def _get_lock_key(key):
+    return '{}_refresh_lock'.format(key)
+
+
+def get_many(keys, fetch, timeout, stale_timeout, negative_timeout):
+    """ Returns the cached values of several items, retrieving those which are not cached or are due for a refresh.
+
+    The lock taken to refresh a stale value is not released, and expires after CACHE_REFRESH_LOCK_TIMEOUT seconds;
+    if the refresh fails, the stale value is served, and refreshed again at most once per lock timeout.
+
+    Arguments:
+        keys (dict): Cache keys, keyed by the item (e.g. course key) whose value they hold.
+        fetch (callable): Called with the list of items to retrieve. Returns their values, keyed by item; the value
+            of items which do not exist is MISSING. Items which could not be retrieved are left out.
+        timeout (int): Number of seconds after which a value is refreshed.
+        stale_timeout (int): Number of seconds during which a value due for a refresh may still be served.
+        negative_timeout (int): Number of seconds during which an item is known not to exist.
+
+    Returns:
+        dict: Values keyed by item. Items which are neither cached nor could be retrieved are left out.
+    """
+    cached = cache.get_many(list(keys.values()) + [_get_metadata_key(key) for key in keys.values()])
+    now = time.time()
+
+    values = {}
+    items_to_fetch = []
+    for item, key in keys.items():
+        metadata = cached.get(_get_metadata_key(key))
+        if metadata and metadata['missing']:
+            values[item] = MISSING
+            continue
+
+        value = cached.get(key)
+        if value is None:
+            items_to_fetch.append(item)
+            continue
+
+        values[item] = value
+        # Values cached without metadata are considered stale.
+        if metadata is None or metadata['refresh_at'] <= now:
+            if cache.add(_get_lock_key(key), True, settings.CACHE_REFRESH_LOCK_TIMEOUT):
+                items_to_fetch.append(item)
+
+    if items_to_fetch:
+        fetched = fetch(items_to_fetch)
+        set_many(keys, fetched, timeout, stale_timeout, negative_timeout)
+        values.update(fetched)
+
+    return values
+
+
+def set_many(keys, values, timeout, stale_timeout, negative_timeout):
+    """ Caches the values of several items, to be served by get_many.
+
+    Arguments:
+        keys (dict): Cache keys, keyed by the item whose value they hold.
+        values (dict): Values keyed by item; the value of items which do not exist is MISSING.
+        timeout (int): Number of seconds after which a value is refreshed.
+        stale_timeout (int): Number of seconds during which a value due for a refresh may still be served.
+        negative_timeout (int): Number of seconds during which an item is known not to exist.
+    """
+    now = time.time()
+    found = {}
+    missing = {}
+    for item, value in values.items():
+        key = keys[item]
+        if value is MISSING:
+            missing[_get_metadata_key(key)] = {'missing': True, 'refresh_at': now + negative_timeout}
+        else:
+            found[key] = value
+            found[_get_metadata_key(key)] = {'missing': False, 'refresh_at': now + timeout}
+
+    if found:
+        cache.set_many(found, timeout + stale_timeout)
+    if missing:
+        cache.set_many(missing, negative_timeout)
+        cache.delete_many([keys[item] for item, value in values.items() if value is MISSING])
@@ -0,0 +1,102 @@
+"""
+Factory of REST API clients which reuse keep-alive HTTP sessions across requests.
+
+Building an EdxRestApiClient is cheap, but each new client otherwise opens a new HTTP session, paying for a TCP
+(and TLS) handshake on every call to the LMS or the Course Catalog. Sessions are instead kept per process, keyed by
+site, service and the principal the calls are made on behalf of. Since a client sets the authentication of its
+session, sessions are never shared between principals.
+"""
+from collections import OrderedDict
+import threading
+
+from django.conf import settings
+from edx_rest_api_client.client import EdxRestApiClient
+import requests
+from requests.adapters import HTTPAdapter
+
+# Principal of the calls authenticated with the JWT of a site's service user.
+SERVICE_USER_PRINCIPAL = 'service-user'
+
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=settings.API_CLIENT_POOL_SIZE, pool_maxsize=settings.API_CLIENT_POOL_SIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(site, service, principal):
+    """ Returns the HTTP session used for calls to a service, made on behalf of a principal, for a site.
+
+    At most API_CLIENT_MAX_SESSIONS sessions are kept; the least recently used session is closed
+    when the limit is exceeded.
+
+    Arguments:
+        site (Site): Site the calls are made for, or None.
+        service (str): Name of the called service (e.g. 'lms_credit', 'catalog').
+        principal (str): Identity the calls are authenticated as, or None for anonymous calls.
+
+    Returns:
+        requests.Session
+    """
+    key = (site.id if site else None, service, principal)
+
+    with _sessions_lock:
+        session = _sessions.pop(key, None)
+        if session is None:
+            session = _create_session()
+
+        _sessions[key] = session
+
+        while len(_sessions) > settings.API_CLIENT_MAX_SESSIONS:
+            __, evicted = _sessions.popitem(last=False)
+            evicted.close()
+
+    return session
+
+
+def get_api_client(url, site, service, jwt=None, oauth_access_token=None, timeout=None, **kwargs):
+    """ Returns an EdxRestApiClient which reuses the session of the given site, service and credentials.
+
+    Clients authenticated with a JWT are assumed to act on behalf of the site's service user; the session of
+    such clients is shared, and its authentication is refreshed with the token given to each new client.
+    Clients authenticated with an OAuth access token are given a session of their own.
+
+    Arguments:
+        url (str): Root URL of the API.
+        site (Site): Site the calls are made for, or None.
+        service (str): Name of the called service.
+
+    Keyword Arguments:
+        jwt (str): JWT of the site's service user.
+        oauth_access_token (str): OAuth access token of a user.
+        timeout (int): Request timeout, in seconds. Defaults to API_CLIENT_TIMEOUT.
+
+    Returns:
+        EdxRestApiClient
+    """
+    if jwt:
+        principal = SERVICE_USER_PRINCIPAL
+    else:
+        principal = oauth_access_token
+
+    return EdxRestApiClient(
+        url,
+        jwt=jwt,
+        oauth_access_token=oauth_access_token,
+        timeout=timeout or settings.API_CLIENT_TIMEOUT,
+        session=get_session(site, service, principal),
+        **kwargs
+    )
+
+
+def close_sessions():
+    """ Closes, and forgets, all sessions kept by this process. """
+    with _sessions_lock:
+        while _sessions:
+            __, session = _sessions.popitem()
+            session.close()
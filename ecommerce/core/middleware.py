@@ -0,0 +1,78 @@
+"""
+Middleware for the core app
+
+Note:
+    SiteConfigurationMiddleware depends on "django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware"
+    middleware. So it must be added after this middleware in django settings files.
+"""
+from django.contrib.sites.models import Site
+
+from ecommerce.core.models import SiteConfiguration
+
+
+class SiteConfigurationMiddleware(object):
+    """
+    Middleware that attaches the cached configuration of the current site to `request.site`,
+    so that `request.site.siteconfiguration` (and its partner) can be read without querying the database.
+    """
+
+    def process_request(self, request):
+        site = getattr(request, 'site', None)
+        if site is None:
+            return
+
+        try:
+            site_configuration = SiteConfiguration.get_for_site(site)
+        except SiteConfiguration.DoesNotExist:
+            return
+
+        setattr(site, Site.siteconfiguration.cache_name, site_configuration)
+
+
+def defer_signal(current_request, signal, sender, **kwargs):
+    """
+    Sends a signal once the response to the request is ready, or right away if the request is not handled by
+    DeferredSignalsMiddleware.
+
+    Arguments:
+        current_request (Request): Request during which the signal is sent.
+        signal (Signal): Signal to send.
+        sender: Sender of the signal.
+        **kwargs: Arguments given to the receivers of the signal, which may include the request.
+    """
+    deferred_signals = getattr(current_request, 'deferred_signals', None)
+    if deferred_signals is None:
+        signal.send(sender=sender, **kwargs)
+    else:
+        deferred_signals.append((signal, sender, kwargs))
+
+
+class DeferredSignalsMiddleware(object):
+    """
+    Middleware that sends the signals deferred with `defer_signal` once the response is ready.
+
+    Views run in a transaction (ATOMIC_REQUESTS), which is committed before response middleware runs. Receivers of
+    deferred signals thus see the committed data, and do not hold the transaction of the view open.
+
+    The signals of views which raise an exception are not sent, since their transaction is rolled back. Neither are
+    those of views which return an error response: views may handle errors themselves and roll their transaction
+    back, as Django REST framework does for API exceptions, and the rollback is no longer visible once the
+    response is ready.
+    """
+
+    def process_request(self, request):
+        request.deferred_signals = []
+
+    def process_exception(self, request, exception):  # pylint: disable=unused-argument
+        request.deferred_signals = []
+
+    def process_response(self, request, response):
+        deferred_signals = getattr(request, 'deferred_signals', None) or []
+        if response.status_code >= 400:
+            deferred_signals = []
+
+        # Signals deferred from here on, e.g. by receivers, are sent right away.
+        request.deferred_signals = None
+        for signal, sender, kwargs in deferred_signals:
+            signal.send(sender=sender, **kwargs)
+        return response
@@ -1,6 +1,8 @@
 import datetime
 import logging
+import time
 from urlparse import urljoin
+import uuid
 
 from analytics import Client as SegmentClient
 from django.conf import settings
@@ -16,9 +18,10 @@ from jsonfield.fields import JSONField
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberBaseException
 
-from ecommerce.courses.utils import mode_for_seat
+from ecommerce.core.clients import get_api_client
+from ecommerce.courses.utils import get_enrollment_status_cache_key, mode_for_seat
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class_by_name, get_processor_class
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name, get_processor_classes
 
 log = logging.getLogger(__name__)
 
@@ -88,9 +91,54 @@ class SiteConfiguration(models.Model):
         default="support@example.com"
     )
 
+    # SiteConfigurations (with their Partners) loaded by this process, keyed by Site ID. Each entry is stored along
+    # with the shared-cache version it was loaded at, and is reloaded once the version changes.
+    _site_configurations = {}
+
     class Meta(object):
         unique_together = ('site', 'partner')
 
+    @classmethod
+    def _get_version_cache_key(cls, site_id):
+        return 'siteconfiguration_version_{}'.format(site_id)
+
+    @classmethod
+    def get_for_site(cls, site):
+        """ Returns the SiteConfiguration, with its Partner, of the given Site.
+
+        Configurations are kept in memory by each process, and shared across requests. A configuration is reloaded
+        from the database only after it is saved, by any process, or when its version is evicted from the cache.
+
+        Arguments:
+            site (Site): Site whose configuration should be returned.
+
+        Returns:
+            SiteConfiguration
+
+        Raises:
+            SiteConfiguration.DoesNotExist: If the Site is not configured.
+        """
+        key = cls._get_version_cache_key(site.id)
+        version = cache.get(key)
+        if version is None:
+            # Versions are never reused, so that configurations loaded before an eviction are not mistaken as current.
+            cache.add(key, uuid.uuid4().hex, None)
+            version = cache.get(key)
+
+        cached = cls._site_configurations.get(site.id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        site_configuration = cls.objects.select_related('site', 'partner').get(site_id=site.id)
+        cls._site_configurations[site.id] = (version, site_configuration)
+        return site_configuration
+
+    @classmethod
+    def invalidate_site_configuration(cls, site_id):
+        """ Forces all processes to reload the configuration of the given Site on next use. """
+        cls._site_configurations.pop(site_id, None)
+        cache.set(cls._get_version_cache_key(site_id), uuid.uuid4().hex, None)
+
     @property
     def payment_processors_set(self):
         """
@@ -123,27 +171,59 @@ class SiteConfiguration(models.Model):
                 )
                 raise ValidationError(exc.message)
 
+    PAYMENT_PROCESSORS_VERSION_CACHE_KEY = 'siteconfiguration_payment_processors_version'
+
+    def _get_payment_processors_cache_key(self):
+        """ Returns the key of the cached enabled processors, under the current version of the processor switches. """
+        version = cache.get(self.PAYMENT_PROCESSORS_VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(self.PAYMENT_PROCESSORS_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = cache.get(self.PAYMENT_PROCESSORS_VERSION_CACHE_KEY)
+
+        return 'siteconfiguration_payment_processors_{}_{}_{}'.format(
+            self.id,
+            version,
+            ','.join(sorted(self.payment_processors_set))
+        )
+
     def get_payment_processors(self):
         """
         Returns payment processor classes enabled for the corresponding Site
 
+        The names of the processors enabled for saved configurations are cached for
+        PAYMENT_PROCESSORS_CACHE_TIMEOUT seconds, along with the configured processors. The cache is
+        cleared when a payment processor switch is toggled.
+
         Returns:
             list[BasePaymentProcessor]: Returns payment processor classes enabled for the corresponding Site
         """
-        all_processors = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
-        all_processor_names = {processor.NAME for processor in all_processors}
+        all_processors = get_processor_classes()
+        key = self._get_payment_processors_cache_key() if self.pk else None
+        enabled_processor_names = cache.get(key) if key else None
+
+        if enabled_processor_names is None:
+            all_processor_names = {processor.NAME for processor in all_processors}
+
+            missing_processor_configurations = self.payment_processors_set - all_processor_names
+            if missing_processor_configurations:
+                processor_config_repr = ", ".join(missing_processor_configurations)
+                log.warning(
+                    'Unknown payment processors [%s] are configured for site %s', processor_config_repr, self.site.id
+                )
+
+            enabled_processor_names = [
+                processor.NAME for processor in all_processors
+                if processor.NAME in self.payment_processors_set and processor.is_enabled()
+            ]
+            if key:
+                cache.set(key, enabled_processor_names, settings.PAYMENT_PROCESSORS_CACHE_TIMEOUT)
 
-        missing_processor_configurations = self.payment_processors_set - all_processor_names
-        if missing_processor_configurations:
-            processor_config_repr = ", ".join(missing_processor_configurations)
-            log.warning(
-                'Unknown payment processors [%s] are configured for site %s', processor_config_repr, self.site.id
-            )
+        return [processor for processor in all_processors if processor.NAME in enabled_processor_names]
 
-        return [
-            processor for processor in all_processors
-            if processor.NAME in self.payment_processors_set and processor.is_enabled()
-        ]
+    @classmethod
+    def clear_payment_processors_cache(cls):
+        """ Clears the cached lists of enabled payment processors of all sites. """
+        cache.set(cls.PAYMENT_PROCESSORS_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
 
     def get_from_email(self):
         """
@@ -168,6 +248,7 @@ class SiteConfiguration(models.Model):
         # Clear Site cache upon SiteConfiguration changed
         Site.objects.clear_cache()
         super(SiteConfiguration, self).save(*args, **kwargs)
+        SiteConfiguration.invalidate_site_configuration(self.site_id)
 
     def build_ecommerce_url(self, path=''):
         """
@@ -214,6 +295,38 @@ class SiteConfiguration(models.Model):
         """ Returns the URL for the OAuth 2.0 provider. """
         return self.build_lms_url('/oauth2')
 
+    def _get_access_token_cache_keys(self):
+        return (
+            'siteconfiguration_access_token_{}'.format(self.id),
+            'siteconfiguration_access_token_refresh_lock_{}'.format(self.id),
+        )
+
+    def _refresh_access_token(self):
+        """ Retrieves a new access token from the OAuth provider, and caches it for its lifetime.
+
+        Returns:
+            str: JWT access token
+        """
+        url = '{root}/access_token'.format(root=self.oauth2_provider_url)
+        access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
+            url,
+            self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],  # pylint: disable=unsubscriptable-object
+            self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],  # pylint: disable=unsubscriptable-object
+            token_type='jwt'
+        )
+
+        now = datetime.datetime.utcnow()
+        expires = int((expiration_datetime - now).total_seconds())
+
+        # Refresh ahead of expiration, but no earlier than half-way through the token's lifetime.
+        refresh_after = max(expires - settings.ACCESS_TOKEN_REFRESH_MARGIN, expires / 2)
+        refresh_datetime = now + datetime.timedelta(seconds=refresh_after)
+
+        key, __ = self._get_access_token_cache_keys()
+        cache.set(key, (access_token, refresh_datetime), expires)
+
+        return access_token
+
     @property
     def access_token(self):
         """ Returns an access token for this site's service user.
@@ -222,37 +335,50 @@ class SiteConfiguration(models.Model):
         The token is cached for the lifetime of the token, as specified by the OAuth provider's response. The token
         type is JWT.
 
+        Tokens are refreshed ACCESS_TOKEN_REFRESH_MARGIN seconds ahead of their expiration. A lock in the shared
+        cache ensures a single process retrieves a token, while others keep using the cached, still valid, token,
+        or wait for the new token if none is cached. The lock is released once a token is retrieved. If retrieving
+        the token fails, the lock is kept until it times out, so that processes do not all retry at once.
+
         Returns:
             str: JWT access token
         """
-        key = 'siteconfiguration_access_token_{}'.format(self.id)
-        access_token = cache.get(key)
-
-        # pylint: disable=unsubscriptable-object
-        if not access_token:
-            url = '{root}/access_token'.format(root=self.oauth2_provider_url)
-            access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
-                url,
-                self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],
-                self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],
-                token_type='jwt'
-            )
-
-            expires = (expiration_datetime - datetime.datetime.utcnow()).seconds
-            cache.set(key, access_token, expires)
+        key, lock_key = self._get_access_token_cache_keys()
+        timeout = settings.ACCESS_TOKEN_REFRESH_LOCK_TIMEOUT
+        cached = cache.get(key)
+
+        while not isinstance(cached, tuple):
+            if cache.add(lock_key, True, timeout):
+                access_token = self._refresh_access_token()
+                cache.delete(lock_key)
+                return access_token
+
+            time.sleep(settings.ACCESS_TOKEN_REFRESH_POLL_INTERVAL)
+            cached = cache.get(key)
+
+        access_token, refresh_datetime = cached
+        if datetime.datetime.utcnow() >= refresh_datetime and cache.add(lock_key, True, timeout):
+            try:
+                access_token = self._refresh_access_token()
+                cache.delete(lock_key)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Failed to refresh the access token of site [%d]. The cached token will be used.',
+                              self.site_id)
 
         return access_token
 
-    @cached_property
+    @property
     def course_catalog_api_client(self):
         """
         Returns an API client to access the Course Catalog service.
 
+        The client reuses this site's Course Catalog session, and is authenticated with the current access token.
+
         Returns:
             EdxRestApiClient: The client to access the Course Catalog service.
         """
 
-        return EdxRestApiClient(settings.COURSE_CATALOG_API_URL, jwt=self.access_token)
+        return get_api_client(settings.COURSE_CATALOG_API_URL, self.site, 'catalog', jwt=self.access_token)
 
 
 class User(AbstractUser):
@@ -276,6 +402,71 @@ class User(AbstractUser):
     def get_full_name(self):
         return self.full_name or super(User, self).get_full_name()
 
+    def get_enrollment_statuses(self, request, course_keys):
+        """
+        Returns the status of the user's enrollments in the given courses.
+
+        Statuses are cached for ENROLLMENT_STATUS_CACHE_TIMEOUT seconds, and updated when enrollments are
+        fulfilled or revoked. Statuses missing from the cache are retrieved from the LMS enrollment API, with
+        a single call for all courses.
+
+        Arguments:
+            request (WSGIRequest): the request from which the LMS enrollment API endpoint is created.
+            course_keys (list): keys of the courses whose enrollment status should be returned.
+
+        Returns:
+            dict: Enrollment status (a dict with `mode` and `is_active` keys, or an empty dict if the user
+                has never been enrolled), keyed by course key.
+
+        Raises:
+            ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+            connection with the LMS enrollment API endpoint.
+        """
+        cache_keys = {get_enrollment_status_cache_key(self.username, course_key): course_key
+                      for course_key in course_keys}
+        statuses = {cache_keys[key]: status for key, status in cache.get_many(cache_keys.keys()).items()}
+        missing_course_keys = [course_key for course_key in course_keys if course_key not in statuses]
+
+        if missing_course_keys:
+            try:
+                api = get_api_client(
+                    request.site.siteconfiguration.build_lms_url('/api/enrollment/v1'),
+                    request.site,
+                    'lms_enrollment',
+                    oauth_access_token=self.access_token,
+                    append_slash=False
+                )
+
+                if len(missing_course_keys) == 1:
+                    course_key = missing_course_keys[0]
+                    enrollments = {course_key: api.enrollment(','.join([self.username, course_key])).get()}
+                else:
+                    enrollments = {
+                        enrollment['course_details']['course_id']: enrollment
+                        for enrollment in api.enrollment.get(user=self.username)
+                    }
+            except (ConnectionError, SlumberBaseException, Timeout) as ex:
+                log.exception(
+                    'Failed to retrieve enrollment details for [%s] in course [%s], Because of [%s]',
+                    self.username,
+                    ', '.join(missing_course_keys),
+                    ex,
+                )
+                raise ex
+
+            fetched = {}
+            for course_key in missing_course_keys:
+                enrollment = enrollments.get(course_key)
+                status = {}
+                if enrollment:
+                    status = {'mode': enrollment.get('mode'), 'is_active': enrollment.get('is_active')}
+                fetched[get_enrollment_status_cache_key(self.username, course_key)] = status
+                statuses[course_key] = status
+
+            cache.set_many(fetched, settings.ENROLLMENT_STATUS_CACHE_TIMEOUT)
+
+        return statuses
+
     def is_user_already_enrolled(self, request, seat):
         """
         Check if a user is already enrolled in the course.
@@ -294,21 +485,7 @@ class User(AbstractUser):
             connection with the LMS enrollment API endpoint.
         """
         course_key = seat.attr.course_key
-        try:
-            api = EdxRestApiClient(
-                request.site.siteconfiguration.build_lms_url('/api/enrollment/v1'),
-                oauth_access_token=self.access_token,
-                append_slash=False
-            )
-            status = api.enrollment(','.join([self.username, course_key])).get()
-        except (ConnectionError, SlumberBaseException, Timeout) as ex:
-            log.exception(
-                'Failed to retrieve enrollment details for [%s] in course [%s], Because of [%s]',
-                self.username,
-                course_key,
-                ex,
-            )
-            raise ex
+        status = self.get_enrollment_statuses(request, [course_key])[course_key]
 
         seat_type = mode_for_seat(seat)
         if status and status.get('mode') == seat_type and status.get('is_active'):
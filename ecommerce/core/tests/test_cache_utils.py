@@ -0,0 +1,66 @@
+import time
+
+import mock
+from django.core.cache import cache
+
+from ecommerce.core import cache_utils
+from ecommerce.tests.testcases import TestCase
+
+TIMEOUT = 60
+STALE_TIMEOUT = 600
+NEGATIVE_TIMEOUT = 10
+
+
+class CacheUtilsTests(TestCase):
+    def setUp(self):
+        super(CacheUtilsTests, self).setUp()
+        cache.clear()
+        self.keys = {'a': 'test_cache_utils_a', 'b': 'test_cache_utils_b'}
+
+    def get_many(self, fetch, keys=None):
+        return cache_utils.get_many(keys or self.keys, fetch, TIMEOUT, STALE_TIMEOUT, NEGATIVE_TIMEOUT)
+
+    def test_get_many(self):
+        """ Verify uncached items are fetched in a single call, and cached. """
+        fetch = mock.Mock(return_value={'a': 1, 'b': cache_utils.MISSING})
+        self.assertEqual(self.get_many(fetch), {'a': 1, 'b': cache_utils.MISSING})
+        self.assertEqual(sorted(fetch.call_args[0][0]), ['a', 'b'])
+
+        fetch.reset_mock()
+        self.assertEqual(self.get_many(fetch), {'a': 1, 'b': cache_utils.MISSING})
+        self.assertFalse(fetch.called)
+
+    def test_get_many_fetch_failure(self):
+        """ Verify items which could not be fetched are neither cached nor returned. """
+        self.assertEqual(self.get_many(lambda items: {'a': 1}), {'a': 1})
+        self.assertEqual(self.get_many(lambda items: {'b': 2}), {'a': 1, 'b': 2})
+
+    def test_get_many_negative_timeout(self):
+        """ Verify missing items are fetched again once their negative timeout has passed. """
+        keys = {'a': self.keys['a']}
+        self.get_many(lambda items: {'a': cache_utils.MISSING}, keys=keys)
+        cache.delete(cache_utils._get_metadata_key(keys['a']))  # pylint: disable=protected-access
+
+        self.assertEqual(self.get_many(lambda items: {'a': 1}, keys=keys), {'a': 1})
+
+    def test_get_many_stale(self):
+        """ Verify a stale value is served to all workers, while a single worker refreshes it. """
+        keys = {'a': self.keys['a']}
+        self.get_many(lambda items: {'a': 1}, keys=keys)
+
+        with mock.patch('ecommerce.core.cache_utils.time') as mock_time:
+            mock_time.time.return_value = time.time() + TIMEOUT + 1
+
+            # The refresh fails, and the stale value is served.
+            self.assertEqual(self.get_many(lambda items: {}, keys=keys), {'a': 1})
+
+            # The lock is still held by the first worker.
+            fetch = mock.Mock(return_value={'a': 2})
+            self.assertEqual(self.get_many(fetch, keys=keys), {'a': 1})
+            self.assertFalse(fetch.called)
+
+            cache.delete(cache_utils._get_lock_key(keys['a']))  # pylint: disable=protected-access
+            self.assertEqual(self.get_many(fetch, keys=keys), {'a': 2})
+            fetch.reset_mock()
+            self.assertEqual(self.get_many(fetch, keys=keys), {'a': 2})
+            self.assertFalse(fetch.called)
@@ -0,0 +1,46 @@
+from django.test import override_settings
+from edx_rest_api_client.auth import SuppliedJwtAuth
+
+from ecommerce.core import clients
+from ecommerce.tests.testcases import TestCase
+
+URL = 'https://lms.example.com/api/'
+
+
+class ApiClientTests(TestCase):
+    def get_session(self, client):
+        return client._store['session']  # pylint: disable=protected-access
+
+    def test_session_reused(self):
+        """ Verify clients for the same site, service and principal share a session. """
+        session = self.get_session(clients.get_api_client(URL, self.site, 'lms', oauth_access_token='abc'))
+        self.assertIs(
+            self.get_session(clients.get_api_client(URL, self.site, 'lms', oauth_access_token='abc')), session
+        )
+        self.assertIsNot(
+            self.get_session(clients.get_api_client(URL, self.site, 'lms', oauth_access_token='def')), session
+        )
+        self.assertIsNot(
+            self.get_session(clients.get_api_client(URL, self.site, 'catalog', oauth_access_token='abc')), session
+        )
+
+    def test_jwt_refreshed(self):
+        """ Verify service user clients share a session, authenticated with the latest token. """
+        session = self.get_session(clients.get_api_client(URL, self.site, 'catalog', jwt='old'))
+        client = clients.get_api_client(URL, self.site, 'catalog', jwt='new')
+
+        self.assertIs(self.get_session(client), session)
+        self.assertIsInstance(session.auth, SuppliedJwtAuth)
+        self.assertEqual(session.auth.token, 'new')
+
+    @override_settings(API_CLIENT_MAX_SESSIONS=2)
+    def test_sessions_bounded(self):
+        """ Verify the least recently used session is discarded once too many sessions are kept. """
+        first = clients.get_session(self.site, 'lms', 'first')
+        second = clients.get_session(self.site, 'lms', 'second')
+        self.assertIs(clients.get_session(self.site, 'lms', 'first'), first)
+
+        clients.get_session(self.site, 'lms', 'third')
+
+        self.assertIs(clients.get_session(self.site, 'lms', 'first'), first)
+        self.assertIsNot(clients.get_session(self.site, 'lms', 'second'), second)
@@ -0,0 +1,68 @@
+import mock
+from django.contrib.sites.models import Site
+from django.dispatch import Signal
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from ecommerce.core.middleware import DeferredSignalsMiddleware, SiteConfigurationMiddleware, defer_signal
+from ecommerce.tests.testcases import TestCase
+
+
+class SiteConfigurationMiddlewareTests(TestCase):
+    def test_process_request(self):
+        """ Verify the configuration of the current site, and its partner, is read without querying the database. """
+        request = RequestFactory().get('/')
+        request.site = Site.objects.get(id=self.site.id)
+        SiteConfigurationMiddleware().process_request(request)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(request.site.siteconfiguration.partner, self.partner)
+
+
+class DeferredSignalsMiddlewareTests(TestCase):
+    def setUp(self):
+        super(DeferredSignalsMiddlewareTests, self).setUp()
+        self.signal = Signal(providing_args=['value'])
+        self.receiver = mock.Mock()
+        self.signal.connect(self.receiver, weak=False)
+        self.middleware = DeferredSignalsMiddleware()
+        self.request = RequestFactory().get('/')
+
+    def test_process_response(self):
+        """ Verify deferred signals are sent once the response is ready. """
+        self.middleware.process_request(self.request)
+        defer_signal(self.request, self.signal, sender=self, value=1)
+        self.assertFalse(self.receiver.called)
+
+        self.middleware.process_response(self.request, HttpResponse())
+        self.receiver.assert_called_once_with(signal=self.signal, sender=self, value=1)
+
+    def test_process_exception(self):
+        """ Verify the signals deferred by views which raise an exception are not sent. """
+        self.middleware.process_request(self.request)
+        defer_signal(self.request, self.signal, sender=self, value=1)
+
+        self.middleware.process_exception(self.request, Exception())
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertFalse(self.receiver.called)
+
+    def test_process_response_error(self):
+        """ Verify the signals deferred by views which return an error response are not sent. """
+        self.middleware.process_request(self.request)
+        defer_signal(self.request, self.signal, sender=self, value=1)
+
+        self.middleware.process_response(self.request, HttpResponse(status=400))
+        self.assertFalse(self.receiver.called)
+
+    def test_defer_signal_without_middleware(self):
+        """ Verify signals are sent right away if the request is not handled by the middleware. """
+        defer_signal(self.request, self.signal, sender=self, value=1)
+        self.receiver.assert_called_once_with(signal=self.signal, sender=self, value=1)
+
+    def test_defer_signal_with_request(self):
+        """ Verify the request can be given to the receivers of deferred signals. """
+        self.middleware.process_request(self.request)
+        defer_signal(self.request, self.signal, sender=self, request=self.request)
+
+        self.middleware.process_response(self.request, HttpResponse())
+        self.receiver.assert_called_once_with(signal=self.signal, sender=self, request=self.request)
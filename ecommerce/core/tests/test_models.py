@@ -1,3 +1,4 @@
+import datetime
 import json
 
 import ddt
@@ -5,6 +6,7 @@ import httpretty
 import mock
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import override_settings
 from edx_rest_api_client.auth import SuppliedJwtAuth
@@ -89,6 +91,43 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.mock_enrollment_api(self.request, user, course_id2, is_active=False, mode=mode)
         self.assertFalse(user.is_user_already_enrolled(self.request, not_enrolled_seat))
 
+    @httpretty.activate
+    def test_is_user_enrolled_cached(self):
+        """ Verify the enrollment status is cached. """
+        user = self.create_user()
+        self.request.user = user
+        course_id = 'course-v1:test+test+test'
+        __, seat = self.create_course_and_seat(course_id=course_id, seat_type='verified')
+        self.mock_enrollment_api(self.request, user, course_id, mode='verified')
+
+        self.assertTrue(user.is_user_already_enrolled(self.request, seat))
+        httpretty.disable()
+        self.assertTrue(user.is_user_already_enrolled(self.request, seat))
+
+    @httpretty.activate
+    def test_get_enrollment_statuses(self):
+        """ Verify the statuses of several enrollments are retrieved with a single call, and cached. """
+        user = self.create_user()
+        course_keys = ['course-v1:test+test+enrolled', 'course-v1:test+test+unenrolled', 'course-v1:test+test+none']
+        url = '{host}/enrollment'.format(host=self.request.site.siteconfiguration.build_lms_url('/api/enrollment/v1'))
+        body = json.dumps([
+            {'mode': 'verified', 'is_active': True, 'course_details': {'course_id': course_keys[0]}},
+            {'mode': 'audit', 'is_active': False, 'course_details': {'course_id': course_keys[1]}},
+        ])
+        httpretty.register_uri(httpretty.GET, url, body=body, content_type='application/json')
+
+        expected = {
+            course_keys[0]: {'mode': 'verified', 'is_active': True},
+            course_keys[1]: {'mode': 'audit', 'is_active': False},
+            course_keys[2]: {},
+        }
+        self.assertEqual(user.get_enrollment_statuses(self.request, course_keys), expected)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+        self.assertEqual(httpretty.last_request().querystring, {'user': [user.username]})
+
+        httpretty.disable()
+        self.assertEqual(user.get_enrollment_statuses(self.request, course_keys), expected)
+
 
 class BusinessClientTests(TestCase):
     def test_str(self):
@@ -98,6 +137,12 @@ class BusinessClientTests(TestCase):
 
 @ddt.ddt
 class SiteConfigurationTests(TestCase):
+    def setUp(self):
+        super(SiteConfigurationTests, self).setUp()
+        # Access tokens and payment processors are cached under the ID of the configuration, which is reused.
+        cache.clear()
+        self.addCleanup(cache.clear)
+
     def mock_access_token_response(self, status=200):
         """ Mock the response from the OAuth provider's access token endpoint. """
         url = '{root}/access_token'.format(root=self.site.siteconfiguration.oauth2_provider_url)
@@ -228,6 +273,42 @@ class SiteConfigurationTests(TestCase):
         result = site_config.get_payment_processors()
         self.assertEqual(result, expected_result)
 
+    @override_settings(PAYMENT_PROCESSORS=[
+        'ecommerce.extensions.payment.tests.processors.DummyProcessor',
+        'ecommerce.extensions.payment.tests.processors.AnotherDummyProcessor',
+    ])
+    def test_get_payment_processors_cached(self):
+        """ Verify the enabled processors are cached until a processor switch is toggled. """
+        self._enable_processor_switches([DummyProcessor, AnotherDummyProcessor])
+        site_config = SiteConfigurationFactory(
+            payment_processors=",".join([DummyProcessor.NAME, AnotherDummyProcessor.NAME]),
+            partner__name='TestX'
+        )
+        self.assertEqual(site_config.get_payment_processors(), [DummyProcessor, AnotherDummyProcessor])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(site_config.get_payment_processors(), [DummyProcessor, AnotherDummyProcessor])
+
+        toggle_switch(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + AnotherDummyProcessor.NAME, False)
+        self.assertEqual(site_config.get_payment_processors(), [DummyProcessor])
+
+        site_config.payment_processors = DummyProcessor.NAME
+        site_config.save()
+        toggle_switch(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + AnotherDummyProcessor.NAME, True)
+        self.assertEqual(site_config.get_payment_processors(), [DummyProcessor])
+
+    @override_settings(PAYMENT_PROCESSORS=[
+        'ecommerce.extensions.payment.tests.processors.DummyProcessor',
+    ])
+    def test_get_payment_processors_unsaved(self):
+        """ Verify the enabled processors of unsaved configurations are not cached. """
+        self._enable_processor_switches([DummyProcessor])
+        site_config = _make_site_config(DummyProcessor.NAME)
+        self.assertEqual(site_config.get_payment_processors(), [DummyProcessor])
+
+        with mock.patch.object(DummyProcessor, 'is_enabled', return_value=False):
+            self.assertEqual(site_config.get_payment_processors(), [])
+
     def test_get_from_email(self):
         """
         Validate SiteConfiguration.get_from_email() along with whether, or not,
@@ -240,6 +321,30 @@ class SiteConfigurationTests(TestCase):
         site_config = SiteConfigurationFactory(from_email=expected_from_email, partner__name='TestX')
         self.assertEqual(site_config.get_from_email(), expected_from_email)
 
+    def test_get_for_site(self):
+        """ Verify the configuration, and its partner, is cached until the configuration is saved. """
+        site_configuration = SiteConfiguration.get_for_site(self.site)
+        self.assertEqual(site_configuration, self.site.siteconfiguration)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteConfiguration.get_for_site(self.site).partner, site_configuration.partner)
+
+        # Updates which bypass save() are not seen until the configuration is invalidated.
+        SiteConfiguration.objects.filter(id=site_configuration.id).update(segment_key='updated')
+        self.assertNotEqual(SiteConfiguration.get_for_site(self.site).segment_key, 'updated')
+
+        SiteConfiguration.invalidate_site_configuration(self.site.id)
+        self.assertEqual(SiteConfiguration.get_for_site(self.site).segment_key, 'updated')
+
+    def test_get_for_site_invalidated_on_save(self):
+        """ Verify saving a configuration forces it to be reloaded. """
+        site_configuration = SiteConfiguration.get_for_site(self.site)
+        site_configuration.segment_key = 'updated'
+        site_configuration.save()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(SiteConfiguration.get_for_site(self.site).segment_key, 'updated')
+
     @httpretty.activate
     def test_access_token(self):
         """ Verify the property retrieves, and caches, an access token from the OAuth 2.0 provider. """
@@ -251,6 +356,60 @@ class SiteConfigurationTests(TestCase):
         httpretty.disable()
         self.assertEqual(self.site.siteconfiguration.access_token, token)
 
+    @override_settings(ACCESS_TOKEN_REFRESH_MARGIN=300)
+    def test_access_token_refreshed_ahead_of_expiration(self):
+        """ Verify the token is refreshed once it nears expiration, by a single process at a time. """
+        site_configuration = self.site.siteconfiguration
+        key, lock_key = site_configuration._get_access_token_cache_keys()  # pylint: disable=protected-access
+        expiration_datetime = datetime.datetime.utcnow() + datetime.timedelta(days=1, seconds=600)
+
+        with mock.patch('ecommerce.core.models.EdxRestApiClient.get_oauth_access_token',
+                        return_value=('new', expiration_datetime)) as mock_get_token:
+            # Another process is refreshing the token; the cached token is used in the meantime.
+            cache.set(key, ('old', datetime.datetime.utcnow() - datetime.timedelta(seconds=1)), 60)
+            cache.add(lock_key, True)
+            self.assertEqual(site_configuration.access_token, 'old')
+            self.assertFalse(mock_get_token.called)
+
+            cache.delete(lock_key)
+            self.assertEqual(site_configuration.access_token, 'new')
+            self.assertEqual(mock_get_token.call_count, 1)
+            self.assertIsNone(cache.get(lock_key))
+
+            # The token is cached for its entire lifetime, including days.
+            __, refresh_datetime = cache.get(key)
+            self.assertGreater(refresh_datetime, datetime.datetime.utcnow() + datetime.timedelta(days=1))
+
+    def test_access_token_refresh_failure(self):
+        """ Verify the cached token is used if the token cannot be refreshed. """
+        site_configuration = self.site.siteconfiguration
+        key, __ = site_configuration._get_access_token_cache_keys()  # pylint: disable=protected-access
+        cache.set(key, ('old', datetime.datetime.utcnow() - datetime.timedelta(seconds=1)), 60)
+
+        with mock.patch('ecommerce.core.models.EdxRestApiClient.get_oauth_access_token',
+                        side_effect=Exception) as mock_get_token:
+            self.assertEqual(site_configuration.access_token, 'old')
+
+            # The lock is kept until it times out, so the token is not retrieved again in the meantime.
+            self.assertEqual(site_configuration.access_token, 'old')
+            self.assertEqual(mock_get_token.call_count, 1)
+
+    def test_access_token_cold_miss(self):
+        """ Verify a process waits for the token being retrieved by another process, if no token is cached. """
+        site_configuration = self.site.siteconfiguration
+        key, lock_key = site_configuration._get_access_token_cache_keys()  # pylint: disable=protected-access
+        cache.add(lock_key, True)
+
+        def retrieve_token(__):
+            cache.set(key, ('new', datetime.datetime.utcnow() + datetime.timedelta(seconds=60)), 60)
+
+        with mock.patch('ecommerce.core.models.EdxRestApiClient.get_oauth_access_token') as mock_get_token:
+            with mock.patch('ecommerce.core.models.time.sleep', side_effect=retrieve_token) as mock_sleep:
+                self.assertEqual(site_configuration.access_token, 'new')
+
+        self.assertFalse(mock_get_token.called)
+        self.assertEqual(mock_sleep.call_count, 1)
+
     @httpretty.activate
     @override_settings(COURSE_CATALOG_API_URL=COURSE_CATALOG_API_URL)
     def test_course_catalog_api_client(self):
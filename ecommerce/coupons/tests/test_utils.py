@@ -2,7 +2,7 @@ import httpretty
 
 from ecommerce.core.tests.decorators import mock_course_catalog_api_client
 from ecommerce.coupons.tests.mixins import CourseCatalogMockMixin, CouponMixin
-from ecommerce.coupons.utils import get_seats_from_query
+from ecommerce.coupons.utils import get_seats_for_course_ids, get_seats_from_query
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.tests.testcases import TestCase
 
@@ -29,3 +29,20 @@ class CouponUtilsTests(CouponMixin, CourseCatalogTestMixin, CourseCatalogMockMix
         self.mock_dynamic_catalog_course_runs_api(query=self.query, course_run=course)
         response = get_seats_from_query(self.site, self.query, self.seat_type)
         self.assertEqual(response, [])
+
+    def test_get_seats_for_course_ids(self):
+        """
+        Verify seats are retrieved with a single query, in the order of their courses, and missing seats reported.
+        """
+        first_course, first_seat = self.create_course_and_seat(course_id='course-v1:test+test+first')
+        second_course, second_seat = self.create_course_and_seat(course_id='course-v1:test+test+second')
+        professional_course, __ = self.create_course_and_seat(
+            course_id='course-v1:test+test+professional', seat_type='professional'
+        )
+        course_ids = [second_course.id, professional_course.id, 'course-v1:test+test+unknown', first_course.id]
+
+        with self.assertNumQueries(1):
+            seats, missing_course_ids = get_seats_for_course_ids(course_ids, [self.seat_type])
+
+        self.assertEqual(seats, [second_seat, first_seat])
+        self.assertEqual(missing_course_ids, [professional_course.id, 'course-v1:test+test+unknown'])
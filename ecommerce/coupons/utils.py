@@ -1,10 +1,13 @@
 """ Coupon related utility functions. """
 import hashlib
+from collections import defaultdict
 
 from django.conf import settings
-from django.core.cache import cache
 from oscar.core.loading import get_model
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
 
+from ecommerce.core import cache_utils
 from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
 
 Product = get_model('catalogue', 'Product')
@@ -26,18 +29,134 @@ def get_range_catalog_query_results(limit, query, site, offset=None):
     partner_code = site.siteconfiguration.partner.short_code
     cache_key = 'course_runs_{}_{}_{}_{}'.format(query, limit, offset, partner_code)
     cache_hash = hashlib.md5(cache_key).hexdigest()
-    response = cache.get(cache_hash)
-    if not response:
-        response = site.siteconfiguration.course_catalog_api_client.course_runs.get(
-            limit=limit,
-            offset=offset,
-            q=query,
-            partner=partner_code
-        )
-        cache.set(cache_hash, response, settings.COURSES_API_CACHE_TIMEOUT)
+    exceptions = []
+
+    def fetch(__):
+        try:
+            response = site.siteconfiguration.course_catalog_api_client.course_runs.get(
+                limit=limit,
+                offset=offset,
+                q=query,
+                partner=partner_code
+            )
+        except (ConnectionError, SlumberBaseException, Timeout) as exception:
+            # A stale response, if any, is served instead.
+            exceptions.append(exception)
+            return {}
+        return {cache_hash: response}
+
+    response = cache_utils.get_many(
+        {cache_hash: cache_hash},
+        fetch,
+        settings.COURSES_API_CACHE_TIMEOUT,
+        settings.COURSES_API_STALE_CACHE_TIMEOUT,
+        settings.COURSES_API_NEGATIVE_CACHE_TIMEOUT
+    ).get(cache_hash)
+    if response is None:
+        raise exceptions[0]
     return response
 
 
+def _get_catalog_query_index_cache_key(query, partner_code):
+    return 'catalog_query_index_{}'.format(hashlib.md5('{}_{}'.format(query, partner_code)).hexdigest())
+
+
+def _get_catalog_query_course_run_ids(site, query):
+    response = site.siteconfiguration.course_catalog_api_client.course_runs.get(
+        limit=DEFAULT_CATALOG_PAGE_SIZE,
+        q=query,
+        partner=site.siteconfiguration.partner.short_code
+    )
+    return [course_run['key'] for course_run in response['results']]
+
+
+def get_catalog_query_course_run_ids(site, query):
+    """
+    Get the membership index of a catalog query: the IDs of the course runs it matches.
+
+    The index is cached, and refreshed every COURSES_API_CACHE_TIMEOUT seconds, or on demand
+    with refresh_catalog_query_index.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        query (str): ElasticSearch Query
+
+    Returns:
+        list: IDs of the course runs matched by the query, in catalog order.
+    """
+    cache_key = _get_catalog_query_index_cache_key(query, site.siteconfiguration.partner.short_code)
+    exceptions = []
+
+    def fetch(__):
+        try:
+            return {cache_key: _get_catalog_query_course_run_ids(site, query)}
+        except (ConnectionError, SlumberBaseException, Timeout) as exception:
+            # A stale index, if any, is served instead.
+            exceptions.append(exception)
+            return {}
+
+    course_run_ids = cache_utils.get_many(
+        {cache_key: cache_key},
+        fetch,
+        settings.COURSES_API_CACHE_TIMEOUT,
+        settings.COURSES_API_STALE_CACHE_TIMEOUT,
+        settings.COURSES_API_NEGATIVE_CACHE_TIMEOUT
+    ).get(cache_key)
+    if course_run_ids is None:
+        raise exceptions[0]
+    return course_run_ids
+
+
+def refresh_catalog_query_index(site, query):
+    """
+    Rebuild the membership index of a catalog query from the Course Catalog API.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        query (str): ElasticSearch Query
+
+    Returns:
+        list: IDs of the course runs matched by the query, in catalog order.
+    """
+    cache_key = _get_catalog_query_index_cache_key(query, site.siteconfiguration.partner.short_code)
+    course_run_ids = _get_catalog_query_course_run_ids(site, query)
+    cache_utils.set_many(
+        {cache_key: cache_key},
+        {cache_key: course_run_ids},
+        settings.COURSES_API_CACHE_TIMEOUT,
+        settings.COURSES_API_STALE_CACHE_TIMEOUT,
+        settings.COURSES_API_NEGATIVE_CACHE_TIMEOUT
+    )
+    return course_run_ids
+
+
+def get_seats_for_course_ids(course_ids, seat_types):
+    """
+    Retrieve the seats of several courses, matching seat types, with a single query.
+
+    Arguments:
+        course_ids (list): IDs of the courses, e.g. in the order of a course catalog query's results
+        seat_types (list): accepted seat type names
+
+    Returns:
+        tuple: List of seat products, ordered as their courses in course_ids, and list of the IDs
+            of the courses which have no matching seat.
+    """
+    seats_by_course_id = defaultdict(list)
+    seats = Product.objects.filter(course_id__in=course_ids, certificate_type__in=seat_types).order_by('id')
+    for seat in seats:
+        seats_by_course_id[seat.course_id].append(seat)
+
+    ordered_seats = []
+    missing_course_ids = []
+    for course_id in course_ids:
+        if course_id in seats_by_course_id:
+            ordered_seats.extend(seats_by_course_id.pop(course_id))
+        else:
+            missing_course_ids.append(course_id)
+    return ordered_seats, missing_course_ids
+
+
 def get_seats_from_query(site, query, seat_types):
     """
     Retrieve seats from a course catalog query and matching seat types.
@@ -55,17 +174,7 @@ def get_seats_from_query(site, query, seat_types):
         query=query,
         site=site
     )['results']
-    query_products = []
-    for course in results:
-        try:
-            product = Product.objects.get(
-                course_id=course['key'],
-                attributes__name='certificate_type',
-                attribute_values__value_text__in=seat_types.split(',')
-            )
-            query_products.append(product)
-        except Product.DoesNotExist:
-            pass
+    query_products, __ = get_seats_for_course_ids([course['key'] for course in results], seat_types.split(','))
     return query_products
 
 
@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q, Count
 from django.utils.translation import ugettext_lazy as _
@@ -258,8 +259,78 @@ class Course(models.Model):
                 orders=0
             ).delete()
 
+        # Also accounts for the enrollment code created or updated along with the seat.
+        self.update_basket_switch_skus(course_id)
+
         return seat
 
+    @classmethod
+    def _get_basket_switch_skus_cache_key(cls, course_id):
+        return 'course_basket_switch_skus_{}'.format(course_id)
+
+    @classmethod
+    def get_basket_switch_sku(cls, product):
+        """ Returns the partner SKU of the product to switch to from the given product in the basket.
+
+        Seats are switched to the enrollment code for their certificate type, and enrollment codes to the seat
+        of their seat type. The SKUs are looked up in the map cached by update_basket_switch_skus, which is
+        rebuilt if the product is not part of it. The map is invalidated whenever a product of the course, its
+        stock records or its attributes are saved or deleted.
+
+        Arguments:
+            product (Product): Seat or enrollment code product.
+
+        Returns:
+            str: Partner SKU, or None if the product has no counterpart.
+        """
+        skus = cache.get(cls._get_basket_switch_skus_cache_key(product.course_id))
+        if skus is None or product.id not in skus:
+            skus = cls.update_basket_switch_skus(product.course_id)
+        return skus.get(product.id)
+
+    @classmethod
+    def update_basket_switch_skus(cls, course_id):
+        """ Caches the partner SKUs of the products to switch to from each seat and enrollment code of a course.
+
+        Arguments:
+            course_id (str): ID of the course.
+
+        Returns:
+            dict: Partner SKUs, or None, keyed by product ID.
+        """
+        stock_records = StockRecord.objects.filter(
+            product__course_id=course_id,
+            product__structure__in=(Product.CHILD, Product.STANDALONE)
+        ).select_related('product__product_class').order_by('id')
+
+        # (product ID, certificate or seat type) tuples.
+        seats = []
+        enrollment_codes = []
+        seat_skus = {}
+        enrollment_code_skus = {}
+        for stock_record in stock_records:
+            product = stock_record.product
+            if product.structure == Product.CHILD:
+                seats.append((product.id, product.certificate_type))
+                if product.certificate_type:
+                    seat_skus.setdefault(product.certificate_type, stock_record.partner_sku)
+            elif product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME:
+                seat_type = getattr(product.attr, 'seat_type', None)
+                enrollment_codes.append((product.id, seat_type))
+                if seat_type:
+                    enrollment_code_skus.setdefault(seat_type, stock_record.partner_sku)
+
+        skus = {product_id: enrollment_code_skus.get(certificate_type) for product_id, certificate_type in seats}
+        skus.update({product_id: seat_skus.get(seat_type) for product_id, seat_type in enrollment_codes})
+
+        cache.set(cls._get_basket_switch_skus_cache_key(course_id), skus, settings.BASKET_SWITCH_SKUS_CACHE_TIMEOUT)
+        return skus
+
+    @classmethod
+    def invalidate_basket_switch_skus(cls, course_id):
+        """ Forces the basket switch SKUs of a course to be rebuilt on next use. """
+        cache.delete(cls._get_basket_switch_skus_cache_key(course_id))
+
     @property
     def enrollment_code_product(self):
         """ Returns an enrollment code Product related to this course. """
@@ -4,11 +4,11 @@ import logging
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
-from edx_rest_api_client.client import EdxRestApiClient
 from edx_rest_api_client.exceptions import SlumberHttpBaseException
 from oscar.core.loading import get_model
 import requests
 
+from ecommerce.core.clients import get_api_client
 from ecommerce.core.constants import ENROLLMENT_CODE_SEAT_TYPES
 from ecommerce.core.url_utils import get_lms_url, get_lms_commerce_api_url
 from ecommerce.courses.utils import mode_for_seat
@@ -52,8 +52,10 @@ class LMSPublisher(object):
     def _publish_creditcourse(self, course_id, access_token):
         """Creates or updates a CreditCourse object on the LMS."""
 
-        api = EdxRestApiClient(
+        api = get_api_client(
             get_lms_url('api/credit/v1/'),
+            None,
+            'lms_credit',
             oauth_access_token=access_token,
             timeout=self.timeout
         )
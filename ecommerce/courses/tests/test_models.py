@@ -1,5 +1,6 @@
 import ddt
 from django.conf import settings
+from django.core.cache import cache
 import mock
 from oscar.core.loading import get_model
 from oscar.test.factories import create_order
@@ -309,3 +310,48 @@ class CourseTests(CourseCatalogTestMixin, TestCase):
         # One parent product, three seat products, one enrollment code product (verified) -> five total products
         self.assertEqual(course.products.count(), 5)
         self.assertEqual(len(course.seat_products), 3)  # Definitely three seat products...
+
+    def test_get_basket_switch_sku(self):
+        """ Verify the SKUs to switch to between seats and enrollment codes are cached when seats are created. """
+        toggle_switch(ENROLLMENT_CODE_SWITCH, True)
+        course = CourseFactory()
+        audit_seat = course.create_or_update_seat('audit', False, 0, self.partner)
+        seat = course.create_or_update_seat('verified', False, 10, self.partner, create_enrollment_code=True)
+        enrollment_code = Product.objects.get(product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        seat_sku = StockRecord.objects.get(product=seat).partner_sku
+        enrollment_code_sku = StockRecord.objects.get(product=enrollment_code).partner_sku
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Course.get_basket_switch_sku(seat), enrollment_code_sku)
+            self.assertEqual(Course.get_basket_switch_sku(enrollment_code), seat_sku)
+            self.assertIsNone(Course.get_basket_switch_sku(audit_seat))
+
+    def test_get_basket_switch_sku_rebuild(self):
+        """ Verify the cached SKUs are rebuilt if they are evicted, or do not include the product. """
+        toggle_switch(ENROLLMENT_CODE_SWITCH, True)
+        course = CourseFactory()
+        seat = course.create_or_update_seat('verified', False, 10, self.partner, create_enrollment_code=True)
+        enrollment_code = Product.objects.get(product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        enrollment_code_sku = StockRecord.objects.get(product=enrollment_code).partner_sku
+
+        cache.clear()
+        self.assertEqual(Course.get_basket_switch_sku(seat), enrollment_code_sku)
+
+        cache.set(Course._get_basket_switch_skus_cache_key(course.id), {})  # pylint: disable=protected-access
+        self.assertEqual(Course.get_basket_switch_sku(seat), enrollment_code_sku)
+
+    def test_get_basket_switch_sku_invalidated(self):
+        """ Verify the cached SKUs are rebuilt once the stock records or products of the course change. """
+        toggle_switch(ENROLLMENT_CODE_SWITCH, True)
+        course = CourseFactory()
+        seat = course.create_or_update_seat('verified', False, 10, self.partner, create_enrollment_code=True)
+        enrollment_code = Product.objects.get(product_class__name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        self.assertIsNotNone(Course.get_basket_switch_sku(seat))
+
+        stock_record = StockRecord.objects.get(product=enrollment_code)
+        stock_record.partner_sku = 'UPDATED'
+        stock_record.save()
+        self.assertEqual(Course.get_basket_switch_sku(seat), 'UPDATED')
+
+        enrollment_code.delete()
+        self.assertIsNone(Course.get_basket_switch_sku(seat))
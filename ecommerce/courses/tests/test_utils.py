@@ -1,9 +1,15 @@
 import hashlib
+import json
+import time
 
 import ddt
 import httpretty
+import mock
 
+from django.conf import settings
 from django.core.cache import cache
+from django.test import override_settings
+from slumber.exceptions import HttpNotFoundError
 
 from ecommerce.core.constants import ENROLLMENT_CODE_SWITCH
 from ecommerce.core.tests import toggle_switch
@@ -11,7 +17,7 @@ from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.courses.utils import (
-    get_certificate_type_display_value, get_course_info_from_lms, mode_for_seat
+    get_certificate_type_display_value, get_course_info_from_lms, get_course_infos_from_lms, mode_for_seat
 )
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.tests.testcases import TestCase
@@ -58,6 +64,57 @@ class UtilsTests(CourseCatalogTestMixin, TestCase):
         cached_course = cache.get(cache_hash)
         self.assertEqual(cached_course, response)
 
+    def test_get_course_infos_from_lms(self):
+        """ Verify uncached courses are retrieved, and cached, while cached courses are read from the cache. """
+        cached_course, uncached_course, missing_course = CourseFactory(), CourseFactory(), CourseFactory()
+        for course in (cached_course, uncached_course):
+            httpretty.register_uri(
+                httpretty.GET, get_lms_url('api/courses/v1/courses/{}/'.format(course.id)),
+                body=json.dumps({'name': course.name}), status=200, content_type='application/json'
+            )
+        httpretty.register_uri(
+            httpretty.GET, get_lms_url('api/courses/v1/courses/{}/'.format(missing_course.id)),
+            status=404, content_type='application/json'
+        )
+        get_course_info_from_lms(cached_course.id)
+
+        courses = get_course_infos_from_lms([cached_course.id, uncached_course.id, missing_course.id])
+
+        self.assertEqual(courses[cached_course.id], ({'name': cached_course.name}, None))
+        self.assertEqual(courses[uncached_course.id], ({'name': uncached_course.name}, None))
+        self.assertIsNone(courses[missing_course.id][0])
+        self.assertIsInstance(courses[missing_course.id][1], HttpNotFoundError)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 3)
+
+        # Courses which do not exist are cached as well.
+        courses = get_course_infos_from_lms([uncached_course.id, missing_course.id])
+        self.assertEqual(courses[uncached_course.id], ({'name': uncached_course.name}, None))
+        self.assertIsInstance(courses[missing_course.id][1], HttpNotFoundError)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 3)
+
+    @override_settings(CACHE_REFRESH_LOCK_TIMEOUT=0)
+    def test_get_course_infos_from_lms_stale(self):
+        """ Verify stale courses are refreshed, and served if the refresh fails. """
+        course = CourseFactory()
+        course_url = get_lms_url('api/courses/v1/courses/{}/'.format(course.id))
+        httpretty.register_uri(
+            httpretty.GET, course_url, body=json.dumps({'name': 'old'}), status=200, content_type='application/json'
+        )
+        get_course_info_from_lms(course.id)
+
+        with mock.patch('ecommerce.core.cache_utils.time') as mock_time:
+            mock_time.time.return_value = time.time() + settings.COURSES_API_CACHE_TIMEOUT + 1
+            httpretty.register_uri(
+                httpretty.GET, course_url, body=json.dumps({'name': 'new'}), status=200,
+                content_type='application/json'
+            )
+            self.assertEqual(get_course_info_from_lms(course.id), {'name': 'new'})
+
+            mock_time.time.return_value += settings.COURSES_API_CACHE_TIMEOUT + 1
+            httpretty.register_uri(httpretty.GET, course_url, status=500)
+            self.assertEqual(get_course_info_from_lms(course.id), {'name': 'new'})
+            self.assertEqual(len(httpretty.httpretty.latest_requests), 3)
+
     @ddt.data(
         ('honor', 'Honor'),
         ('verified', 'Verified'),
@@ -1,10 +1,14 @@
 import hashlib
+from multiprocessing.pool import ThreadPool
 
 from django.conf import settings
 from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
-from edx_rest_api_client.client import EdxRestApiClient
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import HttpNotFoundError, SlumberBaseException
 
+from ecommerce.core import cache_utils
+from ecommerce.core.clients import get_api_client
 from ecommerce.core.url_utils import get_lms_url
 
 
@@ -23,18 +27,106 @@ def mode_for_seat(product):
     return mode
 
 
+def _get_course_info_cache_key(course_key):
+    return hashlib.md5('courses_api_detail_{}'.format(course_key)).hexdigest()
+
+
 def get_course_info_from_lms(course_key):
     """ Get course information from LMS via the course api and cache """
-    api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
-    cache_key = 'courses_api_detail_{}'.format(course_key)
-    cache_hash = hashlib.md5(cache_key).hexdigest()
-    course = cache.get(cache_hash)
-    if not course:  # pragma: no cover
-        course = api.courses(course_key).get()
-        cache.set(cache_hash, course, settings.COURSES_API_CACHE_TIMEOUT)
+    course, exception = get_course_infos_from_lms([course_key])[course_key]
+    if exception is not None:
+        raise exception
     return course
 
 
+def get_course_infos_from_lms(course_keys):
+    """ Get information about several courses from LMS via the course api and cache.
+
+    Cached courses are read with a single cache call, and stale courses are served while a single worker refreshes
+    them. The remaining courses are retrieved concurrently, from a pool of at most COURSES_API_MAX_WORKERS threads.
+    Courses which do not exist are cached for COURSES_API_NEGATIVE_CACHE_TIMEOUT seconds.
+
+    Arguments:
+        course_keys (list): Keys of the courses.
+
+    Returns:
+        dict: (course, exception) tuples keyed by course key. The exception is set, and the course is None,
+            if the course does not exist, or could not be retrieved due to a connection error, a timeout
+            or an API error.
+    """
+    exceptions = {}
+
+    def fetch(missing_course_keys):
+        # The URL depends on the current request, which is not available to worker threads.
+        api = get_api_client(get_lms_url('api/courses/v1/'), None, 'lms_courses')
+
+        def get_course(course_key):
+            try:
+                return api.courses(course_key).get(), None
+            except (ConnectionError, SlumberBaseException, Timeout) as exception:
+                return None, exception
+
+        if len(missing_course_keys) == 1:
+            results = [get_course(missing_course_keys[0])]
+        else:
+            pool = ThreadPool(min(len(missing_course_keys), settings.COURSES_API_MAX_WORKERS))
+            try:
+                results = pool.map(get_course, missing_course_keys)
+            finally:
+                pool.close()
+                pool.join()
+
+        fetched = {}
+        for course_key, (course, exception) in zip(missing_course_keys, results):
+            if exception is None:
+                fetched[course_key] = course
+            else:
+                exceptions[course_key] = exception
+                if isinstance(exception, HttpNotFoundError):
+                    fetched[course_key] = cache_utils.MISSING
+        return fetched
+
+    cached_courses = cache_utils.get_many(
+        {course_key: _get_course_info_cache_key(course_key) for course_key in course_keys},
+        fetch,
+        settings.COURSES_API_CACHE_TIMEOUT,
+        settings.COURSES_API_STALE_CACHE_TIMEOUT,
+        settings.COURSES_API_NEGATIVE_CACHE_TIMEOUT
+    )
+
+    courses = {}
+    for course_key in course_keys:
+        course = cached_courses.get(course_key)
+        if course is not None and course is not cache_utils.MISSING:
+            courses[course_key] = (course, None)
+        else:
+            exception = exceptions.get(course_key) or HttpNotFoundError(
+                'Course [{}] was not found.'.format(course_key)
+            )
+            courses[course_key] = (None, exception)
+    return courses
+
+
+def get_enrollment_status_cache_key(username, course_key):
+    """ Returns the cache key of the enrollment status of a user in a course. """
+    key = '{}|{}'.format(username, course_key).encode('utf-8')
+    return 'enrollment_status_{}'.format(hashlib.md5(key).hexdigest())
+
+
+def cache_enrollment_status(username, course_key, mode, is_active):
+    """ Caches the enrollment status of a user in a course, as known from a successful Enrollment API call. """
+    cache.set(
+        get_enrollment_status_cache_key(username, course_key),
+        {'mode': mode, 'is_active': is_active},
+        settings.ENROLLMENT_STATUS_CACHE_TIMEOUT
+    )
+
+
+def invalidate_enrollment_status(username, course_key):
+    """ Removes the cached enrollment status of a user in a course. """
+    cache.delete(get_enrollment_status_cache_key(username, course_key))
+
+
 def get_certificate_type_display_value(certificate_type):
     display_values = {
         'audit': _('Audit'),
@@ -8,10 +8,10 @@ from django.core.cache import cache
 from django.core.management import call_command
 from django.http import Http404, HttpResponse
 from django.views.generic import View, TemplateView
-from edx_rest_api_client.client import EdxRestApiClient
 from requests import Timeout
 from slumber.exceptions import SlumberBaseException
 
+from ecommerce.core.clients import get_api_client
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.core.views import StaffOnlyMixin
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
@@ -47,8 +47,10 @@ class CourseAppView(StaffOnlyMixin, TemplateView):
 
         if not credit_providers:
             try:
-                credit_api = EdxRestApiClient(
+                credit_api = get_api_client(
                     get_lms_url('/api/credit/v1/'),
+                    self.request.site,
+                    'lms_credit',
                     oauth_access_token=self.request.user.access_token
                 )
                 credit_providers = credit_api.providers.get()
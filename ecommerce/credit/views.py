@@ -4,21 +4,20 @@ import logging
 from collections import OrderedDict
 
 from dateutil.parser import parse
-from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import TemplateView
-from edx_rest_api_client.client import EdxRestApiClient
 from slumber.exceptions import SlumberHttpBaseException
 
+from ecommerce.core.clients import get_api_client
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
-from ecommerce.extensions.payment.helpers import get_processor_class
+from ecommerce.extensions.payment.helpers import get_processor_classes
 
 logger = logging.getLogger(__name__)
 
@@ -81,8 +80,7 @@ class Checkout(TemplateView):
 
         # Make button text for each processor which will be shown to user.
         processors_dict = OrderedDict()
-        for path in settings.PAYMENT_PROCESSORS:
-            processor_class = get_processor_class(path)
+        for processor_class in get_processor_classes():
             if not processor_class.is_enabled():
                 continue
             processor = processor_class.NAME.lower()
@@ -193,7 +191,9 @@ class Checkout(TemplateView):
     def credit_api_client(self):
         """ Returns an instance of the Credit API client. """
 
-        return EdxRestApiClient(
+        return get_api_client(
             get_lms_url('api/credit/v1/'),
+            self.request.site,
+            'lms_credit',
             oauth_access_token=self.request.user.access_token
         )
@@ -8,6 +8,7 @@ from ecommerce.extensions.api import exceptions
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
 
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,34 @@ def get_product(sku):
         )
 
 
+def get_products(skus):
+    """Retrieve the products, and their stock records, corresponding to the provided SKUs with a single query.
+
+    Arguments:
+        skus (list): SKUs of the products.
+
+    Returns:
+        dict: (product, stock record) tuples keyed by SKU. SKUs which do not correspond to a product are left out.
+
+    Raises:
+        Product.MultipleObjectsReturned: If a SKU is used by the stock records of several partners, as
+            get_product does.
+    """
+    stockrecords = StockRecord.objects.filter(partner_sku__in=skus).select_related(
+        'product__product_class', 'product__parent__product_class'
+    )
+
+    products = {}
+    for stockrecord in stockrecords:
+        if stockrecord.partner_sku in products:
+            raise Product.MultipleObjectsReturned(
+                'More than one product corresponds to SKU [{sku}].'.format(sku=stockrecord.partner_sku)
+            )
+        products[stockrecord.partner_sku] = (stockrecord.product, stockrecord)
+
+    return products
+
+
 def get_order_metadata(basket):
     """Retrieve information required to place an order.
 
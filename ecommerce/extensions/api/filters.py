@@ -21,6 +21,16 @@ class ProductFilter(django_filters.FilterSet):
         fields = ('product_class', 'structure', 'title',)
 
 
+class CouponFilter(ProductFilter):
+    """ Filter coupons via query string parameters. """
+    min_redemptions = django_filters.NumberFilter(name='coupon_vouchers__num_redemptions', lookup_type='gte')
+    max_redemptions = django_filters.NumberFilter(name='coupon_vouchers__num_redemptions', lookup_type='lte')
+
+    class Meta(object):
+        model = Product
+        fields = ('product_class', 'structure', 'title', 'min_redemptions', 'max_redemptions',)
+
+
 class OrderFilter(django_filters.FilterSet):
     """ Filter orders via query string parameter."""
 
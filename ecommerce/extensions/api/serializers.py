@@ -7,6 +7,7 @@ import logging
 from dateutil.parser import parse
 from django.db import transaction
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth import get_user_model
 from oscar.core.loading import get_model, get_class
@@ -422,9 +423,64 @@ class CategorySerializer(serializers.ModelSerializer):
 
 
 class CouponListSerializer(serializers.ModelSerializer):
+    last_redemption_datetime = serializers.SerializerMethodField()
+    num_redemptions = serializers.SerializerMethodField()
+    num_vouchers = serializers.SerializerMethodField()
+
+    def retrieve_coupon_vouchers(self, obj):
+        """Helper method to retrieve the (prefetched) coupon vouchers, which hold the coupon usage summary. """
+        return obj.coupon_vouchers.all()[0]
+
+    def get_last_redemption_datetime(self, obj):
+        return self.retrieve_coupon_vouchers(obj).last_redemption_datetime
+
+    def get_num_redemptions(self, obj):
+        return self.retrieve_coupon_vouchers(obj).num_redemptions
+
+    def get_num_vouchers(self, obj):
+        return self.retrieve_coupon_vouchers(obj).num_vouchers
+
     class Meta(object):
         model = Product
-        fields = ('id', 'title',)
+        fields = ('id', 'title', 'num_vouchers', 'num_redemptions', 'last_redemption_datetime',)
+
+
+class CouponContext(object):
+    """
+    Objects related to a coupon that its serialized representation is built from.
+
+    Each object is loaded on first access, with related objects joined in, and then reused.
+    """
+
+    def __init__(self, coupon):
+        self.coupon = coupon
+
+    @cached_property
+    def coupon_vouchers(self):
+        # Use the coupon_vouchers prefetched by CouponViewSet, if any.
+        return self.coupon.coupon_vouchers.all()[0]
+
+    @cached_property
+    def voucher(self):
+        return self.coupon_vouchers.vouchers.first()
+
+    @cached_property
+    def offer(self):
+        return self.voucher.offers.select_related('benefit', 'condition__range__catalog').first()
+
+    @cached_property
+    def quantity(self):
+        return self.coupon_vouchers.vouchers.count()
+
+    @cached_property
+    def invoice(self):
+        return Invoice.objects.select_related('business_client').filter(
+            order__basket__lines__product=self.coupon
+        ).first()
+
+    @cached_property
+    def history(self):
+        return self.coupon.history.select_related('history_user').latest()
 
 
 class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
@@ -450,9 +506,19 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
     seats = serializers.SerializerMethodField()
     email_domains = serializers.SerializerMethodField()
 
+    def __init__(self, *args, **kwargs):
+        super(CouponSerializer, self).__init__(*args, **kwargs)
+        self._coupon_contexts = {}
+
+    def retrieve_coupon_context(self, obj):
+        """Helper method to retrieve the memoized context of a coupon. """
+        if obj.id not in self._coupon_contexts:
+            self._coupon_contexts[obj.id] = CouponContext(obj)
+        return self._coupon_contexts[obj.id]
+
     def retrieve_benefit(self, obj):
         """Helper method to retrieve the benefit from voucher. """
-        return self.retrieve_voucher(obj).benefit
+        return self.retrieve_offer(obj).benefit
 
     def retrieve_end_date(self, obj):
         """Helper method to retrieve the voucher end datetime. """
@@ -460,7 +526,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
 
     def retrieve_offer(self, obj):
         """Helper method to retrieve the offer from coupon. """
-        return self.retrieve_voucher(obj).offers.first()
+        return self.retrieve_coupon_context(obj).offer
 
     def retrieve_start_date(self, obj):
         """Helper method to retrieve the voucher start datetime. """
@@ -468,7 +534,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
 
     def retrieve_voucher(self, obj):
         """Helper method to retrieve the first voucher from coupon. """
-        return obj.attr.coupon_vouchers.vouchers.first()
+        return self.retrieve_coupon_context(obj).voucher
 
     def retrieve_voucher_usage(self, obj):
         """Helper method to retrieve usage from voucher. """
@@ -476,7 +542,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
 
     def retrieve_quantity(self, obj):
         """Helper method to retrieve number from vouchers. """
-        return obj.attr.coupon_vouchers.vouchers.count()
+        return self.retrieve_coupon_context(obj).quantity
 
     def get_benefit_type(self, obj):
         return self.retrieve_benefit(obj).type
@@ -495,7 +561,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
         return offer.condition.range.catalog_query
 
     def get_client(self, obj):
-        return Invoice.objects.get(order__basket__lines__product=obj).business_client.name
+        return self.retrieve_coupon_context(obj).invoice.business_client.name
 
     def get_code(self, obj):
         if self.retrieve_quantity(obj) == 1:
@@ -517,7 +583,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
         return self.retrieve_end_date(obj)
 
     def get_last_edited(self, obj):
-        history = obj.history.latest()
+        history = self.retrieve_coupon_context(obj).history
         return history.history_user.username, history.history_date
 
     def get_max_uses(self, obj):
@@ -531,8 +597,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
             return None
 
     def get_num_uses(self, obj):
-        offer = self.retrieve_offer(obj)
-        return offer.num_applications
+        return self.retrieve_coupon_context(obj).coupon_vouchers.num_redemptions
 
     def get_email_domains(self, obj):
         offer = self.retrieve_offer(obj)
@@ -544,7 +609,7 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
         Currently only invoices are supported, in the event of adding another
         payment processor append it to the response dictionary.
         """
-        invoice = Invoice.objects.filter(order__basket__lines__product=obj).first()
+        invoice = self.retrieve_coupon_context(obj).invoice
         response = {'Invoice': InvoiceSerializer(invoice).data}
         return response
 
@@ -562,8 +627,9 @@ class CouponSerializer(ProductPaymentInfoMixin, serializers.ModelSerializer):
         _range = offer.condition.range
         request = self.context['request']
         if _range.catalog:
-            stockrecords = _range.catalog.stock_records.all()
-            seats = Product.objects.filter(id__in=[sr.product.id for sr in stockrecords])
+            seats = Product.objects.filter(
+                stockrecords__catalogs=_range.catalog
+            ).distinct().select_related('product_class').prefetch_related('stockrecords')
             serializer = ProductSerializer(seats, many=True, context={'request': request})
             return serializer.data
         else:
@@ -23,6 +23,7 @@ from ecommerce.tests.testcases import TestCase, TransactionTestCase
 
 Basket = get_model('basket', 'Basket')
 Order = get_model('order', 'Order')
+Product = get_model('catalogue', 'Product')
 ShippingEventType = get_model('order', 'ShippingEventType')
 Refund = get_model('refund', 'Refund')
 User = get_user_model()
@@ -166,6 +167,17 @@ class BasketCreateViewTests(BasketCreationMixin, ThrottlingMixin, TransactionTes
             )
         )
 
+    def test_ambiguous_sku(self):
+        """Test that requests for a SKU used by several partners are rejected, rather than resolved arbitrarily."""
+        factories.ProductFactory(
+            structure='child',
+            parent=self.base_product,
+            stockrecords__partner_sku=self.PAID_SKU,
+            stockrecords__partner__short_code='other',
+        )
+        with self.assertRaises(Product.MultipleObjectsReturned):
+            self.create_basket(skus=[self.PAID_SKU])
+
     def test_no_payment_processor(self):
         """Test that requests for handling payment with a non-existent processor fail."""
         response = self.create_basket(
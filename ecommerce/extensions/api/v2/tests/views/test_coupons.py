@@ -9,7 +9,9 @@ import ddt
 import httpretty
 import pytz
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from oscar.apps.catalogue.categories import create_from_breadcrumbs
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
@@ -305,6 +307,21 @@ class CouponViewSetFunctionalTest(CouponMixin, CourseCatalogTestMixin, CourseCat
         self.assertEqual(details_response['coupon_type'], 'Enrollment code')
         self.assertEqual(details_response['code_status'], 'ACTIVE')
 
+    def test_serializer_query_count(self):
+        """Test that the number of queries for the details page does not depend on the number of vouchers."""
+        self.data.update({'title': 'Tešt čoupon 2', 'quantity': 10})
+        self.client.post(COUPONS_LINK, data=self.data, format='json')
+        other_coupon = Product.objects.get(title=self.data['title'])
+
+        query_counts = []
+        for coupon in (self.coupon, other_coupon):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('api:v2:coupons-detail', args=[coupon.id]))
+            self.assertEqual(response.status_code, 200)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
     def test_response(self):
         """Test the response data given after the order was created."""
         self.assertEqual(self.response.status_code, 200)
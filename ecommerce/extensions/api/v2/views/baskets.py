@@ -135,25 +135,27 @@ class BasketCreateView(EdxOrderPlacementMixin, generics.CreateAPIView):
 
             requested_products = request.data.get('products')
             if requested_products:
-                for requested_product in requested_products:
+                # Retrieve all requested products at once, then validate them in the order they were requested.
+                skus = [requested_product.get('sku') for requested_product in requested_products]
+                products = data_api.get_products([sku for sku in skus if sku])
+                purchases = []
+                for sku in skus:
                     # Ensure the requested products exist
-                    sku = requested_product.get('sku')
-                    if sku:
-                        try:
-                            product = data_api.get_product(sku)
-                        except api_exceptions.ProductNotFoundError as error:
-                            return self._report_bad_request(
-                                error.message,
-                                api_exceptions.PRODUCT_NOT_FOUND_USER_MESSAGE
-                            )
-                    else:
+                    if not sku:
                         return self._report_bad_request(
                             api_exceptions.SKU_NOT_FOUND_DEVELOPER_MESSAGE,
                             api_exceptions.SKU_NOT_FOUND_USER_MESSAGE
                         )
+                    if sku not in products:
+                        return self._report_bad_request(
+                            api_exceptions.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=sku),
+                            api_exceptions.PRODUCT_NOT_FOUND_USER_MESSAGE
+                        )
+                    product, stockrecord = products[sku]
 
                     # Ensure the requested products are available for purchase before adding them to the basket
-                    availability = basket.strategy.fetch_for_product(product).availability
+                    stock_info = basket.strategy.fetch_for_product(product, stockrecord=stockrecord)
+                    availability = stock_info.availability
                     if not availability.is_available_to_buy:
                         return self._report_bad_request(
                             api_exceptions.PRODUCT_UNAVAILABLE_DEVELOPER_MESSAGE.format(
@@ -162,8 +164,10 @@ class BasketCreateView(EdxOrderPlacementMixin, generics.CreateAPIView):
                             ),
                             api_exceptions.PRODUCT_UNAVAILABLE_USER_MESSAGE
                         )
+                    purchases.append((product, stock_info))
 
-                    basket.add_product(product)
+                basket.add_products(purchases)
+                for sku in skus:
                     logger.info('Added product with SKU [%s] to basket [%d]', sku, basket_id)
             else:
                 # If no products were included in the request, we cannot checkout.
@@ -11,12 +11,11 @@ from rest_framework_extensions.mixins import NestedViewSetMixin
 from slumber.exceptions import SlumberBaseException
 
 from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
-from ecommerce.coupons.utils import get_range_catalog_query_results
+from ecommerce.coupons.utils import get_range_catalog_query_results, get_seats_for_course_ids
 from ecommerce.extensions.api import serializers
 
 
 Catalog = get_model('catalogue', 'Catalog')
-Product = get_model('catalogue', 'Product')
 logger = logging.getLogger(__name__)
 
 
@@ -55,12 +54,9 @@ class CatalogViewSet(NestedViewSetMixin, ReadOnlyModelViewSet):
                 )
                 results = response['results']
                 course_ids = [result['key'] for result in results]
+                seats, __ = get_seats_for_course_ids(course_ids, seat_types)
                 seats = serializers.ProductSerializer(
-                    Product.objects.filter(
-                        course_id__in=course_ids,
-                        attributes__name='certificate_type',
-                        attribute_values__value_text__in=seat_types
-                    ),
+                    seats,
                     many=True,
                     context={'request': request}
                 ).data
@@ -16,14 +16,14 @@ from rest_framework.response import Response
 from ecommerce.core.models import BusinessClient
 from ecommerce.coupons.utils import prepare_course_seat_types
 from ecommerce.extensions.api import data as data_api
-from ecommerce.extensions.api.filters import ProductFilter
+from ecommerce.extensions.api.filters import CouponFilter
 from ecommerce.extensions.api.serializers import CategorySerializer, CouponSerializer, CouponListSerializer
 from ecommerce.extensions.basket.utils import prepare_basket
 from ecommerce.extensions.catalogue.utils import generate_sku, get_or_create_catalog
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.processors.invoice import InvoicePayment
 from ecommerce.extensions.voucher.models import CouponVouchers
-from ecommerce.extensions.voucher.utils import create_vouchers, update_voucher_offer
+from ecommerce.extensions.voucher.utils import create_vouchers, invalidate_coupon_report, update_voucher_offer
 from ecommerce.invoice.models import Invoice
 
 Basket = get_model('basket', 'Basket')
@@ -43,8 +43,24 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
     """ Coupon resource. """
     queryset = Product.objects.filter(product_class__name='Coupon')
     permission_classes = (IsAuthenticated, IsAdminUser)
-    filter_backends = (filters.DjangoFilterBackend, )
-    filter_class = ProductFilter
+    filter_backends = (filters.DjangoFilterBackend, filters.OrderingFilter, )
+    filter_class = CouponFilter
+    ordering_fields = (
+        'id', 'title', 'coupon_vouchers__num_vouchers', 'coupon_vouchers__num_redemptions',
+        'coupon_vouchers__last_redemption_datetime',
+    )
+
+    def get_queryset(self):
+        queryset = super(CouponViewSet, self).get_queryset()
+        if self.action == 'list':
+            # The coupon usage summary is stored on the coupon vouchers.
+            queryset = queryset.prefetch_related('coupon_vouchers')
+        else:
+            # Prefetch the relations read by CouponSerializer, which loads the rest of its data once per coupon.
+            queryset = queryset.select_related('product_class').prefetch_related(
+                'categories', 'coupon_vouchers', 'stockrecords'
+            )
+        return queryset
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -338,6 +354,9 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
 
         self.update_invoice_data(coupon, request.data)
 
+        # Voucher, offer and range updates above bypass the coupon report watermark.
+        invalidate_coupon_report(coupon)
+
         serializer = self.get_serializer(coupon)
         return Response(serializer.data)
 
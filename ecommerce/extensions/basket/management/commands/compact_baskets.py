@@ -0,0 +1,55 @@
+"""
+Management command that merges the duplicate editable baskets of users.
+
+Users who accumulated several editable baskets for a site would otherwise have them merged when they next retrieve
+their basket, on the request path.
+"""
+from __future__ import unicode_literals
+
+from django.core.management import BaseCommand
+from django.db.models import Count
+from oscar.core.loading import get_model
+
+Basket = get_model('basket', 'Basket')
+
+
+class Command(BaseCommand):
+    help = 'Merge the editable baskets of users who have more than one for a site.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Maximum number of users whose baskets are merged.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually merge the baskets.')
+
+    def handle(self, *args, **options):
+        editable_baskets = Basket.objects.filter(
+            owner__isnull=False, site__isnull=False, status__in=Basket.editable_statuses
+        )
+        duplicates = editable_baskets.values('owner', 'site').annotate(
+            basket_count=Count('id')
+        ).filter(basket_count__gt=1).order_by('owner', 'site')[:options['batch_size']]
+        duplicates = list(duplicates)
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have merged the baskets of [{}] users.'.format(len(duplicates))
+            self.stderr.write(msg)
+            return
+
+        merged = 0
+        for duplicate in duplicates:
+            baskets = list(editable_baskets.filter(owner=duplicate['owner'], site=duplicate['site']).order_by('id'))
+            if len(baskets) > 1:
+                # Don't add line quantities when merging baskets, as Basket.get_basket does.
+                baskets[0].merge_baskets(baskets[1:], add_quantities=False)
+                merged += len(baskets) - 1
+
+        self.stderr.write('Merged [{}] baskets of [{}] users.'.format(merged, len(duplicates)))
@@ -19,6 +19,55 @@ class BasketMiddleware(OscarBasketMiddleware):
         key = '{base}_{site_id}'.format(base=key, site_id=request.site.id)
         return key
 
+    def get_session_key(self, request):
+        """
+        Returns the session key under which the ID of the open basket of a user is pinned.
+
+        Parameters:
+            request (Request) -- current request being processed
+
+        Returns:
+            str - session key
+        """
+        return 'open_basket_id_{site_id}'.format(site_id=request.site.id)
+
+    def get_pinned_basket(self, request, manager):
+        """
+        Returns the open basket pinned in the session of the current user, with its lines.
+
+        Parameters:
+            request (Request) -- current request being processed
+            manager (Manager) -- manager of the open baskets
+
+        Returns:
+            Basket - the pinned basket, or None if no basket is pinned, or the pinned basket
+            is no longer open or does not belong to the user.
+        """
+        session = getattr(request, 'session', None)
+        basket_id = session.get(self.get_session_key(request)) if session is not None else None
+        if basket_id is None:
+            return None
+
+        try:
+            basket = manager.get(id=basket_id, owner=request.user, site=request.site)
+        except Basket.DoesNotExist:
+            return None
+
+        # Load the lines the way Basket.all_lines does, and let the basket reuse the evaluated queryset,
+        # along with its prefetched attributes and images. Oscar resets _lines when the lines change.
+        lines = basket.lines.select_related('product', 'stockrecord').prefetch_related(
+            'attributes', 'product__images'
+        ).order_by('id')
+        list(lines)
+        basket._lines = lines  # pylint: disable=protected-access
+        return basket
+
+    def pin_basket(self, request, basket):
+        """ Pins the ID of the open basket of the current user in the session. """
+        session = getattr(request, 'session', None)
+        if session is not None and basket.id:
+            session[self.get_session_key(request)] = basket.id
+
     def get_basket(self, request):
         """ Return the open basket for this request """
         # pylint: disable=protected-access
@@ -33,15 +82,18 @@ class BasketMiddleware(OscarBasketMiddleware):
             # Signed-in user: if they have a cookie basket too, it means
             # that they have just signed in and we need to merge their cookie
             # basket into their user basket, then delete the cookie.
-            try:
-                basket, __ = manager.get_or_create(owner=request.user, site=request.site)
-            except Basket.MultipleObjectsReturned:
-                # Not sure quite how we end up here with multiple baskets.
-                # We merge them and create a fresh one
-                old_baskets = list(manager.filter(owner=request.user, site=request.site))
-                basket = old_baskets[0]
-                for other_basket in old_baskets[1:]:
-                    self.merge_baskets(basket, other_basket)
+            basket = self.get_pinned_basket(request, manager)
+            if basket is None:
+                try:
+                    basket, __ = manager.get_or_create(owner=request.user, site=request.site)
+                except Basket.MultipleObjectsReturned:
+                    # Not sure quite how we end up here with multiple baskets.
+                    # We merge them and create a fresh one
+                    old_baskets = list(manager.filter(owner=request.user, site=request.site))
+                    basket = old_baskets[0]
+                    basket.merge_baskets(old_baskets[1:], add_quantities=False)
+
+                self.pin_basket(request, basket)
 
             # Assign user onto basket to prevent further SQL queries when
             # basket.owner is accessed.
@@ -49,6 +101,7 @@ class BasketMiddleware(OscarBasketMiddleware):
 
             if cookie_basket:
                 self.merge_baskets(basket, cookie_basket)
+                basket._lines = None  # pylint: disable=protected-access
                 request.cookies_to_delete.append(cookie_key)
 
         elif cookie_basket:
@@ -1,4 +1,7 @@
-from django.db import models
+from collections import OrderedDict, defaultdict
+
+from django.db import models, transaction
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.abstract_models import AbstractBasket
 from oscar.core.loading import get_class
@@ -36,15 +39,139 @@ class Basket(AbstractBasket):
         else:
             stale_baskets = list(editable_baskets)
             basket = stale_baskets.pop(0)
-            for stale_basket in stale_baskets:
+            if stale_baskets:
                 # Don't add line quantities when merging baskets
-                basket.merge(stale_basket, add_quantities=False)
+                basket.merge_baskets(stale_baskets, add_quantities=False)
 
         # Assign the appropriate strategy class to the basket
         basket.strategy = Selector().strategy(user=user)
 
         return basket
 
+    def merge_baskets(self, baskets, add_quantities=True):
+        """ Merges several baskets into this one, with a fixed number of queries.
+
+        The result is the same as merging each basket in turn with merge: lines are moved to this basket, unless it
+        already has a line with the same reference, in which case the quantities are added, or the largest quantity
+        is kept. The vouchers of the baskets are moved to this basket, and the baskets are marked as merged.
+
+        Arguments:
+            baskets (list): Baskets to merge into this basket.
+            add_quantities (bool): Whether the quantities of lines with the same reference are added.
+        """
+        basket_ids = [basket.id for basket in baskets]
+        basket_order = {basket_id: index for index, basket_id in enumerate([self.id] + basket_ids)}
+        LineModel = self.lines.model
+        VoucherRelation = Basket.vouchers.through
+
+        with transaction.atomic():
+            lines = sorted(
+                LineModel.objects.filter(basket_id__in=basket_order.keys()).values_list(
+                    'id', 'basket_id', 'line_reference', 'quantity'
+                ),
+                key=lambda line: (basket_order[line[1]], line[0])
+            )
+
+            # The first line with a given reference, in this basket or else in the order of the merged baskets,
+            # is kept, and given the quantity of all the lines with that reference.
+            kept_lines = OrderedDict()
+            deleted_line_ids = []
+            for line_id, basket_id, line_reference, quantity in lines:
+                if line_reference not in kept_lines:
+                    kept_lines[line_reference] = [line_id, basket_id, quantity, quantity]
+                    continue
+
+                kept_line = kept_lines[line_reference]
+                kept_line[3] = kept_line[3] + quantity if add_quantities else max(kept_line[3], quantity)
+                deleted_line_ids.append(line_id)
+
+            moved_line_ids = [line_id for line_id, basket_id, __, __ in kept_lines.values() if basket_id != self.id]
+            quantities = defaultdict(list)
+            for line_id, __, quantity, merged_quantity in kept_lines.values():
+                if merged_quantity != quantity:
+                    quantities[merged_quantity].append(line_id)
+
+            if deleted_line_ids:
+                LineModel.objects.filter(id__in=deleted_line_ids).delete()
+            if moved_line_ids:
+                LineModel.objects.filter(id__in=moved_line_ids).update(basket=self)
+            for quantity, line_ids in quantities.items():
+                LineModel.objects.filter(id__in=line_ids).update(quantity=quantity)
+
+            # Move the vouchers, once, unless this basket already has them.
+            voucher_ids = set(self.vouchers.values_list('id', flat=True))
+            moved_relation_ids = []
+            relations = VoucherRelation.objects.filter(basket_id__in=basket_ids).order_by('id')
+            for relation_id, voucher_id in relations.values_list('id', 'voucher_id'):
+                if voucher_id not in voucher_ids:
+                    voucher_ids.add(voucher_id)
+                    moved_relation_ids.append(relation_id)
+            VoucherRelation.objects.filter(id__in=moved_relation_ids).update(basket=self)
+            VoucherRelation.objects.filter(basket_id__in=basket_ids).delete()
+
+            date_merged = now()
+            Basket.objects.filter(id__in=basket_ids).update(status=self.MERGED, date_merged=date_merged)
+
+        for basket in baskets:
+            basket.status = self.MERGED
+            basket.date_merged = date_merged
+            basket._lines = None  # pylint: disable=protected-access
+        self._lines = None
+
+    def add_products(self, purchases):
+        """ Adds one unit of each of several products to the basket, inserting the new lines in bulk.
+
+        Arguments:
+            purchases (list): (product, purchase info) tuples, the purchase info being the one returned by
+                the basket's strategy for the product.
+
+        Raises:
+            ValueError: If the strategy found no price for a product, or if the price of a product is in a
+                different currency than the basket's lines.
+        """
+        if not self.id:
+            self.save()
+
+        currency = self.currency
+        lines = OrderedDict()
+        for product, stock_info in purchases:
+            if not stock_info.price.exists:
+                raise ValueError("Strategy hasn't found a price for product %s" % product)
+
+            if currency and stock_info.price.currency != currency:
+                raise ValueError((
+                    "Basket lines must all have the same currency. Proposed "
+                    "line has currency %s, while basket has currency %s")
+                    % (stock_info.price.currency, currency))
+            currency = stock_info.price.currency
+
+            line_reference = self._create_line_reference(product, stock_info.stockrecord, None)
+            lines.setdefault(line_reference, [product, stock_info, 0])[2] += 1
+
+        LineModel = self.lines.model
+        existing_lines = {line.line_reference: line for line in self.lines.filter(line_reference__in=lines.keys())}
+        new_lines = []
+        with transaction.atomic():
+            for line_reference, (product, stock_info, quantity) in lines.items():
+                if line_reference in existing_lines:
+                    line = existing_lines[line_reference]
+                    line.quantity += quantity
+                    line.save()
+                else:
+                    new_lines.append(LineModel(
+                        basket=self,
+                        line_reference=line_reference,
+                        product=product,
+                        stockrecord=stock_info.stockrecord,
+                        quantity=quantity,
+                        price_currency=stock_info.price.currency,
+                        price_excl_tax=stock_info.price.excl_tax,
+                        price_incl_tax=stock_info.price.incl_tax if stock_info.price.is_tax_known else None
+                    ))
+            LineModel.objects.bulk_create(new_lines)
+
+        self.reset_offer_applications()
+
     def clear_vouchers(self):
         """Remove all vouchers applied to the basket."""
         for v in self.vouchers.all():
@@ -132,3 +132,26 @@ class AddSiteToBasketsBasketsCommandTests(TestCase):
         """ Verify an error is raised if no site ID is specified. """
         with self.assertRaisesMessage(CommandError, 'A valid Site ID must be specified!'):
             call_command(self.command, commit=False)
+
+
+class CompactBasketsCommandTests(TestCase):
+    command = 'compact_baskets'
+
+    def setUp(self):
+        super(CompactBasketsCommandTests, self).setUp()
+        self.user = self.create_user()
+        self.baskets = [factories.BasketFactory(owner=self.user, site=self.site) for __ in range(0, 3)]
+        self.other_basket = factories.BasketFactory(owner=self.create_user(), site=self.site)
+
+    def test_without_commit(self):
+        """ Verify the command does not merge baskets if the commit flag is not set. """
+        call_command(self.command, commit=False, stderr=StringIO())
+        self.assertEqual(Basket.objects.filter(status=Basket.OPEN).count(), 4)
+
+    def test_with_commit(self):
+        """ Verify the command merges the duplicate editable baskets of users into their first basket. """
+        call_command(self.command, commit=True, stderr=StringIO())
+
+        statuses = [Basket.objects.get(id=basket.id).status for basket in self.baskets]
+        self.assertEqual(statuses, [Basket.OPEN, Basket.MERGED, Basket.MERGED])
+        self.assertEqual(Basket.objects.get(id=self.other_basket.id).status, Basket.OPEN)
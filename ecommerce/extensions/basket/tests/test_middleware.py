@@ -1,8 +1,9 @@
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.cache import SessionStore
 from django.test.client import RequestFactory
 from oscar.core.loading import get_model
-from oscar.test.factories import BasketFactory
+from oscar.test.factories import BasketFactory, ProductFactory
 
 from ecommerce.extensions.basket import middleware
 from ecommerce.tests.testcases import TestCase
@@ -79,6 +80,39 @@ class BasketMiddlewareTests(TestCase):
         self.assertEqual(self.request._basket_cache, basket)
         self.assertEqual(self.middleware.get_basket(self.request), self.request._basket_cache)
 
+    def test_get_basket_pinned_in_session(self):
+        """ Verify the open basket of a user is pinned in the session, and later loaded by ID with its lines. """
+        # pylint: disable=protected-access
+        self.request.user = self.create_user()
+        self.request.session = SessionStore()
+        basket = BasketFactory(owner=self.request.user, site=self.site)
+        line, __ = basket.add_product(ProductFactory())
+
+        self.assertEqual(self.middleware.get_basket(self.request), basket)
+        self.assertEqual(self.request.session[self.middleware.get_session_key(self.request)], basket.id)
+
+        self.request._basket_cache = None
+        with self.assertNumQueries(4):
+            pinned_basket = self.middleware.get_basket(self.request)
+            self.assertEqual(pinned_basket, basket)
+            self.assertEqual(len(pinned_basket.all_lines()), 1)
+            self.assertEqual(pinned_basket.num_lines, 1)
+            self.assertEqual(pinned_basket.all_lines()[0].stockrecord, line.stockrecord)
+
+    def test_get_basket_pinned_basket_submitted(self):
+        """ Verify a new basket is returned, and pinned, if the pinned basket is no longer open. """
+        # pylint: disable=protected-access
+        self.request.user = self.create_user()
+        self.request.session = SessionStore()
+        basket = BasketFactory(owner=self.request.user, site=self.site)
+        self.assertEqual(self.middleware.get_basket(self.request), basket)
+        basket.submit()
+
+        self.request._basket_cache = None
+        new_basket = self.middleware.get_basket(self.request)
+        self.assertNotEqual(new_basket, basket)
+        self.assertEqual(self.request.session[self.middleware.get_session_key(self.request)], new_basket.id)
+
     def test_get_basket_with_anonymous_user(self):
         """ Verify a new basket is created for anonymous users without cookies. """
         basket = self.middleware.get_basket(self.request)
@@ -1,6 +1,7 @@
 import itertools
 
 from django.contrib.sites.models import Site
+import mock
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 
@@ -107,6 +108,62 @@ class BasketTests(TestCase):
         # Verify the basket for the second site/tenant is not modified
         self.assert_basket_state(user.baskets.get(site=self.site2), Basket.OPEN, user, self.site2)
 
+    def test_merge_baskets(self):
+        """ Verify the lines and vouchers of several baskets are merged into a basket. """
+        user = factories.UserFactory()
+        product, other_product = factories.create_product(price=10), factories.create_product(price=10)
+        voucher = factories.VoucherFactory()
+        basket = self._create_basket(user, self.site1)
+        basket.add_product(product, 1)
+        stale_baskets = [self._create_basket(user, self.site1) for __ in range(2)]
+        stale_baskets[0].add_product(product, 3)
+        stale_baskets[0].vouchers.add(voucher)
+        stale_baskets[1].add_product(other_product, 2)
+        stale_baskets[1].vouchers.add(voucher)
+        line_count = sum(b.lines.count() for b in [basket] + stale_baskets)
+
+        basket.merge_baskets(stale_baskets, add_quantities=False)
+
+        self.assertEqual(basket.lines.get(product=product).quantity, 3)
+        self.assertEqual(basket.lines.get(product=other_product).quantity, 2)
+        # Each basket created by the factory has a line of its own, in addition to the lines added above.
+        self.assertEqual(basket.lines.count(), line_count - 1)
+        self.assertEqual(list(basket.vouchers.all()), [voucher])
+        for stale_basket in stale_baskets:
+            stale_basket = Basket.objects.get(id=stale_basket.id)
+            self.assertEqual(stale_basket.status, Basket.MERGED)
+            self.assertIsNotNone(stale_basket.date_merged)
+            self.assertEqual(stale_basket.lines.count(), 0)
+            self.assertEqual(stale_basket.vouchers.count(), 0)
+
+    def test_add_products(self):
+        """ Verify several products are added to the basket, with the quantities add_product would give them. """
+        basket = self._create_basket(factories.UserFactory(), self.site1)
+        existing_line = basket.all_lines()[0]
+        product = factories.create_product(price=10)
+        purchases = [
+            (product, basket.strategy.fetch_for_product(product)),
+            (existing_line.product, basket.strategy.fetch_for_product(existing_line.product)),
+            (product, basket.strategy.fetch_for_product(product)),
+        ]
+
+        basket.add_products(purchases)
+
+        self.assertEqual(basket.lines.count(), 2)
+        self.assertEqual(basket.lines.get(product=product).quantity, 2)
+        self.assertEqual(basket.lines.get(id=existing_line.id).quantity, existing_line.quantity + 1)
+        self.assertEqual(basket.lines.get(product=product).price_excl_tax, purchases[0][1].price.excl_tax)
+
+    def test_add_products_without_price(self):
+        """ Verify products for which the strategy found no price are not added. """
+        basket = self._create_basket(factories.UserFactory(), self.site1)
+        product = factories.create_product(price=10)
+        stock_info = basket.strategy.fetch_for_product(product)
+
+        with mock.patch.object(stock_info.price, 'exists', False):
+            self.assertRaises(ValueError, basket.add_products, [(product, stock_info)])
+        self.assertFalse(basket.lines.filter(product=product).exists())
+
     def test_create_basket(self):
         """ Verify the method creates a new basket. """
         user = factories.UserFactory()
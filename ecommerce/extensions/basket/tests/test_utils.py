@@ -1,4 +1,5 @@
 import ddt
+import mock
 from django.test import RequestFactory
 from oscar.core.loading import get_model
 from oscar.test.factories import ProductFactory, RangeFactory, VoucherFactory
@@ -11,7 +12,7 @@ from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.extensions.partner.models import StockRecord
 from ecommerce.extensions.test.factories import prepare_voucher
 from ecommerce.referrals.models import Referral
-from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.factories import SiteConfigurationFactory, StockRecordFactory
 from ecommerce.tests.testcases import TestCase
 
 Benefit = get_model('offer', 'Benefit')
@@ -106,6 +107,45 @@ class BasketUtilsTests(CourseCatalogTestMixin, TestCase):
         self.assertEqual(basket.lines.first().product, product2)
         self.assertEqual(basket.product_quantity(product2), 1)
 
+    def test_prepare_basket_unchanged(self):
+        """ Verify the lines and vouchers of a basket are not written again if they do not change. """
+        product = ProductFactory(stockrecords__price_excl_tax=100)
+        voucher, product = prepare_voucher(_range=RangeFactory(products=[product, ]), benefit_value=10)
+        basket = prepare_basket(self.request, product, voucher)
+        line = basket.all_lines()[0]
+
+        with mock.patch.object(Basket, 'flush') as mock_flush:
+            with mock.patch.object(Basket, 'add_product') as mock_add_product:
+                basket = prepare_basket(self.request, product, voucher)
+
+        self.assertFalse(mock_flush.called)
+        self.assertFalse(mock_add_product.called)
+        self.assertEqual(list(basket.all_lines()), [line])
+        self.assertEqual(list(basket.vouchers.all()), [voucher])
+        self.assertEqual(basket.total_excl_tax, 90.00)
+
+    def test_prepare_basket_stock_record_deleted(self):
+        """ Verify a line whose stock record has been deleted is replaced. """
+        product = ProductFactory(stockrecords__price_excl_tax=100)
+        basket = prepare_basket(self.request, product)
+        stock_record = basket.all_lines()[0].stockrecord
+        stock_record.delete()
+        new_stock_record = StockRecordFactory(product=product, partner=stock_record.partner, price_excl_tax=50)
+
+        basket = prepare_basket(self.request, product)
+        line = basket.all_lines()[0]
+        self.assertEqual(line.stockrecord, new_stock_record)
+        self.assertEqual(line.price_excl_tax, 50)
+
+    def test_prepare_basket_price_changed(self):
+        """ Verify a line is replaced if the price given by the basket's strategy changed. """
+        product = ProductFactory(stockrecords__price_excl_tax=100)
+        basket = prepare_basket(self.request, product)
+        StockRecord.objects.filter(product=product).update(price_excl_tax=50)
+
+        basket = prepare_basket(self.request, product)
+        self.assertEqual(basket.all_lines()[0].price_excl_tax, 50)
+
     def test_prepare_basket_affiliate_cookie_lifecycle(self):
         """ Verify a basket is returned and referral captured. """
         product = ProductFactory()
@@ -259,12 +259,12 @@ class BasketSummaryViewTests(CourseCatalogTestMixin, LmsApiMockMixin, ApiMockMix
         with LogCapture(logger_name) as l:
             response = self.client.get(self.path)
             self.assertEqual(response.status_code, 200)
-            l.check(
-                (
-                    logger_name, 'ERROR',
-                    u'Failed to retrieve data from Course API for course [{}].'.format(self.course.id)
-                )
-            )
+            self.assertEqual(len(l.records), 1)
+            record = l.records[0]
+            self.assertEqual(record.levelname, 'ERROR')
+            self.assertEqual(record.msg, 'Failed to retrieve data from Course API for course [%s]: %s')
+            self.assertEqual(unicode(record.args[0]), self.course.id)
+            self.assertIsInstance(record.args[1], error)
 
     def test_enrollment_code_seat_type(self):
         """Verify the correct seat type attribute is retrieved."""
@@ -1,15 +1,17 @@
 import logging
 
 from django.conf import settings
+from django.db import transaction
 from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.middleware import defer_signal
+from ecommerce.courses.models import Course
 from ecommerce.referrals.models import Referral
 
 Applicator = get_class('offer.utils', 'Applicator')
 Basket = get_model('basket', 'Basket')
-StockRecord = get_model('partner', 'StockRecord')
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,10 @@ def prepare_basket(request, product, voucher=None):
     vouchers added to the basket are removed because we allow only one voucher per basket.
     Vouchers are not applied if an enrollment code product is in the basket.
 
+    The lines, vouchers and referral of the basket are only written if they change. Receivers of the
+    basket_addition signal are called once the response to the request is ready, after its transaction
+    is committed.
+
     Arguments:
         request (Request): The request object made to the view.
         product (Product): Product to be added to the basket.
@@ -32,28 +38,45 @@ def prepare_basket(request, product, voucher=None):
         basket (Basket): Contains the product to be redeemed and the Voucher applied.
     """
     basket = Basket.get_basket(request.user, request.site)
-    basket.flush()
-    basket.add_product(product, 1)
-    if product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME:
-        basket.clear_vouchers()
-    elif voucher:
-        basket.clear_vouchers()
-        basket.vouchers.add(voucher)
-        Applicator().apply(basket, request.user, request)
-        logger.info('Applied Voucher [%s] to basket [%s].', voucher.code, basket.id)
-
-    affiliate_id = request.COOKIES.get(settings.AFFILIATE_COOKIE_KEY)
-    if affiliate_id:
-        Referral.objects.update_or_create(
-            basket=basket,
-            defaults={'affiliate_id': affiliate_id}
-        )
-    else:
-        Referral.objects.filter(basket=basket).delete()
+
+    with transaction.atomic():
+        lines = list(basket.all_lines())
+        unchanged = False
+        # Lines whose stock record has been deleted are replaced.
+        if len(lines) == 1 and lines[0].product_id == product.id and lines[0].quantity == 1 and lines[0].stockrecord_id:
+            # Compare with the price the line would be given by add_product.
+            stock_info = basket.strategy.fetch_for_product(product)
+            unchanged = (
+                stock_info.stockrecord is not None and stock_info.stockrecord.id == lines[0].stockrecord_id and
+                stock_info.price.exists and lines[0].price_excl_tax == stock_info.price.excl_tax
+            )
+        if not unchanged:
+            basket.flush()
+            basket.add_product(product, 1)
+
+        voucher_ids = list(basket.vouchers.values_list('id', flat=True))
+        if product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME:
+            if voucher_ids:
+                basket.vouchers.clear()
+        elif voucher:
+            if voucher_ids != [voucher.id]:
+                basket.vouchers.clear()
+                basket.vouchers.add(voucher)
+            Applicator().apply(basket, request.user, request)
+            logger.info('Applied Voucher [%s] to basket [%s].', voucher.code, basket.id)
+
+        affiliate_id = request.COOKIES.get(settings.AFFILIATE_COOKIE_KEY)
+        if affiliate_id:
+            referral, created = Referral.objects.get_or_create(basket=basket, defaults={'affiliate_id': affiliate_id})
+            if not created and referral.affiliate_id != affiliate_id:
+                referral.affiliate_id = affiliate_id
+                referral.save()
+        else:
+            Referral.objects.filter(basket=basket).delete()
 
     # Call signal handler to notify listeners that something has been added to the basket
     basket_addition = get_class('basket.signals', 'basket_addition')
-    basket_addition.send(sender=basket_addition, product=product, user=request.user, request=request)
+    defer_signal(request, basket_addition, sender=basket_addition, product=product, user=request.user, request=request)
 
     return basket
 
@@ -63,31 +86,13 @@ def get_basket_switch_data(product):
 
     if product_class_name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME:
         switch_link_text = _('Click here to just purchase an enrollment for yourself')
-        structure = 'child'
     elif product_class_name == SEAT_PRODUCT_CLASS_NAME:
         switch_link_text = _('Click here to purchase multiple seats in this course')
-        structure = 'standalone'
-
-    stock_records = StockRecord.objects.filter(
-        product__course_id=product.course_id,
-        product__structure=structure
-    )
-
-    # Determine the proper partner SKU to embed in the single/multiple basket switch link
-    # The logic here is a little confusing.  "Seat" products have "certificate_type" attributes, and
-    # "Enrollment Code" products have "seat_type" attributes.  If the basket is in single-purchase
-    # mode, we are working with a Seat product and must present the 'buy multiple' switch link and
-    # SKU from the corresponding Enrollment Code product.  If the basket is in multi-purchase mode,
-    # we are working with an Enrollment Code product and must present the 'buy single' switch link
-    # and SKU from the corresponding Seat product.
-    partner_sku = None
-    product_cert_type = getattr(product.attr, 'certificate_type', None)
-    product_seat_type = getattr(product.attr, 'seat_type', None)
-    for stock_record in stock_records:
-        stock_record_cert_type = getattr(stock_record.product.attr, 'certificate_type', None)
-        stock_record_seat_type = getattr(stock_record.product.attr, 'seat_type', None)
-        if (product_seat_type and product_seat_type == stock_record_cert_type) or \
-           (product_cert_type and product_cert_type == stock_record_seat_type):
-            partner_sku = stock_record.partner_sku
-            break
+
+    # If the basket is in single-purchase mode, we are working with a Seat product and must present the
+    # 'buy multiple' switch link and SKU from the corresponding Enrollment Code product. If the basket is in
+    # multi-purchase mode, we are working with an Enrollment Code product and must present the 'buy single'
+    # switch link and SKU from the corresponding Seat product. The SKU is read from the map of each course's
+    # seats and enrollment codes to their counterparts, cached by Course.update_basket_switch_skus.
+    partner_sku = Course.get_basket_switch_sku(product)
     return switch_link_text, partner_sku
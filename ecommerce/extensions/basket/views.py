@@ -13,7 +13,7 @@ from slumber.exceptions import SlumberBaseException
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.coupons.views import get_voucher_and_products_from_code
-from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_lms, mode_for_seat
+from ecommerce.courses.utils import get_certificate_type_display_value, get_course_infos_from_lms, mode_for_seat
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.basket.utils import prepare_basket, get_basket_switch_data
 from ecommerce.extensions.offer.utils import format_benefit_value
@@ -100,21 +100,24 @@ class BasketSummaryView(BasketView):
         is_verification_required = is_bulk_purchase = False
         switch_link_text = partner_sku = ''
 
-        for line in lines:
-            course_key = CourseKey.from_string(line.product.attr.course_key)
+        # Retrieve the courses of all lines at once, so that uncached courses are requested concurrently.
+        course_keys = [CourseKey.from_string(line.product.attr.course_key) for line in lines]
+        courses = get_course_infos_from_lms(course_keys)
+
+        for line, course_key in zip(lines, course_keys):
             course_name = None
             image_url = None
             short_description = None
-            try:
-                course = get_course_info_from_lms(course_key)
+            course, exception = courses[course_key]
+            if exception is None:
                 try:
                     image_url = course['media']['image']['raw']
                 except (KeyError, TypeError):
                     image_url = ''
                 short_description = course.get('short_description', '')
                 course_name = course['name']
-            except (ConnectionError, SlumberBaseException, Timeout):
-                logger.exception('Failed to retrieve data from Course API for course [%s].', course_key)
+            else:
+                logger.error('Failed to retrieve data from Course API for course [%s]: %s', course_key, exception)
 
             if self.request.site.siteconfiguration.enable_enrollment_codes:
                 # Get variables for the switch link that toggles from enrollment codes and seat.
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+def populate_certificate_type(apps, schema_editor):
+    """ Copy the certificate_type attribute of existing products to their certificate_type field. """
+    Product = apps.get_model('catalogue', 'Product')
+    ProductAttributeValue = apps.get_model('catalogue', 'ProductAttributeValue')
+
+    certificate_types = ProductAttributeValue.objects.filter(
+        attribute__code='certificate_type'
+    ).values_list('value_text', flat=True).distinct()
+
+    for certificate_type in certificate_types:
+        Product.objects.filter(
+            attribute_values__attribute__code='certificate_type',
+            attribute_values__value_text=certificate_type
+        ).update(certificate_type=certificate_type)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0019_enrollment_code_idverifyreq_attribute'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='certificate_type',
+            field=models.CharField(max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='certificate_type',
+            field=models.CharField(max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='product',
+            index_together=set([('course', 'certificate_type')]),
+        ),
+        migrations.RunPython(populate_certificate_type, migrations.RunPython.noop),
+    ]
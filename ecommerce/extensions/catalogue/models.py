@@ -1,4 +1,8 @@
 # noinspection PyUnresolvedReferences
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.catalogue.abstract_models import AbstractProduct, AbstractProductAttributeValue
@@ -9,8 +13,25 @@ class Product(AbstractProduct):
     course = models.ForeignKey('courses.Course', null=True, blank=True, related_name='products')
     expires = models.DateTimeField(null=True, blank=True,
                                    help_text=_('Last date/time on which this product can be purchased.'))
+    # Copy of the certificate_type attribute of seats, indexed along with the course to look seats up in bulk.
+    # It is kept in step with the attribute by receivers in ecommerce.extensions.catalogue.signals.
+    certificate_type = models.CharField(max_length=255, null=True, blank=True, editable=False)
     history = HistoricalRecords()
 
+    class Meta(AbstractProduct.Meta):
+        index_together = (('course', 'certificate_type'),)
+
+    @property
+    def is_seat(self):
+        """ Whether this product is a course seat, without reading its product class. """
+        return bool(self.course_id) and self.is_child
+
+    def save(self, *args, **kwargs):
+        # Reading the attributes costs a query, and only seats are looked up by certificate type.
+        if self.is_seat:
+            self.certificate_type = getattr(self.attr, 'certificate_type', None)
+        super(Product, self).save(*args, **kwargs)
+
 
 class ProductAttributeValue(AbstractProductAttributeValue):
     history = HistoricalRecords()
@@ -21,6 +42,50 @@ class Catalog(models.Model):
     partner = models.ForeignKey('partner.Partner', related_name='catalogs')
     stock_records = models.ManyToManyField('partner.StockRecord', blank=True, related_name='catalogs')
 
+    # (version, product IDs) tuples kept in memory by this process, keyed by catalog ID.
+    _product_ids = {}
+
+    @classmethod
+    def _get_version_cache_key(cls, catalog_id):
+        return 'catalog_product_ids_version_{}'.format(catalog_id)
+
+    def get_product_ids(self):
+        """ Returns the IDs of the products of this catalog's stock records.
+
+        The IDs are kept in memory by each process, and in the cache, under the current version of the catalog's
+        stock records. They are read from the database again only after the stock records of the catalog change,
+        or when their version is evicted from the cache.
+
+        Returns:
+            frozenset
+        """
+        key = self._get_version_cache_key(self.id)
+        version = cache.get(key)
+        if version is None:
+            # Versions are never reused, so that IDs read before an eviction are not mistaken as current.
+            cache.add(key, uuid.uuid4().hex, None)
+            version = cache.get(key)
+
+        cached = self._product_ids.get(self.id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        product_ids_key = 'catalog_product_ids_{}_{}'.format(self.id, version)
+        product_ids = cache.get(product_ids_key)
+        if product_ids is None:
+            product_ids = frozenset(self.stock_records.values_list('product_id', flat=True))
+            cache.set(product_ids_key, product_ids, settings.CATALOG_PRODUCT_IDS_CACHE_TIMEOUT)
+
+        self._product_ids[self.id] = (version, product_ids)
+        return product_ids
+
+    @classmethod
+    def invalidate_product_ids(cls, catalog_ids):
+        """ Forces all processes to read the product IDs of the given catalogs from the database on next use. """
+        for catalog_id in catalog_ids:
+            cls._product_ids.pop(catalog_id, None)
+        cache.set_many({cls._get_version_cache_key(catalog_id): uuid.uuid4().hex for catalog_id in catalog_ids}, None)
+
     def __unicode__(self):
         return u'{id}: {partner_code}-{catalog_name}'.format(
             id=self.id,
@@ -0,0 +1,67 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.courses.models import Course
+
+Catalog = get_model('catalogue', 'Catalog')
+Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+@receiver(post_save, sender=Catalog)
+def invalidate_new_catalog_product_ids(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """ Ensures new catalogs do not share the cached product IDs of deleted catalogs with the same ID. """
+    if created:
+        Catalog.invalidate_product_ids([instance.id])
+
+
+@receiver(m2m_changed, sender=Catalog.stock_records.through)
+def invalidate_catalog_product_ids(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidates the cached product IDs of the catalogs whose stock records change. """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Catalog.invalidate_product_ids([instance.id])
+    elif action in ('post_add', 'post_remove'):
+        Catalog.invalidate_product_ids(list(pk_set))
+    elif action == 'pre_clear':
+        # The catalogs of the stock record are no longer known once they are cleared.
+        Catalog.invalidate_product_ids(list(instance.catalogs.values_list('id', flat=True)))
+
+
+@receiver(pre_delete, sender=StockRecord)
+def invalidate_stock_record_catalog_product_ids(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidates the cached product IDs of the catalogs of deleted stock records. """
+    Catalog.invalidate_product_ids(list(instance.catalogs.values_list('id', flat=True)))
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_basket_switch_skus(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidates the basket switch SKUs of the course of saved and deleted products. """
+    if instance.course_id:
+        Course.invalidate_basket_switch_skus(instance.course_id)
+
+
+@receiver(post_save, sender=StockRecord)
+@receiver(post_delete, sender=StockRecord)
+@receiver(post_save, sender=ProductAttributeValue)
+@receiver(post_delete, sender=ProductAttributeValue)
+def invalidate_product_data_basket_switch_skus(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """ Invalidates the basket switch SKUs of the course of products whose stock records or attributes change. """
+    course_ids = Product.objects.filter(id=instance.product_id).values_list('course_id', flat=True)
+    for course_id in course_ids:
+        if course_id:
+            Course.invalidate_basket_switch_skus(course_id)
+
+
+@receiver(post_save, sender=ProductAttributeValue)
+@receiver(post_delete, sender=ProductAttributeValue)
+def update_seat_certificate_type(sender, instance, signal, **kwargs):  # pylint: disable=unused-argument
+    """ Copies changes to the certificate_type attribute of seats to their certificate_type field. """
+    if instance.attribute.code == 'certificate_type':
+        certificate_type = instance.value if signal is post_save else None
+        Product.objects.filter(
+            id=instance.product_id, course__isnull=False, structure=Product.CHILD
+        ).update(certificate_type=certificate_type)
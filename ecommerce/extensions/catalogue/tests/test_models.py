@@ -0,0 +1,54 @@
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.tests.testcases import TestCase
+
+Catalog = get_model('catalogue', 'Catalog')
+Product = get_model('catalogue', 'Product')
+
+
+class CatalogTests(TestCase):
+    def setUp(self):
+        super(CatalogTests, self).setUp()
+        self.catalog = Catalog.objects.create(partner=self.partner)
+        self.stock_record = factories.create_stockrecord(factories.create_product())
+        self.catalog.stock_records.add(self.stock_record)
+
+    def test_get_product_ids(self):
+        """ Verify the product IDs of a catalog are read from the database once, until its stock records change. """
+        self.assertEqual(self.catalog.get_product_ids(), {self.stock_record.product.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.catalog.get_product_ids(), {self.stock_record.product.id})
+
+        other_stock_record = factories.create_stockrecord(factories.create_product())
+        other_stock_record.catalogs.add(self.catalog)
+        self.assertEqual(
+            self.catalog.get_product_ids(), {self.stock_record.product.id, other_stock_record.product.id}
+        )
+
+        self.catalog.stock_records.remove(self.stock_record)
+        self.assertEqual(self.catalog.get_product_ids(), {other_stock_record.product.id})
+
+        other_stock_record.delete()
+        self.assertEqual(self.catalog.get_product_ids(), frozenset())
+
+
+class ProductTests(TestCase):
+    def test_certificate_type(self):
+        """ Verify the certificate type of seats is kept in step with their certificate_type attribute. """
+        seat = CourseFactory().create_or_update_seat('verified', True, 100, self.partner)
+        self.assertEqual(Product.objects.get(id=seat.id).certificate_type, 'verified')
+
+        attribute_value = seat.attribute_values.get(attribute__code='certificate_type')
+        attribute_value.value = 'professional'
+        attribute_value.save()
+        self.assertEqual(Product.objects.get(id=seat.id).certificate_type, 'professional')
+
+        attribute_value.delete()
+        self.assertIsNone(Product.objects.get(id=seat.id).certificate_type)
+
+    def test_certificate_type_of_other_products(self):
+        """ Verify the certificate type is only copied for seats. """
+        product = factories.create_product(attributes={'certificate_type': 'verified'})
+        self.assertIsNone(Product.objects.get(id=product.id).certificate_type)
@@ -5,13 +5,18 @@ Calls down to a common interface for fulfillment of each line of an order based
 can successfully fulfill the product. Success can be reported back based on each line item in the order.
 
 """
+from collections import OrderedDict
 import logging
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils import importlib
 from django.utils.timezone import now
+import waffle
 
 from ecommerce.extensions.fulfillment import exceptions
+from ecommerce.extensions.fulfillment.retries import update_fulfillment_retries
 from ecommerce.extensions.fulfillment.status import ORDER, LINE
 from ecommerce.extensions.refund.status import REFUND_LINE
 
@@ -43,24 +48,24 @@ def fulfill_order(order, lines):
         logger.error(error_msg)
         raise exceptions.IncorrectOrderStatusError(error_msg)
 
-    # Construct a dict of lines by their product type.
-    line_items = list(lines.all())
+    line_items = list(lines.select_related('product__product_class', 'product__parent__product_class'))
+    registry = get_fulfillment_module_registry()
 
     try:
-        # Iterate over the Fulfillment Modules defined in our configuration and determine if they support
-        # any of the lines in the order. Fulfill line items in the order they are designated by the configuration.
-        # Remaining line items should be marked with a fulfillment error since we have no configuration that
-        # allows them to be fulfilled.
-        for module_class in get_fulfillment_modules():
-            module = module_class()
-            supported_lines = module.get_supported_lines(line_items)
+        # Group the lines by the first Fulfillment Module, in the order designated by our configuration, that
+        # supports their product type, and fulfill each group in that order. Line items that no module supports
+        # should be marked with a fulfillment error since we have no configuration that allows them to be fulfilled.
+        lines_by_module, unsupported_lines = registry.group_lines(line_items)
+
+        for module_class, module_lines in lines_by_module:
+            module = registry.get_module(module_class)
+            supported_lines = module.get_supported_lines(module_lines)
+            unsupported_lines.extend(set(module_lines) - set(supported_lines))
             if supported_lines:
-                line_items = list(set(line_items) - set(supported_lines))
                 module.fulfill_product(order, supported_lines)
 
-        # Check to see if any line items in the order have not been accounted for by a FulfillmentModule
-        # Any product does not line up with a module, we have to mark a fulfillment error.
-        for line in line_items:
+        # Any product that does not line up with a module has to be marked with a fulfillment error.
+        for line in unsupported_lines:
             product_type = line.product.get_product_class().name
             logger.error("Product Type [%s] does not have an associated Fulfillment Module. It cannot be fulfilled.",
                          product_type)
@@ -70,7 +75,8 @@ def fulfill_order(order, lines):
     finally:
         # Check if all lines are successful, or there were errors, and set the status of the Order.
         order_status = ORDER.COMPLETE
-        for line in lines.all():
+        line_items = list(lines.all())
+        for line in line_items:
             if line.status != LINE.COMPLETE:
                 logger.error('There was an error while fulfilling order [%s]', order.number)
                 order_status = ORDER.FULFILLMENT_ERROR
@@ -78,6 +84,10 @@ def fulfill_order(order, lines):
 
         order.set_status(order_status)
 
+        # Queue lines that failed due to transient errors so that fulfillment is retried later.
+        if waffle.switch_is_active('fulfillment_retries'):
+            update_fulfillment_retries(line_items)
+
         elapsed = now() - order.date_placed
         logger.info(
             "Finished fulfilling order [%s] with status [%s]. [%s] seconds elapsed since placement.",
@@ -89,20 +99,92 @@ def fulfill_order(order, lines):
         return order  # pylint: disable=lost-exception
 
 
-def get_fulfillment_modules():
-    """ Retrieves all fulfillment modules declared in settings. """
-    module_paths = getattr(settings, 'FULFILLMENT_MODULES', [])
-    modules = []
+class FulfillmentModuleRegistry(object):
+    """ Resolves the fulfillment modules declared in settings, and indexes them by the product types they support.
+
+    Fulfillment modules support lines based on the product class of the line's product. The modules supporting a
+    given product class are determined the first time a line of that class is seen, and reused thereafter.
+    """
+
+    def __init__(self, module_paths):
+        self.modules = []
+
+        for cls_path in module_paths:
+            try:
+                module_path, _, name = cls_path.rpartition('.')
+                module = getattr(importlib.import_module(module_path), name)
+                self.modules.append(module)
+            except (ImportError, ValueError, AttributeError):
+                logger.exception("Could not load module at [%s]", cls_path)
+
+        self._instances = {module: module() for module in self.modules}
+        self._modules_by_product_class = {}
+
+    def get_module(self, module_class):
+        """ Returns the shared instance of the given fulfillment module. """
+        return self._instances[module_class]
+
+    def get_modules_for_line(self, line):
+        """ Returns the list of fulfillment modules, in configuration order, that support the given Line. """
+        product_class_name = line.product.get_product_class().name
 
-    for cls_path in module_paths:
         try:
-            module_path, _, name = cls_path.rpartition('.')
-            module = getattr(importlib.import_module(module_path), name)
-            modules.append(module)
-        except (ImportError, ValueError, AttributeError):
-            logger.exception("Could not load module at [%s]", cls_path)
+            return self._modules_by_product_class[product_class_name]
+        except KeyError:
+            modules = [module for module in self.modules if self._instances[module].supports_line(line)]
+            self._modules_by_product_class[product_class_name] = modules
+            return modules
+
+    def group_lines(self, lines):
+        """
+        Groups lines by the first fulfillment module, in configuration order, that supports them.
+
+        Arguments
+            lines (List of Lines): Lines to be grouped.
+
+        Returns
+            tuple: List of (module class, list of Lines) pairs, in configuration order, and the list of Lines
+                that no module supports.
+        """
+        lines_by_module = OrderedDict((module, []) for module in self.modules)
+        unsupported_lines = []
 
-    return modules
+        for line in lines:
+            modules = self.get_modules_for_line(line)
+            if modules:
+                lines_by_module[modules[0]].append(line)
+            else:
+                unsupported_lines.append(line)
+
+        return [(module, module_lines) for module, module_lines in lines_by_module.items() if module_lines], \
+            unsupported_lines
+
+
+_registry = None
+
+
+def get_fulfillment_module_registry():
+    """ Returns the registry of the fulfillment modules declared in settings. """
+    global _registry  # pylint: disable=global-statement
+
+    if _registry is None:
+        _registry = FulfillmentModuleRegistry(getattr(settings, 'FULFILLMENT_MODULES', []))
+
+    return _registry
+
+
+@receiver(setting_changed)
+def reset_fulfillment_module_registry(setting, **kwargs):  # pylint: disable=unused-argument
+    """ Discards the registry when the fulfillment modules setting changes. It is rebuilt on next use. """
+    global _registry  # pylint: disable=global-statement
+
+    if setting == 'FULFILLMENT_MODULES':
+        _registry = None
+
+
+def get_fulfillment_modules():
+    """ Retrieves all fulfillment modules declared in settings. """
+    return list(get_fulfillment_module_registry().modules)
 
 
 def get_fulfillment_modules_for_line(line):
@@ -112,36 +194,62 @@ def get_fulfillment_modules_for_line(line):
     Arguments
         line (Line): Line to be considered for fulfillment.
     """
-    return [module for module in get_fulfillment_modules() if module().supports_line(line)]
+    return list(get_fulfillment_module_registry().get_modules_for_line(line))
 
 
 def revoke_fulfillment_for_refund(refund):
     """
     Revokes fulfillment for all lines in a refund.
 
+    Lines are revoked in one batch per fulfillment module, and their statuses are updated in bulk.
+
     Returns
         Boolean: True, if revocation of all lines succeeded; otherwise, False.
     """
-    succeeded = True
+    RefundLine = refund.lines.model
+    refund_lines = list(refund.lines.select_related(
+        'order_line__order__user',
+        'order_line__product__product_class',
+        'order_line__product__parent__product_class'
+    ))
 
     # Refunds corresponding to a total credit of $0 require no revocation. This also
     # prevents deadlocking with the LMS which occurs when Otto attempts to revoke an
     # automatically-approved refund.
     if refund.total_credit_excl_tax == 0:
-        for refund_line in refund.lines.all():
-            refund_line.set_status(REFUND_LINE.COMPLETE)
-    else:
-        # TODO (CCB): As our list of product types and fulfillment modules grows, this may become slow,
-        # and should be updated. Runtime is O(n^2).
-        for refund_line in refund.lines.all():
-            order_line = refund_line.order_line
-            modules = get_fulfillment_modules_for_line(order_line)
-
-            for module in modules:
-                if module().revoke_line(order_line):
-                    refund_line.set_status(REFUND_LINE.COMPLETE)
-                else:
-                    succeeded = False
-                    refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
-
-    return succeeded
+        RefundLine.bulk_set_status(refund_lines, REFUND_LINE.COMPLETE)
+        return True
+
+    registry = get_fulfillment_module_registry()
+    refund_lines_by_module = OrderedDict((module, []) for module in registry.modules)
+    handled_refund_line_ids = set()
+    failed_refund_line_ids = set()
+
+    for refund_line in refund_lines:
+        for module in registry.get_modules_for_line(refund_line.order_line):
+            refund_lines_by_module[module].append(refund_line)
+            handled_refund_line_ids.add(refund_line.id)
+
+    for module_class, module_refund_lines in refund_lines_by_module.items():
+        if not module_refund_lines:
+            continue
+
+        module = registry.get_module(module_class)
+        results = module.revoke_lines([refund_line.order_line for refund_line in module_refund_lines])
+
+        for refund_line, revoked in zip(module_refund_lines, results):
+            if not revoked:
+                failed_refund_line_ids.add(refund_line.id)
+
+    handled = [refund_line for refund_line in refund_lines if refund_line.id in handled_refund_line_ids]
+    failed = [refund_line for refund_line in handled if refund_line.id in failed_refund_line_ids]
+    revoked = [refund_line for refund_line in handled if refund_line.id not in failed_refund_line_ids]
+    RefundLine.bulk_set_status(revoked, REFUND_LINE.COMPLETE)
+    RefundLine.bulk_set_status(failed, REFUND_LINE.REVOCATION_ERROR)
+
+    logger.info(
+        'Revoked fulfillment of [%d] lines of refund [%d]. Revocation failed for [%d] lines.',
+        len(revoked), refund.id, len(failed)
+    )
+
+    return not failed
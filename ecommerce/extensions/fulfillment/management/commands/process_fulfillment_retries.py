@@ -0,0 +1,27 @@
+"""
+Management command that re-dispatches fulfillment for order lines that failed due to transient errors.
+"""
+from __future__ import unicode_literals
+
+from django.core.management import BaseCommand
+
+from ecommerce.extensions.fulfillment.retries import process_fulfillment_retries
+
+
+class Command(BaseCommand):
+    help = 'Retry fulfillment of order lines whose next retry attempt is due.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=None,
+                            type=int,
+                            help='Maximum number of queued lines to process.')
+
+    def handle(self, *args, **options):
+        result = process_fulfillment_retries(batch_size=options['batch_size'])
+        self.stderr.write(
+            'Dispatched [{dispatched}] orders and abandoned [{abandoned}] lines. '
+            'Queue depth: [{depth}]. Oldest entry age: [{age:.0f}] seconds.'.format(**result)
+        )
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def create_switch(apps, schema_editor):
+    """Create the fulfillment_retries switch if it does not already exist."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(name='fulfillment_retries', defaults={'active': False})
+
+
+def delete_switch(apps, schema_editor):
+    """Delete the fulfillment_retries switch."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name='fulfillment_retries').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fulfillment', '0001_initial'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_switch, reverse_code=delete_switch),
+    ]
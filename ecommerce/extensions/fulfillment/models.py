@@ -0,0 +1,12 @@
+from __future__ import unicode_literals
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
+
+
+class FulfillmentRetry(TimeStampedModel):
+    """ A pending retry of the fulfillment of an order line that failed due to a transient error. """
+    line = models.OneToOneField('order.Line', related_name='fulfillment_retry')
+    attempts = models.PositiveIntegerField(_('Attempts'), default=0)
+    next_attempt_datetime = models.DateTimeField(_('Next attempt'), db_index=True)
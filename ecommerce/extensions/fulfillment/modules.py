@@ -7,18 +7,20 @@ import abc
 import datetime
 import json
 import logging
+from multiprocessing.pool import ThreadPool
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from oscar.core.loading import get_model
 from rest_framework import status
 import requests
-from requests.exceptions import ConnectionError, Timeout
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, RequestException, Timeout
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_ecommerce_url, get_lms_enrollment_api_url, get_lms_url
 from ecommerce.courses.models import Course
-from ecommerce.courses.utils import mode_for_seat
+from ecommerce.courses.utils import cache_enrollment_status, invalidate_enrollment_status, mode_for_seat
 from ecommerce.extensions.analytics.utils import audit_log, parse_tracking_context
 from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.voucher.models import OrderLineVouchers
@@ -32,6 +34,30 @@ Voucher = get_model('voucher', 'Voucher')
 logger = logging.getLogger(__name__)
 
 
+_enrollment_api_session = None
+
+
+def get_enrollment_api_session():
+    """ Returns the keep-alive HTTP session shared by all calls to the Enrollment API from this process. """
+    global _enrollment_api_session  # pylint: disable=global-statement
+    if _enrollment_api_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.ENROLLMENT_FULFILLMENT_POOL_SIZE,
+            pool_maxsize=settings.ENROLLMENT_FULFILLMENT_POOL_SIZE
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _enrollment_api_session = session
+    return _enrollment_api_session
+
+
+def _post_enrollment(enrollment_api_url, headers, data):
+    return get_enrollment_api_session().post(
+        enrollment_api_url, data=json.dumps(data), headers=headers, timeout=settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+    )
+
+
 class BaseFulfillmentModule(object):  # pragma: no cover
     """
     Base FulfillmentModule class for containing Product specific fulfillment logic.
@@ -98,6 +124,19 @@ class BaseFulfillmentModule(object):  # pragma: no cover
         """
         raise NotImplementedError("Revoke method not implemented!")
 
+    def revoke_lines(self, lines):
+        """ Revokes the specified lines.
+
+        Modules able to revoke several lines more efficiently than one at a time should override this method.
+
+        Args:
+            lines (List of Lines): Order Lines to be revoked.
+
+        Returns:
+            A list of booleans, in the order of lines: True, if the product is revoked; otherwise, False.
+        """
+        return [self.revoke_line(line) for line in lines]
+
 
 class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     """ Fulfillment Module for enrolling students after a product purchase.
@@ -105,9 +144,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     Allows the enrollment of a student via purchase of a 'seat'.
     """
 
-    def _post_to_enrollment_api(self, data, user):
-        enrollment_api_url = get_lms_enrollment_api_url()
-        timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+    def _get_enrollment_api_headers(self, user):
         headers = {
             'Content-Type': 'application/json',
             'X-Edx-Api-Key': settings.EDX_API_KEY
@@ -121,7 +158,74 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
         if ip:
             headers['X-Forwarded-For'] = ip
 
-        return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
+        return headers
+
+    def _post_to_enrollment_api(self, data, user):
+        enrollment_api_url = get_lms_enrollment_api_url()
+        headers = self._get_enrollment_api_headers(user)
+        return _post_enrollment(enrollment_api_url, headers, data)
+
+    def _post_many_to_enrollment_api(self, data_list, user):
+        """ Posts several enrollment requests for a user concurrently.
+
+        Args:
+            data_list (list): Enrollment API request bodies.
+            user (User): User whose enrollments are being changed.
+
+        Returns:
+            A list of (response, exception) tuples, in the order of data_list.
+        """
+        if not data_list:
+            return []
+
+        headers = self._get_enrollment_api_headers(user)
+        return self._post_enrollment_requests(
+            [(headers, data) for data in data_list], settings.ENROLLMENT_FULFILLMENT_MAX_WORKERS
+        )
+
+    def _post_enrollment_requests(self, enrollment_requests, max_workers):
+        """ Posts several enrollment requests concurrently.
+
+        Requests are sent from a pool of at most max_workers threads, over the shared enrollment API session.
+        Request errors, including network errors and time outs, are returned rather than raised, so that the
+        outcome of each request can be handled individually. Errors other than network errors and time outs are
+        logged, with their traceback, as they occur.
+
+        Args:
+            enrollment_requests (list): (headers, data) tuples of Enrollment API requests.
+            max_workers (int): Maximum number of concurrent requests.
+
+        Returns:
+            A list of (response, exception) tuples, in the order of enrollment_requests.
+        """
+        if not enrollment_requests:
+            return []
+
+        # The URL depends on the current request, which is not available to worker threads.
+        enrollment_api_url = get_lms_enrollment_api_url()
+
+        def post(enrollment_request):
+            headers, data = enrollment_request
+            try:
+                return _post_enrollment(enrollment_api_url, headers, data), None
+            except (ConnectionError, Timeout) as exception:
+                return None, exception
+            except RequestException as exception:
+                # The traceback is lost once the exception leaves the worker thread, so it is logged here.
+                logger.exception(
+                    'Enrollment API request for course [%s] failed.', data['course_details']['course_id']
+                )
+                return None, exception
+
+        if len(enrollment_requests) <= 1:
+            return [post(enrollment_request) for enrollment_request in enrollment_requests]
+
+        pool = ThreadPool(min(len(enrollment_requests), max_workers))
+        try:
+            return pool.map(post, enrollment_requests)
+        finally:
+            pool.close()
+            pool.join()
 
     def supports_line(self, line):
         return line.product.get_product_class().name == 'Seat'
@@ -170,6 +274,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
 
             return order, lines
 
+        enrollments = []
         for line in lines:
             try:
                 mode = mode_for_seat(line.product)
@@ -207,92 +312,148 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
                         'value': provider
                     }
                 )
-            try:
-                response = self._post_to_enrollment_api(data, user=order.user)
-
-                if response.status_code == status.HTTP_200_OK:
-                    line.set_status(LINE.COMPLETE)
-
-                    audit_log(
-                        'line_fulfilled',
-                        order_line_id=line.id,
-                        order_number=order.number,
-                        product_class=line.product.get_product_class().name,
-                        course_id=course_key,
-                        mode=mode,
-                        user_id=order.user.id,
-                        credit_provider=provider,
-                    )
-                else:
-                    try:
-                        data = response.json()
-                        reason = data.get('message')
-                    except Exception:  # pylint: disable=broad-except
-                        reason = '(No detail provided.)'
-
-                    logger.error(
-                        "Unable to fulfill line [%d] of order [%s] due to a server-side error: %s", line.id,
-                        order.number, reason
-                    )
-                    line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
-            except ConnectionError:
+            enrollments.append((line, mode, course_key, provider, data))
+
+        # The enrollment calls are issued concurrently; line statuses are then set one line at a time.
+        results = self._post_many_to_enrollment_api([enrollment[-1] for enrollment in enrollments], user=order.user)
+
+        for (line, mode, course_key, provider, __), (response, exception) in zip(enrollments, results):
+            if isinstance(exception, ConnectionError):
                 logger.error(
                     "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
                 )
                 line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
-            except Timeout:
+            elif isinstance(exception, Timeout):
                 logger.error(
                     "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
                 )
                 line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
-        logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
-        return order, lines
-
-    def revoke_line(self, line):
-        try:
-            logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
-
-            mode = mode_for_seat(line.product)
-            course_key = line.product.attr.course_key
-            data = {
-                'user': line.order.user.username,
-                'is_active': False,
-                'mode': mode,
-                'course_details': {
-                    'course_id': course_key,
-                },
-            }
-
-            response = self._post_to_enrollment_api(data, user=line.order.user)
+            elif exception is not None:
+                logger.error(
+                    "Unable to fulfill line [%d] of order [%s] due to a request error: %s", line.id, order.number,
+                    exception
+                )
+                line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
+            elif response.status_code == status.HTTP_200_OK:
+                line.set_status(LINE.COMPLETE)
+                cache_enrollment_status(order.user.username, course_key, mode, True)
 
-            if response.status_code == status.HTTP_200_OK:
                 audit_log(
-                    'line_revoked',
+                    'line_fulfilled',
                     order_line_id=line.id,
-                    order_number=line.order.number,
+                    order_number=order.number,
                     product_class=line.product.get_product_class().name,
                     course_id=course_key,
-                    certificate_type=getattr(line.product.attr, 'certificate_type', ''),
-                    user_id=line.order.user.id
+                    mode=mode,
+                    user_id=order.user.id,
+                    credit_provider=provider,
                 )
+            else:
+                try:
+                    data = response.json()
+                    reason = data.get('message')
+                except Exception:  # pylint: disable=broad-except
+                    reason = '(No detail provided.)'
 
+                logger.error(
+                    "Unable to fulfill line [%d] of order [%s] due to a server-side error: %s", line.id,
+                    order.number, reason
+                )
+                line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
+        logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
+        return order, lines
+
+    def _get_revocation_data(self, line):
+        """ Returns the course key of the given Line, and the Enrollment API request body revoking it. """
+        mode = mode_for_seat(line.product)
+        course_key = line.product.attr.course_key
+        data = {
+            'user': line.order.user.username,
+            'is_active': False,
+            'mode': mode,
+            'course_details': {
+                'course_id': course_key,
+            },
+        }
+        return course_key, data
+
+    def _handle_revocation_response(self, line, course_key, response):
+        """ Returns True if the Enrollment API response indicates the given Line has been revoked. """
+        username = line.order.user.username
+
+        if response.status_code == status.HTTP_200_OK:
+            cache_enrollment_status(username, course_key, mode_for_seat(line.product), False)
+            audit_log(
+                'line_revoked',
+                order_line_id=line.id,
+                order_number=line.order.number,
+                product_class=line.product.get_product_class().name,
+                course_id=course_key,
+                certificate_type=getattr(line.product.attr, 'certificate_type', ''),
+                user_id=line.order.user.id
+            )
+
+            return True
+        else:
+            # check if the error / message are something we can recover from.
+            data = response.json()
+            detail = data.get('message', '(No details provided.)')
+            if response.status_code == 400 and "Enrollment mode mismatch" in detail:
+                # The user is currently enrolled in different mode than the one
+                # we are refunding an order for.  Don't revoke that enrollment.
+                logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
+                invalidate_enrollment_status(username, course_key)
                 return True
             else:
-                # check if the error / message are something we can recover from.
-                data = response.json()
-                detail = data.get('message', '(No details provided.)')
-                if response.status_code == 400 and "Enrollment mode mismatch" in detail:
-                    # The user is currently enrolled in different mode than the one
-                    # we are refunding an order for.  Don't revoke that enrollment.
-                    logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
-                    return True
-                else:
-                    logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
+                logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
+
+        return False
+
+    def revoke_line(self, line):
+        try:
+            logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
+
+            course_key, data = self._get_revocation_data(line)
+            response = self._post_to_enrollment_api(data, user=line.order.user)
+            return self._handle_revocation_response(line, course_key, response)
         except Exception:  # pylint: disable=broad-except
             logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
 
         return False
 
+    def revoke_lines(self, lines):
+        """ Revokes the specified lines, issuing the Enrollment API calls concurrently.
+
+        At most ENROLLMENT_REVOCATION_MAX_WORKERS calls are in flight at any time.
+        """
+        results = [False] * len(lines)
+        revocations = []
+
+        for index, line in enumerate(lines):
+            try:
+                logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
+                course_key, data = self._get_revocation_data(line)
+                headers = self._get_enrollment_api_headers(line.order.user)
+                revocations.append((index, line, course_key, (headers, data)))
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+
+        responses = self._post_enrollment_requests(
+            [revocation[-1] for revocation in revocations], settings.ENROLLMENT_REVOCATION_MAX_WORKERS
+        )
+
+        for (index, line, course_key, __), (response, exception) in zip(revocations, responses):
+            if exception is not None:
+                logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, exception)
+                continue
+
+            try:
+                results[index] = self._handle_revocation_response(line, course_key, response)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+
+        return results
+
 
 class CouponFulfillmentModule(BaseFulfillmentModule):
     """ Fulfillment Module for coupons. """
@@ -0,0 +1,138 @@
+""" Durable retry queue for order lines whose fulfillment failed due to transient errors.
+
+Lines that end in a network or timeout error are recorded in the FulfillmentRetry table. The queue is drained
+periodically: due entries are re-dispatched to the fulfillment worker, and the delay before the next attempt grows
+exponentially (with full jitter, to avoid synchronized retry storms against the LMS) until the maximum number of
+attempts is exhausted.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import logging
+import random
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils.timezone import now
+from ecommerce_worker.fulfillment.v1.tasks import fulfill_order
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.fulfillment.status import LINE
+
+logger = logging.getLogger(__name__)
+
+FulfillmentRetry = get_model('fulfillment', 'FulfillmentRetry')
+
+RETRYABLE_LINE_STATUSES = (LINE.FULFILLMENT_NETWORK_ERROR, LINE.FULFILLMENT_TIMEOUT_ERROR,)
+
+
+def get_retry_delay(attempts):
+    """ Returns the delay, in seconds, before the next fulfillment attempt.
+
+    Uses exponential backoff capped at FULFILLMENT_RETRY_MAX_DELAY, with full jitter.
+
+    Args:
+        attempts (int): Number of retries already made.
+
+    Returns:
+        float
+    """
+    ceiling = min(settings.FULFILLMENT_RETRY_MAX_DELAY, settings.FULFILLMENT_RETRY_BASE_DELAY * 2 ** attempts)
+    return random.uniform(0, ceiling)
+
+
+def update_fulfillment_retries(lines):
+    """ Synchronizes the retry queue with the outcome of a fulfillment attempt.
+
+    Lines that failed with a retryable error are enqueued, if not already queued. Lines that have been
+    fulfilled are removed from the queue.
+
+    Args:
+        lines (List of Lines): Lines whose fulfillment was just attempted.
+    """
+    failed_line_ids = [line.id for line in lines if line.status in RETRYABLE_LINE_STATUSES]
+    completed_line_ids = [line.id for line in lines if line.status == LINE.COMPLETE]
+
+    if completed_line_ids:
+        FulfillmentRetry.objects.filter(line_id__in=completed_line_ids).delete()
+
+    if failed_line_ids:
+        queued_line_ids = set(
+            FulfillmentRetry.objects.filter(line_id__in=failed_line_ids).values_list('line_id', flat=True)
+        )
+        next_attempt_datetime = now() + datetime.timedelta(seconds=get_retry_delay(0))
+        FulfillmentRetry.objects.bulk_create([
+            FulfillmentRetry(line_id=line_id, next_attempt_datetime=next_attempt_datetime)
+            for line_id in failed_line_ids if line_id not in queued_line_ids
+        ])
+
+
+def get_fulfillment_retry_metrics():
+    """ Returns the depth of the retry queue and the age, in seconds, of its oldest entry. """
+    queryset = FulfillmentRetry.objects.all()
+    depth = queryset.count()
+    oldest = queryset.aggregate(oldest=Min('created'))['oldest']
+    age = (now() - oldest).total_seconds() if oldest else 0
+    return depth, age
+
+
+def process_fulfillment_retries(batch_size=None):
+    """ Re-dispatches fulfillment for queued lines whose next attempt is due.
+
+    Entries that have exhausted FULFILLMENT_RETRY_MAX_ATTEMPTS are dropped from the queue and logged. Remaining
+    entries are rescheduled before their orders are dispatched, so that a crash between the two steps delays a
+    retry rather than duplicating it. Fulfillment is dispatched once per order, since fulfilling an order
+    re-attempts all of its incomplete lines.
+
+    Args:
+        batch_size (int): Maximum number of queue entries to process. Defaults to FULFILLMENT_RETRY_BATCH_SIZE.
+
+    Returns:
+        dict: Number of orders dispatched and entries abandoned, along with the queue depth and oldest entry age.
+    """
+    batch_size = batch_size or settings.FULFILLMENT_RETRY_BATCH_SIZE
+    current_datetime = now()
+    orders = {}
+    abandoned = 0
+
+    with transaction.atomic():
+        retries = FulfillmentRetry.objects.select_for_update().select_related(
+            'line__order__site__siteconfiguration__partner'
+        ).filter(next_attempt_datetime__lte=current_datetime).order_by('next_attempt_datetime')[:batch_size]
+
+        for retry in retries:
+            order = retry.line.order
+
+            if retry.attempts >= settings.FULFILLMENT_RETRY_MAX_ATTEMPTS:
+                logger.error(
+                    'Giving up on fulfillment of line [%d] of order [%s] after [%d] retries.',
+                    retry.line_id, order.number, retry.attempts
+                )
+                retry.delete()
+                abandoned += 1
+                continue
+
+            retry.attempts += 1
+            retry.next_attempt_datetime = current_datetime + datetime.timedelta(
+                seconds=get_retry_delay(retry.attempts)
+            )
+            retry.save()
+            orders[order.number] = order
+
+    for order in orders.values():
+        fulfill_order.delay(order.number, site_code=order.site.siteconfiguration.partner.short_code)
+
+    depth, age = get_fulfillment_retry_metrics()
+    logger.info(
+        'Dispatched fulfillment retries for [%d] orders and abandoned [%d] lines. '
+        'Fulfillment retry queue depth is [%d]; the oldest entry is [%d] seconds old.',
+        len(orders), abandoned, depth, age
+    )
+
+    return {
+        'dispatched': len(orders),
+        'abandoned': abandoned,
+        'depth': depth,
+        'age': age,
+    }
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from ecommerce.extensions.fulfillment.retries import process_fulfillment_retries
+
+
+@shared_task(ignore_result=True)
+def process_fulfillment_retries_task():
+    """ Drain due entries from the fulfillment retry queue. Intended to be scheduled with Celery beat. """
+    process_fulfillment_retries()
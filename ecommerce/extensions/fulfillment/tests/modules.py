@@ -61,3 +61,12 @@ class RevocationFailureModule(MockFulfillmentModule):
     def revoke_line(self, line):
         """ Returns False to simulate a revocation failure."""
         return False
+
+
+class NetworkErrorFulfillmentModule(FakeFulfillmentModule):
+    """Fake Fulfillment Module that fails every line with a network error."""
+
+    def fulfill_product(self, order, lines):
+        """Fulfill product. Mark all lines with a network error."""
+        for line in lines:
+            line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
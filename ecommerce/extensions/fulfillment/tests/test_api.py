@@ -91,6 +91,19 @@ class FulfillmentApiTests(FulfillmentTestMixin, TestCase):
         actual = get_fulfillment_modules_for_line(line)
         self.assertEqual(actual, [FakeFulfillmentModule])
 
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule',
+                                            'ecommerce.extensions.fulfillment.tests.modules.FulfillNothingModule'])
+    def test_get_fulfillment_modules_for_line_cached(self):
+        """
+        Verify the modules supporting a line are determined once per product class.
+        """
+        line = self.order.lines.first()
+        with patch('ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule.supports_line',
+                   return_value=True) as mock_supports_line:
+            get_fulfillment_modules_for_line(line)
+            self.assertEqual(get_fulfillment_modules_for_line(line), [FakeFulfillmentModule])
+            self.assertEqual(mock_supports_line.call_count, 1)
+
     @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule'])
     def test_revoke_fulfillment_for_refund(self):
         """
@@ -5,11 +5,12 @@ import json
 import ddt
 import httpretty
 import mock
+from django.core.cache import cache
 from django.test import override_settings
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 from oscar.test.newfactories import UserFactory, BasketFactory
-from requests.exceptions import ConnectionError, Timeout
+from requests.exceptions import ConnectionError, RequestException, Timeout
 from testfixtures import LogCapture
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, ENROLLMENT_CODE_SWITCH
@@ -18,7 +19,7 @@ from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.models import Course
 from ecommerce.courses.tests.factories import CourseFactory
-from ecommerce.courses.utils import mode_for_seat
+from ecommerce.courses.utils import get_enrollment_status_cache_key, mode_for_seat
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.extensions.fulfillment.modules import (
     CouponFulfillmentModule, EnrollmentCodeFulfillmentModule, EnrollmentFulfillmentModule
@@ -144,6 +145,40 @@ class EnrollmentFulfillmentModuleTests(CourseCatalogTestMixin, FulfillmentTestMi
         self.assertDictContainsSubset(expected_headers, actual_headers)
         self.assertEqual(expected_body, actual_body)
 
+    @httpretty.activate
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=2)
+    def test_enrollment_module_fulfill_multiple_lines(self):
+        """Test that the enrollments of a multi-line order are all fulfilled, each with its own status."""
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), responses=[
+            httpretty.Response(status=200, body='{}', content_type=JSON),
+            httpretty.Response(status=500, body='{}', content_type=JSON),
+        ])
+        other_course = Course.objects.create(id='edX/DemoX/Other_Course', name='Other Course')
+        other_seat = other_course.create_or_update_seat(self.certificate_type, False, 100, self.partner)
+        basket = BasketFactory(owner=self.user)
+        basket.add_product(self.seat, 1)
+        basket.add_product(other_seat, 1)
+        order = factories.create_order(number=3, basket=basket, user=self.user)
+
+        EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.all()))
+
+        statuses = sorted(line.status for line in order.lines.all())
+        self.assertEqual(statuses, sorted([LINE.COMPLETE, LINE.FULFILLMENT_SERVER_ERROR]))
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
+    @httpretty.activate
+    def test_enrollment_module_fulfill_caches_enrollment_status(self):
+        """Test that the enrollment status of fulfilled lines is cached, and updated when they are revoked."""
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type=JSON)
+        line = self.order.lines.get()
+        key = get_enrollment_status_cache_key(self.user.username, self.course_id)
+
+        EnrollmentFulfillmentModule().fulfill_product(self.order, [line])
+        self.assertEqual(cache.get(key), {'mode': mode_for_seat(self.seat), 'is_active': True})
+
+        EnrollmentFulfillmentModule().revoke_line(line)
+        self.assertEqual(cache.get(key), {'mode': mode_for_seat(self.seat), 'is_active': False})
+
     @override_settings(EDX_API_KEY=None)
     def test_enrollment_module_not_configured(self):
         """Test that lines receive a configuration error status if fulfillment configuration is invalid."""
@@ -156,18 +191,39 @@ class EnrollmentFulfillmentModuleTests(CourseCatalogTestMixin, FulfillmentTestMi
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_CONFIGURATION_ERROR, self.order.lines.all()[0].status)
 
-    @mock.patch('requests.post', mock.Mock(side_effect=ConnectionError))
+    @mock.patch('requests.Session.post', mock.Mock(side_effect=ConnectionError))
     def test_enrollment_module_network_error(self):
         """Test that lines receive a network error status if a fulfillment request experiences a network error."""
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_NETWORK_ERROR, self.order.lines.all()[0].status)
 
-    @mock.patch('requests.post', mock.Mock(side_effect=Timeout))
+    @mock.patch('requests.Session.post', mock.Mock(side_effect=Timeout))
     def test_enrollment_module_request_timeout(self):
         """Test that lines receive a timeout error status if a fulfillment request times out."""
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_TIMEOUT_ERROR, self.order.lines.all()[0].status)
 
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=2)
+    def test_enrollment_module_request_error(self):
+        """Test that a request error on one line gives it a server-side error status, and other lines are fulfilled."""
+        other_course = Course.objects.create(id='edX/DemoX/Other_Course', name='Other Course')
+        other_seat = other_course.create_or_update_seat(self.certificate_type, False, 100, self.partner)
+        basket = BasketFactory(owner=self.user)
+        basket.add_product(self.seat, 1)
+        basket.add_product(other_seat, 1)
+        order = factories.create_order(number=3, basket=basket, user=self.user)
+
+        def post(url, data, **kwargs):  # pylint: disable=unused-argument
+            if json.loads(data)['course_details']['course_id'] == other_course.id:
+                raise RequestException
+            return mock.Mock(status_code=200)
+
+        with mock.patch('requests.Session.post', mock.Mock(side_effect=post)):
+            EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.all()))
+
+        self.assertEqual(order.lines.get(product=self.seat).status, LINE.COMPLETE)
+        self.assertEqual(order.lines.get(product=other_seat).status, LINE.FULFILLMENT_SERVER_ERROR)
+
     @httpretty.activate
     @ddt.data(None, '{"message": "Oops!"}')
     def test_enrollment_module_server_error(self, body):
@@ -226,6 +282,26 @@ class EnrollmentFulfillmentModuleTests(CourseCatalogTestMixin, FulfillmentTestMi
         self.assertDictContainsSubset(expected_headers, actual_headers)
         self.assertEqual(expected_body, actual_body)
 
+    @httpretty.activate
+    @override_settings(ENROLLMENT_REVOCATION_MAX_WORKERS=2)
+    def test_revoke_lines(self):
+        """ The method should revoke all lines concurrently, returning the outcome of each revocation. """
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), responses=[
+            httpretty.Response(status=200, body='{}', content_type=JSON),
+            httpretty.Response(status=500, body='{}', content_type=JSON),
+        ])
+        other_course = Course.objects.create(id='edX/DemoX/Other_Course', name='Other Course')
+        other_seat = other_course.create_or_update_seat(self.certificate_type, False, 100, self.partner)
+        basket = BasketFactory(owner=self.user)
+        basket.add_product(self.seat, 1)
+        basket.add_product(other_seat, 1)
+        order = factories.create_order(number=3, basket=basket, user=self.user)
+
+        results = EnrollmentFulfillmentModule().revoke_lines(list(order.lines.all()))
+
+        self.assertEqual(sorted(results), [False, True])
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
     @httpretty.activate
     def test_revoke_product_expected_error(self):
         """
@@ -0,0 +1,124 @@
+"""Tests for the fulfillment retry queue."""
+import datetime
+
+from django.test.utils import override_settings
+from django.utils.timezone import now
+import mock
+from oscar.core.loading import get_model
+from testfixtures import LogCapture
+
+from ecommerce.core.tests import toggle_switch
+from ecommerce.extensions.fulfillment import api
+from ecommerce.extensions.fulfillment.retries import get_retry_delay, process_fulfillment_retries
+from ecommerce.extensions.fulfillment.status import LINE
+from ecommerce.extensions.fulfillment.tests.mixins import FulfillmentTestMixin
+from ecommerce.tests.testcases import TestCase
+
+FulfillmentRetry = get_model('fulfillment', 'FulfillmentRetry')
+
+LOGGER_NAME = 'ecommerce.extensions.fulfillment.retries'
+
+
+@override_settings(FULFILLMENT_RETRY_BASE_DELAY=10, FULFILLMENT_RETRY_MAX_DELAY=100, FULFILLMENT_RETRY_MAX_ATTEMPTS=2)
+class FulfillmentRetryTests(FulfillmentTestMixin, TestCase):
+    """ Tests for the fulfillment.retries module. """
+
+    def setUp(self):
+        super(FulfillmentRetryTests, self).setUp()
+        toggle_switch('fulfillment_retries', True)
+        self.order = self.generate_open_order()
+        self.order.site = self.site
+        self.order.save()
+        self.line = self.order.lines.first()
+
+    def enqueue(self, attempts=0, next_attempt_datetime=None):
+        """ Adds the order's line to the retry queue. """
+        return FulfillmentRetry.objects.create(
+            line=self.line,
+            attempts=attempts,
+            next_attempt_datetime=next_attempt_datetime or now() - datetime.timedelta(seconds=1)
+        )
+
+    def test_get_retry_delay(self):
+        """ Verify the delay grows exponentially, and is capped by FULFILLMENT_RETRY_MAX_DELAY. """
+        with mock.patch('random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual([get_retry_delay(attempts) for attempts in range(5)], [10, 20, 40, 80, 100])
+
+    @override_settings(
+        FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.NetworkErrorFulfillmentModule']
+    )
+    def test_fulfill_order_enqueues_failed_lines(self):
+        """ Verify lines that fail due to network errors are queued once for retry. """
+        api.fulfill_order(self.order, self.order.lines)
+        api.fulfill_order(self.order, self.order.lines)
+        self.assertEqual(self.order.lines.first().status, LINE.FULFILLMENT_NETWORK_ERROR)
+        self.assertEqual(FulfillmentRetry.objects.filter(line=self.line, attempts=0).count(), 1)
+
+    @override_settings(
+        FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.NetworkErrorFulfillmentModule']
+    )
+    def test_fulfill_order_switch_inactive(self):
+        """ Verify nothing is queued when the fulfillment_retries switch is inactive. """
+        toggle_switch('fulfillment_retries', False)
+        api.fulfill_order(self.order, self.order.lines)
+        self.assertFalse(FulfillmentRetry.objects.exists())
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule'])
+    def test_fulfill_order_dequeues_completed_lines(self):
+        """ Verify lines are removed from the queue once fulfilled. """
+        self.enqueue()
+        api.fulfill_order(self.order, self.order.lines)
+        self.assert_order_fulfilled(self.order)
+        self.assertFalse(FulfillmentRetry.objects.exists())
+
+    @mock.patch('ecommerce.extensions.fulfillment.retries.fulfill_order.delay')
+    def test_process_fulfillment_retries(self, mock_delay):
+        """ Verify due entries are rescheduled and their orders dispatched. """
+        retry = self.enqueue()
+
+        result = process_fulfillment_retries()
+
+        mock_delay.assert_called_once_with(
+            unicode(self.order.number), site_code=self.order.site.siteconfiguration.partner.short_code
+        )
+        retry = FulfillmentRetry.objects.get(id=retry.id)
+        self.assertEqual(retry.attempts, 1)
+        self.assertEqual(result['dispatched'], 1)
+        self.assertEqual(result['abandoned'], 0)
+        self.assertEqual(result['depth'], 1)
+
+    @mock.patch('ecommerce.extensions.fulfillment.retries.fulfill_order.delay')
+    def test_process_fulfillment_retries_not_due(self, mock_delay):
+        """ Verify entries are not dispatched before their next attempt is due. """
+        self.enqueue(next_attempt_datetime=now() + datetime.timedelta(hours=1))
+        result = process_fulfillment_retries()
+        self.assertFalse(mock_delay.called)
+        self.assertEqual(result['dispatched'], 0)
+        self.assertEqual(result['depth'], 1)
+
+    @mock.patch('ecommerce.extensions.fulfillment.retries.fulfill_order.delay')
+    def test_process_fulfillment_retries_exhausted(self, mock_delay):
+        """ Verify entries that have exhausted their attempts are dropped and logged. """
+        self.enqueue(attempts=2)
+
+        with LogCapture(LOGGER_NAME) as l:
+            result = process_fulfillment_retries()
+            l.check(
+                (
+                    LOGGER_NAME,
+                    'ERROR',
+                    'Giving up on fulfillment of line [{}] of order [{}] after [2] retries.'.format(
+                        self.line.id, self.order.number
+                    )
+                ),
+                (
+                    LOGGER_NAME,
+                    'INFO',
+                    'Dispatched fulfillment retries for [0] orders and abandoned [1] lines. '
+                    'Fulfillment retry queue depth is [0]; the oldest entry is [0] seconds old.'
+                ),
+            )
+
+        self.assertFalse(mock_delay.called)
+        self.assertEqual(result['abandoned'], 1)
+        self.assertFalse(FulfillmentRetry.objects.exists())
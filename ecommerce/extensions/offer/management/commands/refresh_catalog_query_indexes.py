@@ -0,0 +1,49 @@
+""" Rebuilds the membership indexes of the catalog queries of Ranges. """
+
+from __future__ import unicode_literals
+
+import logging
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+from oscar.core.loading import get_model
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.coupons.utils import refresh_catalog_query_index
+
+logger = logging.getLogger(__name__)
+Range = get_model('offer', 'Range')
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the membership indexes of the catalog queries of ranges.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--site-id',
+                            action='store',
+                            dest='site_id',
+                            type=int,
+                            help='ID of the Site whose Course Catalog is queried.')
+
+    def handle(self, *args, **options):
+        try:
+            site = Site.objects.get(id=options['site_id'])
+        except Site.DoesNotExist:
+            raise CommandError('A valid Site ID must be specified!')
+
+        queries = Range.objects.exclude(catalog_query__isnull=True).exclude(catalog_query='').values_list(
+            'catalog_query', flat=True
+        ).distinct()
+
+        failed = 0
+        for query in queries:
+            try:
+                refresh_catalog_query_index(site, query)
+            except (ConnectionError, SlumberBaseException, Timeout):
+                logger.exception('Failed to refresh the index of catalog query [%s].', query)
+                failed += 1
+
+        self.stderr.write('Refreshed the indexes of [{}] catalog queries. [{}] failed.'.format(
+            len(queries) - failed, failed
+        ))
@@ -1,13 +1,8 @@
-# noinspection PyUnresolvedReferences
-import hashlib
-
-from django.conf import settings
-from django.core.cache import cache
 from django.db import models
 from oscar.apps.offer.abstract_models import AbstractConditionalOffer, AbstractRange
 from threadlocals.threadlocals import get_current_request
 
-from ecommerce.coupons.utils import get_seats_from_query
+from ecommerce.coupons.utils import get_catalog_query_course_run_ids, get_seats_from_query
 
 
 class ConditionalOffer(AbstractConditionalOffer):
@@ -40,26 +35,26 @@ class Range(AbstractRange):
     catalog_query = models.CharField(max_length=255, blank=True, null=True)
     course_seat_types = models.CharField(max_length=255, blank=True, null=True)
 
-    def run_catalog_query(self, product):
+    def get_catalog_query_course_run_ids(self):
         """
-        Retrieve the results from running the query contained in catalog_query field.
+        Retrieve the IDs of the course runs matched by the query contained in catalog_query field.
+
+        The IDs are read from the membership index of the query, once per instance and query.
+
+        Returns:
+            frozenset: IDs of the course runs matched by the query.
         """
-        cache_key = 'catalog_query_contains [{}] [{}]'.format(self.catalog_query, product.course_id)
-        cache_hash = hashlib.md5(cache_key).hexdigest()
-        response = cache.get(cache_hash)
-        if not response:  # pragma: no cover
+        index = getattr(self, '_catalog_query_index', None)
+        if index is None or index[0] != self.catalog_query:
             request = get_current_request()
             try:
-                response = request.site.siteconfiguration.course_catalog_api_client.course_runs.contains.get(
-                    query=self.catalog_query,
-                    course_run_ids=product.course_id,
-                    partner=request.site.siteconfiguration.partner.short_code
-                )
-                cache.set(cache_hash, response, settings.COURSES_API_CACHE_TIMEOUT)
+                course_run_ids = get_catalog_query_course_run_ids(request.site, self.catalog_query)
             except:  # pylint: disable=bare-except
                 raise Exception('Could not contact Course Catalog Service.')
+            index = (self.catalog_query, frozenset(course_run_ids))
+            self._catalog_query_index = index  # pylint: disable=attribute-defined-outside-init
 
-        return response
+        return index[1]
 
     def contains_product(self, product):
         """
@@ -67,14 +62,13 @@ class Range(AbstractRange):
         """
         if self.catalog_query and self.course_seat_types:
             if product.attr.certificate_type.lower() in self.course_seat_types:  # pylint: disable=unsupported-membership-test
-                response = self.run_catalog_query(product)
                 # Range can have a catalog query and 'regular' products in it,
                 # therefor an OR is used to check for both possibilities.
-                return ((response['course_runs'][product.course_id]) or
+                return (product.course_id in self.get_catalog_query_course_run_ids() or
                         super(Range, self).contains_product(product))  # pylint: disable=bad-super-call
         elif self.catalog:
             return (
-                product.id in self.catalog.stock_records.values_list('product', flat=True) or
+                product.id in self.catalog.get_product_ids() or
                 super(Range, self).contains_product(product)  # pylint: disable=bad-super-call
             )
         return super(Range, self).contains_product(product)  # pylint: disable=bad-super-call
@@ -90,7 +84,7 @@ class Range(AbstractRange):
             products = get_seats_from_query(request.site, self.catalog_query, self.course_seat_types)
             return products + list(super(Range, self).all_products())  # pylint: disable=bad-super-call
         if self.catalog:
-            catalog_products = [record.product for record in self.catalog.stock_records.all()]
+            catalog_products = [record.product for record in self.catalog.stock_records.select_related('product')]
             return catalog_products + list(super(Range, self).all_products())  # pylint: disable=bad-super-call
         return super(Range, self).all_products()  # pylint: disable=bad-super-call
 
@@ -1,9 +1,7 @@
-import hashlib
+from StringIO import StringIO
 
 import httpretty
-import mock
-from django.core.cache import cache
-from django.test import RequestFactory
+from django.core.management import call_command
 from oscar.core.loading import get_model
 from oscar.test import factories
 
@@ -59,37 +57,6 @@ class RangeTests(CouponMixin, CourseCatalogTestMixin, CourseCatalogMockMixin, Te
         self.assertIn(self.product, self.range_with_catalog.all_products())
         self.assertEqual(len(self.range_with_catalog.all_products()), 1)
 
-    @mock.patch('ecommerce.core.url_utils.get_current_request', mock.Mock(return_value=None))
-    def test_run_catalog_query_no_request(self):
-        """
-        run_course_query() should return status 400 response when no request is present.
-        """
-        with self.assertRaises(Exception):
-            self.range.run_catalog_query(self.product)
-
-    @httpretty.activate
-    @mock_course_catalog_api_client
-    def test_run_catalog_query(self):
-        """
-        run_course_query() should return True for included course run ID's.
-        """
-        course, seat = self.create_course_and_seat()
-        self.mock_dynamic_catalog_contains_api(query='key:*', course_run_ids=[course.id])
-        request = RequestFactory()
-        request.site = self.site
-        self.range.catalog_query = 'key:*'
-
-        cache_key = 'catalog_query_contains [{}] [{}]'.format('key:*', seat.course_id)
-        cache_hash = hashlib.md5(cache_key).hexdigest()
-        cached_response = cache.get(cache_hash)
-        self.assertIsNone(cached_response)
-
-        with mock.patch('ecommerce.core.url_utils.get_current_request', mock.Mock(return_value=request)):
-            response = self.range.run_catalog_query(seat)
-            self.assertTrue(response['course_runs'][course.id])
-            cached_response = cache.get(cache_hash)
-            self.assertEqual(response, cached_response)
-
     @httpretty.activate
     @mock_course_catalog_api_client
     def test_query_range_contains_product(self):
@@ -97,7 +64,7 @@ class RangeTests(CouponMixin, CourseCatalogTestMixin, CourseCatalogMockMixin, Te
         contains_product() should return the correct boolean if a product is in it's range.
         """
         course, seat = self.create_course_and_seat()
-        self.mock_dynamic_catalog_contains_api(query='key:*', course_run_ids=[course.id])
+        self.mock_dynamic_catalog_course_runs_api(query='key:*', course_run=course)
 
         false_response = self.range.contains_product(seat)
         self.assertFalse(false_response)
@@ -107,6 +74,34 @@ class RangeTests(CouponMixin, CourseCatalogTestMixin, CourseCatalogMockMixin, Te
         response = self.range.contains_product(seat)
         self.assertTrue(response)
 
+    @httpretty.activate
+    @mock_course_catalog_api_client
+    def test_query_range_contains_product_index(self):
+        """
+        contains_product() should look products up in the membership index of the catalog query.
+        """
+        course, seat = self.create_course_and_seat()
+        other_course, other_seat = self.create_course_and_seat(course_id='course-v1:other+course+run')
+        self.mock_dynamic_catalog_course_runs_api(query='key:*', course_run=course)
+        self.range.catalog_query = 'key:*'
+        self.range.course_seat_types = 'verified'
+
+        self.assertTrue(self.range.contains_product(seat))
+        self.assertFalse(self.range.contains_product(other_seat))
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        # The index is shared by ranges with the same query.
+        _range = factories.RangeFactory(catalog_query='key:*', course_seat_types='verified')
+        self.assertTrue(_range.contains_product(seat))
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        # The index is rebuilt on demand.
+        self.mock_dynamic_catalog_course_runs_api(query='key:*', course_run=other_course)
+        call_command('refresh_catalog_query_indexes', site_id=self.site.id, stderr=StringIO())
+        _range = factories.RangeFactory(catalog_query='key:*', course_seat_types='verified')
+        self.assertFalse(_range.contains_product(seat))
+        self.assertTrue(_range.contains_product(other_seat))
+
     @httpretty.activate
     @mock_course_catalog_api_client
     def test_query_range_all_products(self):
@@ -3,11 +3,12 @@ import logging
 import mock
 
 from django.test.client import RequestFactory
-from oscar.core.loading import get_class
+from oscar.core.loading import get_class, get_model
 from oscar.test.factories import create_basket as oscar_create_basket
 from oscar.test.newfactories import BasketFactory
 from testfixtures import LogCapture
 
+from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.referrals.models import Referral
 from ecommerce.tests.factories import SiteConfigurationFactory, PartnerFactory
@@ -16,6 +17,7 @@ from ecommerce.tests.testcases import TestCase
 LOGGER_NAME = 'ecommerce.extensions.order.utils'
 
 Country = get_class('address.models', 'Country')
+CouponVouchers = get_model('voucher', 'CouponVouchers')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 OrderCreator = get_class('order.utils', 'OrderCreator')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
@@ -64,7 +66,7 @@ class OrderNumberGeneratorTests(TestCase):
         self.assertEqual(self.generator.basket_id('ACME-101001'), 1001)
 
 
-class OrderCreatorTests(TestCase):
+class OrderCreatorTests(CouponMixin, TestCase):
     order_creator = OrderCreator()
 
     def setUp(self):
@@ -167,3 +169,18 @@ class OrderCreatorTests(TestCase):
             order = self.create_order_model(basket)
             message = 'Referral for Order [{order_id}] failed to save.'.format(order_id=order.id)
             l.check((LOGGER_NAME, 'ERROR', message))
+
+    def test_record_voucher_usage(self):
+        """ Verify the record_voucher_usage method updates the usage summary of the voucher's coupon. """
+        basket = self.create_basket(self.site)
+        order = self.create_order_model(basket)
+        coupon = self.create_coupon(partner=self.partner, quantity=1)
+        coupon_voucher = CouponVouchers.objects.get(coupon=coupon)
+        voucher = coupon_voucher.vouchers.first()
+
+        self.order_creator.record_voucher_usage(order, voucher, self.user)
+
+        coupon_voucher = CouponVouchers.objects.get(id=coupon_voucher.id)
+        self.assertEqual(coupon_voucher.num_redemptions, 1)
+        self.assertEqual(coupon_voucher.last_redemption_datetime, order.date_placed)
+        self.assertEqual(voucher.num_orders, 1)
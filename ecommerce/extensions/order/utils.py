@@ -10,6 +10,7 @@ from ecommerce.referrals.models import Referral
 
 logger = logging.getLogger(__name__)
 
+CouponVouchers = get_model('voucher', 'CouponVouchers')
 Order = get_model('order', 'Order')
 
 
@@ -112,3 +113,15 @@ class OrderCreator(OscarOrderCreator):
             logger.exception('Referral for Order [%d] failed to save.', order.id)
 
         return order
+
+    def record_voucher_usage(self, order, voucher, user):
+        """
+        Updates the models that care about this voucher.
+
+        In addition to Oscar's voucher usage, this updates the usage summary of the voucher's coupon,
+        within the order placement transaction.
+        """
+        super(OrderCreator, self).record_voucher_usage(order, voucher, user)
+
+        for coupon_voucher in CouponVouchers.objects.filter(vouchers=voucher):
+            coupon_voucher.record_redemption(order.date_placed)
@@ -8,3 +8,7 @@ class PaymentConfig(config.PaymentConfig):
         # Register signal handlers
         # noinspection PyUnresolvedReferences
         import ecommerce.extensions.payment.signals  # pylint: disable=unused-variable
+        from ecommerce.extensions.payment.helpers import get_processor_classes
+
+        # Import the payment processor classes once, rather than on every request.
+        get_processor_classes()
@@ -1,4 +1,5 @@
 """Helper functions for working with payment processor classes."""
+from collections import OrderedDict
 import hmac
 import base64
 import hashlib
@@ -9,9 +10,18 @@ from django.utils import importlib
 from ecommerce.extensions.payment import exceptions
 
 
+# Payment processor classes, keyed by their fully-qualified path.
+_processor_classes = {}
+
+# Payment processor classes, keyed by name, for each value of the PAYMENT_PROCESSORS setting.
+_processor_classes_by_name = {}
+
+
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
 
+    Classes are imported once, and cached for the lifetime of the process.
+
     Arguments:
         path (string): Fully-qualified path to a payment processor class.
 
@@ -23,10 +33,39 @@ def get_processor_class(path):
         AttributeError: If the module located at the parsed module path
             does not contain a class with the parsed class name.
     """
-    module_path, _, class_name = path.rpartition('.')
-    processor_class = getattr(importlib.import_module(module_path), class_name)
+    try:
+        return _processor_classes[path]
+    except KeyError:
+        module_path, _, class_name = path.rpartition('.')
+        processor_class = getattr(importlib.import_module(module_path), class_name)
+        _processor_classes[path] = processor_class
+        return processor_class
 
-    return processor_class
+
+def _get_processor_classes_by_name():
+    """Return an OrderedDict of the payment processor classes specified in the PAYMENT_PROCESSORS setting,
+    keyed by name, in the order they are specified."""
+    paths = tuple(settings.PAYMENT_PROCESSORS)
+
+    try:
+        return _processor_classes_by_name[paths]
+    except KeyError:
+        processor_classes = OrderedDict()
+        for path in paths:
+            processor_class = get_processor_class(path)
+            processor_classes.setdefault(processor_class.NAME, processor_class)
+
+        _processor_classes_by_name[paths] = processor_classes
+        return processor_classes
+
+
+def get_processor_classes():
+    """Return the payment processor classes specified in the PAYMENT_PROCESSORS setting.
+
+    Returns:
+        list: Payment processor classes, in the order they are specified.
+    """
+    return list(_get_processor_classes_by_name().values())
 
 
 def get_default_processor_class():
@@ -56,15 +95,12 @@ def get_processor_class_by_name(name):
     Raises:
         ProcessorNotFoundError: If no payment processor with the given name exists.
     """
-    for path in settings.PAYMENT_PROCESSORS:
-        processor_class = get_processor_class(path)
-
-        if name == processor_class.NAME:
-            return processor_class
-
-    raise exceptions.ProcessorNotFoundError(
-        exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
-    )
+    try:
+        return _get_processor_classes_by_name()[name]
+    except KeyError:
+        raise exceptions.ProcessorNotFoundError(
+            exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
+        )
 
 
 def sign(message, secret):
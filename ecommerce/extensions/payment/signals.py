@@ -6,6 +6,7 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from waffle.models import Switch
 
+from ecommerce.core.models import SiteConfiguration
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
 
 
@@ -24,4 +25,5 @@ def invalidate_processor_cache(*_args, **kwargs):
         processor = parts[1]
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
         caches['default'].delete(PAYMENT_PROCESSOR_CACHE_KEY)
+        SiteConfiguration.clear_payment_processors_cache()
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
@@ -18,6 +18,13 @@ class HelperTests(TestCase):
         actual = helpers.get_processor_class('ecommerce.extensions.payment.tests.processors.DummyProcessor')
         self.assertIs(actual, DummyProcessor)
 
+    def test_get_processor_classes(self):
+        """ Verify the function returns the processor classes defined in settings, in order. """
+        self.assertEqual(helpers.get_processor_classes(), [DummyProcessor, AnotherDummyProcessor])
+
+        with override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor']):
+            self.assertEqual(helpers.get_processor_classes(), [DummyProcessor])
+
     def test_get_default_processor_class(self):
         """ Verify the function returns the first processor class defined in settings. """
         self.assertIs(helpers.get_default_processor_class(), DummyProcessor)
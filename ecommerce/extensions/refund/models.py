@@ -1,7 +1,8 @@
 import logging
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from oscar.apps.payment.exceptions import PaymentError
@@ -34,12 +35,8 @@ class StatusMixin(object):
         """Returns all possible statuses that this object can move to."""
         return self.pipeline.get(self.status, ())
 
-    # pylint: disable=access-member-before-definition,attribute-defined-outside-init
-    def set_status(self, new_status):
-        """Set a new status for this object.
-
-        If the requested status is not valid, then ``InvalidStatus`` is raised.
-        """
+    def _validate_status(self, new_status):
+        """Raise ``InvalidStatus`` if this object cannot move to the requested status."""
         if new_status not in self.available_statuses():
             msg = " Transition from '{status}' to '{new_status}' is invalid for {model_name} {id}.".format(
                 new_status=new_status,
@@ -49,9 +46,63 @@ class StatusMixin(object):
             )
             raise InvalidStatus(msg)
 
+    # pylint: disable=access-member-before-definition,attribute-defined-outside-init
+    def set_status(self, new_status):
+        """Set a new status for this object.
+
+        If the requested status is not valid, then ``InvalidStatus`` is raised.
+        """
+        self._validate_status(new_status)
         self.status = new_status
         self.save()
 
+    @staticmethod
+    def _get_history_user():
+        """Returns the authenticated user of the current request, if any."""
+        request = getattr(HistoricalRecords.thread, 'request', None)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated():
+            return user
+        return None
+
+    @classmethod
+    def bulk_set_status(cls, instances, new_status):
+        """Set a new status for several objects with a single update, recording their history.
+
+        If the requested status is not valid for any of the objects, then ``InvalidStatus`` is raised,
+        and none of the objects are updated.
+        """
+        instances = list(instances)
+        if not instances:
+            return
+
+        for instance in instances:
+            instance._validate_status(new_status)  # pylint: disable=protected-access
+
+        modified = now()
+        with transaction.atomic():
+            cls.objects.filter(id__in=[instance.id for instance in instances]).update(
+                status=new_status, modified=modified
+            )
+
+            for instance in instances:
+                instance.status = new_status
+                instance.modified = modified
+
+            # Queryset updates bypass the signals which create historical records. Like those signals, record
+            # the user of the current request, as set by simple_history's HistoryRequestMiddleware.
+            fields = cls._meta.fields
+            history_user = cls._get_history_user()
+            cls.history.model.objects.bulk_create([
+                cls.history.model(
+                    history_date=modified,
+                    history_type='~',
+                    history_user=getattr(instance, '_history_user', history_user),
+                    **{field.attname: getattr(instance, field.attname) for field in fields}
+                )
+                for instance in instances
+            ])
+
     def __str__(self):
         return unicode(self.id)
 
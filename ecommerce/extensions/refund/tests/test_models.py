@@ -5,6 +5,7 @@ import mock
 from oscar.apps.payment.exceptions import PaymentError
 from oscar.core.loading import get_model, get_class
 from oscar.test.newfactories import UserFactory
+from simple_history.models import HistoricalRecords
 from testfixtures import LogCapture
 
 from ecommerce.core.url_utils import get_lms_enrollment_api_url
@@ -58,6 +59,47 @@ class StatusTestsMixin(object):
                 instance.set_status(new_status)
                 self.assertEqual(instance.status, new_status, 'Refund status was not updated!')
 
+    def test_bulk_set_status(self):
+        """ Verify statuses are updated, and history recorded, for all instances. """
+        for status, valid_statuses in self.pipeline.iteritems():
+            for new_status in valid_statuses:
+                instances = [self._get_instance(status=status) for __ in range(2)]
+                model = type(instances[0])
+                history_count = model.history.count()
+
+                model.bulk_set_status(instances, new_status)
+
+                for instance in instances:
+                    self.assertEqual(instance.status, new_status)
+                    self.assertEqual(model.objects.get(id=instance.id).status, new_status)
+                self.assertEqual(model.history.count(), history_count + len(instances))
+
+    def test_bulk_set_status_history_user(self):
+        """ Verify the history records the user of the current request. """
+        status, valid_statuses = next(
+            (status, valid_statuses) for status, valid_statuses in self.pipeline.iteritems() if valid_statuses
+        )
+        instance = self._get_instance(status=status)
+        model = type(instance)
+        user = UserFactory()
+
+        HistoricalRecords.thread.request = mock.Mock(user=user)
+        self.addCleanup(delattr, HistoricalRecords.thread, 'request')
+        model.bulk_set_status([instance], valid_statuses[0])
+
+        self.assertEqual(model.history.filter(id=instance.id).first().history_user, user)
+
+    def test_bulk_set_status_invalid_status(self):
+        """ Verify no instance is updated if the status is invalid for any of them. """
+        for status, valid_statuses in self.pipeline.iteritems():
+            invalid_statuses = set(self.pipeline.keys()) - set(valid_statuses)
+
+            for new_status in invalid_statuses:
+                instance = self._get_instance(status=status)
+                model = type(instance)
+                self.assertRaises(InvalidStatus, model.bulk_set_status, [instance], new_status)
+                self.assertEqual(model.objects.get(id=instance.id).status, status)
+
 
 @ddt.ddt
 class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
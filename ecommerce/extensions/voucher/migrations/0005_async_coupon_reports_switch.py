@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def create_switch(apps, schema_editor):
+    """Create the async_coupon_reports switch if it does not already exist."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.get_or_create(name='async_coupon_reports', defaults={'active': False})
+
+
+def delete_switch(apps, schema_editor):
+    """Delete the async_coupon_reports switch."""
+    Switch = apps.get_model('waffle', 'Switch')
+    Switch.objects.filter(name='async_coupon_reports').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voucher', '0004_auto_20160517_0930'),
+        ('waffle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_switch, reverse_code=delete_switch),
+    ]
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def populate_usage_summary(apps, schema_editor):
+    """Compute the usage summary of existing coupons."""
+    CouponVouchers = apps.get_model('voucher', 'CouponVouchers')
+    VoucherApplication = apps.get_model('voucher', 'VoucherApplication')
+
+    for coupon_voucher in CouponVouchers.objects.annotate(vouchers_count=Count('vouchers')):
+        applications = VoucherApplication.objects.filter(voucher__coupon_vouchers=coupon_voucher).aggregate(
+            count=Count('id'), last_created=Max('date_created')
+        )
+        coupon_voucher.num_vouchers = coupon_voucher.vouchers_count
+        coupon_voucher.num_redemptions = applications['count']
+        coupon_voucher.last_redemption_datetime = applications['last_created']
+        coupon_voucher.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voucher', '0005_async_coupon_reports_switch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='couponvouchers',
+            name='last_redemption_datetime',
+            field=models.DateTimeField(null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name='couponvouchers',
+            name='num_redemptions',
+            field=models.PositiveIntegerField(default=0, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='couponvouchers',
+            name='num_vouchers',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_usage_summary, reverse_code=migrations.RunPython.noop),
+    ]
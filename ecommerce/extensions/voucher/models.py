@@ -1,5 +1,7 @@
 # noinspection PyUnresolvedReferences
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 
 
 class CouponVouchers(models.Model):
@@ -11,6 +13,20 @@ class CouponVouchers(models.Model):
     coupon = models.ForeignKey('catalogue.Product', related_name='coupon_vouchers')
     vouchers = models.ManyToManyField('voucher.Voucher', blank=True, related_name='coupon_vouchers')
 
+    # Usage summary of the coupon, maintained as vouchers are created and redeemed,
+    # so that coupons can be listed by usage without aggregating voucher applications.
+    num_vouchers = models.PositiveIntegerField(default=0)
+    num_redemptions = models.PositiveIntegerField(default=0, db_index=True)
+    last_redemption_datetime = models.DateTimeField(null=True, blank=True)
+
+    def record_redemption(self, redemption_datetime=None):
+        """ Increment the redemption count of the coupon, without overwriting concurrent increments. """
+        redemption_datetime = redemption_datetime or timezone.now()
+        CouponVouchers.objects.filter(id=self.id).update(
+            num_redemptions=F('num_redemptions') + 1,
+            last_redemption_datetime=redemption_datetime
+        )
+
 
 class OrderLineVouchers(models.Model):
     line = models.ForeignKey('order.Line', related_name='order_line_vouchers')
@@ -0,0 +1,65 @@
+import logging
+import os
+import tempfile
+
+from celery import shared_task
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from oscar.core.loading import get_model
+
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.extensions.voucher.utils import (
+    get_coupon_report_path, iter_coupon_report_csv, stream_coupon_report
+)
+
+logger = logging.getLogger(__name__)
+
+CouponVouchers = get_model('voucher', 'CouponVouchers')
+Product = get_model('catalogue', 'Product')
+
+
+@shared_task(ignore_result=True)
+def generate_coupon_report_file(coupon_id, site_id, path):
+    """
+    Generate the report of a coupon and write it to file storage.
+
+    Once the new report is saved, if it is still the report of the coupon's current watermark, the reports for
+    previous watermarks are deleted. Reports which are outdated by the time they are saved, e.g. by a slow job,
+    delete nothing, so that they never delete the current report.
+
+    Args:
+        coupon_id (int): ID of the coupon product.
+        site_id (int): ID of the site used to build voucher URLs.
+        path (str): File storage path the report is written to.
+    """
+    try:
+        if default_storage.exists(path):
+            logger.info('Report [%s] for coupon [%d] already exists.', path, coupon_id)
+            return
+
+        site_configuration = SiteConfiguration.objects.get(site_id=site_id)
+        field_names, rows = stream_coupon_report(
+            CouponVouchers.objects.filter(coupon_id=coupon_id), site_configuration=site_configuration
+        )
+
+        # The report is built in a local file first, so that the stored file never contains a partial report.
+        with tempfile.TemporaryFile() as report:
+            for line in iter_coupon_report_csv(field_names, rows):
+                report.write(line)
+            report.seek(0)
+            default_storage.save(path, File(report))
+
+        logger.info('Saved report [%s] for coupon [%d].', path, coupon_id)
+
+        if get_coupon_report_path(Product.objects.get(id=coupon_id)) != path:
+            logger.info('Report [%s] for coupon [%d] is outdated. Previous reports are kept.', path, coupon_id)
+            return
+
+        directory, filename = os.path.split(path)
+        __, filenames = default_storage.listdir(directory)
+        for stale_filename in filenames:
+            if stale_filename != filename:
+                default_storage.delete(os.path.join(directory, stale_filename))
+    finally:
+        cache.delete(path)
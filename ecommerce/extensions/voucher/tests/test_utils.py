@@ -2,11 +2,13 @@
 from __future__ import unicode_literals
 
 import httpretty
+import mock
 from django.db import IntegrityError
 from django.test import override_settings
 from django.utils.translation import ugettext_lazy as _
 from oscar.templatetags.currency_filters import currency
 from oscar.test.factories import *  # pylint:disable=wildcard-import,unused-wildcard-import
+from testfixtures import LogCapture
 
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.core.tests.decorators import mock_course_catalog_api_client
@@ -16,7 +18,8 @@ from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.extensions.fulfillment.modules import CouponFulfillmentModule
 from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.voucher.utils import (
-    create_vouchers, generate_coupon_report, get_voucher_discount_info, update_voucher_offer
+    _generate_code_strings, create_vouchers, generate_coupon_report, get_voucher_discount_info,
+    stream_coupon_report, update_voucher_offer
 )
 from ecommerce.tests.mixins import LmsApiMockMixin
 from ecommerce.tests.testcases import TestCase
@@ -178,10 +181,45 @@ class UtilTests(CouponMixin, CourseCatalogMockMixin, CourseCatalogTestMixin, Lms
         self.assertEqual(voucher_offer.benefit.range.catalog, self.catalog)
         self.assertEqual(voucher_offer.email_domains, email_domains)
         self.assertEqual(len(coupon_voucher.vouchers.all()), 11)
+        self.assertEqual(coupon_voucher.num_vouchers, 11)
         self.assertEqual(voucher.end_datetime, datetime.date(2015, 10, 30))
         self.assertEqual(voucher.start_datetime, datetime.date(2015, 10, 1))
         self.assertEqual(voucher.usage, Voucher.SINGLE_USE)
 
+    @override_settings(VOUCHER_BULK_CREATE_BATCH_SIZE=3)
+    def test_create_vouchers_in_batches(self):
+        """
+        Test that vouchers created over multiple batches are all linked to their offers and coupon.
+        """
+        vouchers = create_vouchers(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=100.00,
+            catalog=self.catalog,
+            coupon=self.coupon,
+            end_datetime=datetime.date(2015, 10, 30),
+            name="Test voucher",
+            quantity=10,
+            start_datetime=datetime.date(2015, 10, 1),
+            voucher_type=Voucher.MULTI_USE,
+            max_uses=2
+        )
+
+        self.assertEqual(len(vouchers), 10)
+        self.assertEqual(len(set(voucher.code for voucher in vouchers)), 10)
+
+        coupon_voucher = CouponVouchers.objects.get(coupon=self.coupon)
+        self.assertEqual(coupon_voucher.vouchers.count(), 11)
+        for voucher in vouchers:
+            self.assertIn(voucher, coupon_voucher.vouchers.all())
+            self.assertEqual(voucher.offers.count(), 1)
+
+        # Each multi-use voucher has its own offer, all of them sharing a single condition and benefit.
+        offers = [voucher.offers.first() for voucher in vouchers]
+        self.assertEqual(len(set(offer.id for offer in offers)), 10)
+        self.assertEqual(len(set(offer.condition_id for offer in offers)), 1)
+        self.assertEqual(len(set(offer.benefit_id for offer in offers)), 1)
+        self.assertTrue(all(offer.max_global_applications == 2 for offer in offers))
+
     @override_settings(VOUCHER_CODE_LENGTH=VOUCHER_CODE_LENGTH)
     def test_regenerate_voucher_code(self):
         """
@@ -215,6 +253,47 @@ class UtilTests(CouponMixin, CourseCatalogMockMixin, CourseCatalogTestMixin, Lms
             )
             self.assertTrue(Voucher.objects.filter(code__iexact=voucher[0].code).exists())
 
+    @override_settings(VOUCHER_CODE_LENGTH=VOUCHER_CODE_LENGTH)
+    def test_generate_code_strings_skips_existing_codes(self):
+        """
+        Test that only the generated codes which collide with existing vouchers are regenerated.
+        """
+        create_vouchers(
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=100.00,
+            catalog=self.catalog,
+            coupon=self.coupon,
+            end_datetime=datetime.date(2015, 10, 30),
+            name="Test voucher",
+            quantity=1,
+            start_datetime=datetime.date(2015, 10, 1),
+            voucher_type=Voucher.SINGLE_USE,
+            code='B'
+        )
+
+        with mock.patch('ecommerce.extensions.voucher.utils._generate_random_code', side_effect=['B', 'C', 'D']):
+            codes = _generate_code_strings(VOUCHER_CODE_LENGTH, 2)
+
+        self.assertEqual(sorted(codes), ['C', 'D'])
+
+    def test_generate_code_strings_collision_warning(self):
+        """
+        Test that a warning is logged when the code length makes collisions likely,
+        and that an error is raised when there are not enough codes of that length.
+        """
+        with LogCapture('ecommerce.extensions.voucher.utils') as l:
+            codes = _generate_code_strings(VOUCHER_CODE_LENGTH, 10)
+            l.check((
+                'ecommerce.extensions.voucher.utils',
+                'WARNING',
+                'Generating [10] voucher codes of length [1] is likely to cause collisions. '
+                'Consider increasing VOUCHER_CODE_LENGTH.'
+            ))
+        self.assertEqual(len(set(codes)), 10)
+
+        with self.assertRaises(ValueError):
+            _generate_code_strings(VOUCHER_CODE_LENGTH, 33)
+
     @override_settings(VOUCHER_CODE_LENGTH=0)
     def test_nonpositive_voucher_code_length(self):
         """
@@ -373,6 +452,21 @@ class UtilTests(CouponMixin, CourseCatalogMockMixin, CourseCatalogTestMixin, Lms
         self.assertNotIn('Course Seat Types', field_names)
         self.assertNotIn('Redeemed For Course ID', field_names)
 
+    def test_stream_coupon_report_query_count(self):
+        """ Verify the number of queries needed to generate a report does not depend on the number of vouchers. """
+        self.setup_coupons_for_report()
+        vouchers = self.coupon_vouchers.first().vouchers.all()
+        self.use_voucher('TESTORDER1', vouchers[1], self.user)
+        self.mock_course_api_response(course=self.course)
+
+        __, rows = stream_coupon_report(self.coupon_vouchers)
+        # The coupon row is generated up front. The voucher batch needs one query each for the vouchers,
+        # their offers, their applications and the redeemed order lines, plus one to find the end of the batches.
+        with self.assertNumQueries(5):
+            voucher_rows = list(rows)[1:]
+
+        self.assertEqual(len(voucher_rows), 4)
+
     def test_report_for_inactive_coupons(self):
         """ Verify the coupon report show correct status for inactive coupons. """
         coupon_title = self.coupon.title
@@ -1,11 +1,18 @@
+import shutil
+import tempfile
+
 import httpretty
-from django.test import RequestFactory
+from django.core.files.storage import default_storage
+from django.test import RequestFactory, override_settings
 from oscar.core.loading import get_model
 from oscar.test import factories
+from waffle.models import Switch
 
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
+from ecommerce.extensions.voucher.tasks import generate_coupon_report_file
+from ecommerce.extensions.voucher.utils import get_coupon_report_path
 from ecommerce.extensions.voucher.views import CouponReportCSVView
 from ecommerce.tests.factories import PartnerFactory
 from ecommerce.tests.mixins import LmsApiMockMixin
@@ -50,7 +57,8 @@ class CouponReportCSVViewTest(CouponMixin, CourseCatalogTestMixin, LmsApiMockMix
         response = CouponReportCSVView().get(request, coupon_id=coupon.id)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.content.splitlines()), 7)
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 7)
 
     @httpretty.activate
     def test_get_csv_report_for_specific_coupon(self):
@@ -61,3 +69,60 @@ class CouponReportCSVViewTest(CouponMixin, CourseCatalogTestMixin, LmsApiMockMix
         self.mock_course_api_response(course=self.course)
         self.request_specific_voucher_report(self.coupon1)
         self.request_specific_voucher_report(self.coupon2)
+
+    @httpretty.activate
+    def test_get_async_csv_report(self):
+        """
+        Verify that, with the async_coupon_reports switch active, the report is generated
+        by a background job and then served from file storage until the coupon changes.
+        """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        Switch.objects.update_or_create(name='async_coupon_reports', defaults={'active': True})
+        self.mock_course_api_response(course=self.course)
+
+        basket = Basket.get_basket(factories.UserFactory(), self.site)
+        basket.add_product(self.coupon1)
+        request = RequestFactory().get('/')
+        request.site = self.site
+
+        with override_settings(MEDIA_ROOT=media_root):
+            # Tests run Celery tasks eagerly, so the report is saved by the time the first response is returned.
+            response = CouponReportCSVView().get(request, coupon_id=self.coupon1.id)
+            self.assertEqual(response.status_code, 202)
+            path = get_coupon_report_path(self.coupon1)
+
+            response = CouponReportCSVView().get(request, coupon_id=self.coupon1.id)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 7)
+
+            self.coupon1.save()
+            self.assertNotEqual(get_coupon_report_path(self.coupon1), path)
+            response = CouponReportCSVView().get(request, coupon_id=self.coupon1.id)
+            self.assertEqual(response.status_code, 202)
+
+    @httpretty.activate
+    def test_outdated_async_csv_report(self):
+        """ Verify a report saved for an outdated watermark does not delete the current report. """
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.mock_course_api_response(course=self.course)
+
+        with override_settings(MEDIA_ROOT=media_root):
+            outdated_path = get_coupon_report_path(self.coupon1)
+            self.coupon1.save()
+            path = get_coupon_report_path(self.coupon1)
+            self.assertNotEqual(path, outdated_path)
+
+            generate_coupon_report_file(self.coupon1.id, self.site.id, path)
+            generate_coupon_report_file(self.coupon1.id, self.site.id, outdated_path)
+            self.assertTrue(default_storage.exists(path))
+            self.assertTrue(default_storage.exists(outdated_path))
+
+            # The next current report deletes both.
+            self.coupon1.save()
+            new_path = get_coupon_report_path(self.coupon1)
+            generate_coupon_report_file(self.coupon1.id, self.site.id, new_path)
+            self.assertTrue(default_storage.exists(new_path))
+            self.assertFalse(default_storage.exists(path))
+            self.assertFalse(default_storage.exists(outdated_path))
@@ -1,12 +1,16 @@
 """Voucher Utility Methods. """
 import base64
+import csv
 import datetime
 import hashlib
 import logging
 import uuid
+from collections import defaultdict
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db.models import Count, F, Max
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
@@ -18,11 +22,21 @@ from ecommerce.invoice.models import Invoice
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct characters in a base32-encoded voucher code.
+VOUCHER_CODE_ALPHABET_SIZE = 32
+
+# Number of vouchers loaded per batch when generating a coupon report.
+COUPON_REPORT_BATCH_SIZE = 1000
+
+# File storage directory of the coupon reports generated asynchronously.
+COUPON_REPORT_STORAGE_DIRECTORY = 'coupon_reports'
+
 Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Condition = get_model('offer', 'Condition')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 CouponVouchers = get_model('voucher', 'CouponVouchers')
+Line = get_model('order', 'Line')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
@@ -133,11 +147,20 @@ def _get_info_for_coupon_report(coupon, voucher):
     return coupon_data
 
 
-def _get_voucher_info_for_coupon_report(voucher):
-    offer = voucher.offers.first()
+def _get_voucher_info_for_coupon_report(voucher, offer, offer_url):
+    """
+    Retrieve the report data for a single voucher.
+
+    Arguments:
+        voucher (Voucher)
+        offer (Offer): Offer associated with the voucher.
+        offer_url (str): Absolute URL of the offer landing page, without the voucher code.
+
+    Returns:
+        dict
+    """
     status = _get_voucher_status(voucher, offer)
-    path = '{path}?code={code}'.format(path=reverse('coupons:offer'), code=voucher.code)
-    url = get_ecommerce_url(path)
+    url = '{url}?code={code}'.format(url=offer_url, code=voucher.code)
 
     # Set the max_uses_count for single-use vouchers to 1,
     # for other usage limitations (once per customer and multi-use)
@@ -164,16 +187,112 @@ def _get_voucher_info_for_coupon_report(voucher):
     return coupon_data
 
 
-def generate_coupon_report(coupon_vouchers):
+def _get_coupon_row_for_coupon_report(coupon_voucher):
+    coupon = coupon_voucher.coupon
+    row = _get_info_for_coupon_report(coupon, coupon_voucher.vouchers.first())
+    row['Client'] = Invoice.objects.get(order__lines__product=coupon).business_client.name
+    return row
+
+
+def _get_voucher_applications_for_coupon_report(vouchers):
     """
-    Generate coupon report data
+    Retrieve the applications of the given vouchers, along with the course each one was redeemed for.
+
+    Arguments:
+        vouchers (List[Voucher])
+
+    Returns:
+        dict: Lists of (VoucherApplication, course ID) tuples keyed by voucher ID.
+    """
+    voucher_ids = [voucher.id for voucher in vouchers if voucher.num_orders > 0]
+    if not voucher_ids:
+        return {}
+
+    applications = list(
+        VoucherApplication.objects.filter(voucher_id__in=voucher_ids).select_related('user', 'order').order_by('id')
+    )
+
+    # Only the first line of each order is reported on.
+    course_ids = {}
+    lines = Line.objects.filter(
+        order_id__in=set(application.order_id for application in applications)
+    ).order_by('id').values_list('order_id', 'product__course_id')
+    for order_id, course_id in lines:
+        course_ids.setdefault(order_id, course_id)
+
+    applications_by_voucher = defaultdict(list)
+    for application in applications:
+        applications_by_voucher[application.voucher_id].append((application, course_ids.get(application.order_id)))
+
+    return applications_by_voucher
+
+
+def _iter_voucher_rows_for_coupon_report(coupon_voucher, offer_url, is_query_coupon):
+    """
+    Yield the report rows for the vouchers of a coupon, and for each of their redemptions.
+
+    Vouchers are loaded in batches of COUPON_REPORT_BATCH_SIZE, with a fixed number of queries per batch.
+
+    Arguments:
+        coupon_voucher (CouponVouchers)
+        offer_url (str): Absolute URL of the offer landing page, without the voucher code.
+        is_query_coupon (bool): Whether the report is for a dynamic catalog (query) coupon.
+
+    Yields:
+        dict
+    """
+    vouchers = coupon_voucher.vouchers.prefetch_related('offers').order_by('id')
+    last_id = 0
+
+    while True:
+        batch = list(vouchers.filter(id__gt=last_id)[:COUPON_REPORT_BATCH_SIZE])
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        applications = _get_voucher_applications_for_coupon_report(batch)
+        for voucher in batch:
+            row = _get_voucher_info_for_coupon_report(voucher, voucher.offers.all()[0], offer_url)
+
+            for item in ('Order Number', 'Redeemed By Username',):
+                row[item] = ''
+
+            yield row
+
+            for application, redemption_course_id in applications.get(voucher.id, []):
+                new_row = row.copy()
+
+                if is_query_coupon:
+                    new_row['Redeemed For Course ID'] = redemption_course_id
+
+                new_row.update({
+                    'Status': _('Redeemed'),
+                    'Order Number': application.order.number,
+                    'Redeemed By Username': application.user.username,
+                    'Maximum Coupon Usage': 1,
+                    'Redemption Count': 1,
+                })
+
+                yield new_row
+
+
+def stream_coupon_report(coupon_vouchers, site_configuration=None):
+    """
+    Generate coupon report data lazily.
+
+    The rows are produced by a generator, so that the report can be written out
+    while it is being generated without holding every row in memory.
 
     Args:
         coupon_vouchers (List[CouponVouchers]): List of coupon_vouchers the report should be generated for
 
+    Kwargs:
+        site_configuration (SiteConfiguration): Site used to build voucher URLs. Defaults to the site
+            of the current request.
+
     Returns:
         List[str]
-        List[dict]
+        Iterator[dict]
     """
 
     field_names = [
@@ -204,44 +323,34 @@ def generate_coupon_report(coupon_vouchers):
         _('Coupon Expiry Date'),
         _('Email Domains'),
     ]
-    rows = []
-
-    for coupon_voucher in coupon_vouchers:
-        coupon = coupon_voucher.coupon
-        client = Invoice.objects.get(order__lines__product=coupon).business_client.name
-        rows.append(_get_info_for_coupon_report(coupon, coupon_voucher.vouchers.first()))
-        rows[0]['Client'] = client
-
-        for voucher in coupon_voucher.vouchers.all().prefetch_related('offers'):
-            row = _get_voucher_info_for_coupon_report(voucher)
-
-            for item in ('Order Number', 'Redeemed By Username',):
-                row[item] = ''
-
-            rows.append(row)
-            if voucher.num_orders > 0:
-                voucher_applications = VoucherApplication.objects.filter(
-                    voucher=voucher).prefetch_related('user', 'order__lines')
-                for application in voucher_applications:
-                    redemption_user_username = application.user.username
-                    redemption_course_id = application.order.lines.first().product.course_id
+    coupon_vouchers = iter(coupon_vouchers)
+    if site_configuration:
+        offer_url = site_configuration.build_ecommerce_url(reverse('coupons:offer'))
+    else:
+        offer_url = get_ecommerce_url(reverse('coupons:offer'))
 
-                    new_row = row.copy()
+    # The columns of the report depend on the type of the first coupon, so its row is built up front.
+    first_coupon_voucher = next(coupon_vouchers, None)
+    if first_coupon_voucher:
+        first_coupon_row = _get_coupon_row_for_coupon_report(first_coupon_voucher)
+        is_query_coupon = 'Catalog Query' in first_coupon_row
+    else:
+        is_query_coupon = False
 
-                    if 'Catalog Query' in rows[0]:
-                        new_row['Redeemed For Course ID'] = redemption_course_id
+    def _iter_rows():
+        if not first_coupon_voucher:
+            return
 
-                    new_row.update({
-                        'Status': _('Redeemed'),
-                        'Order Number': application.order.number,
-                        'Redeemed By Username': redemption_user_username,
-                        'Maximum Coupon Usage': 1,
-                        'Redemption Count': 1,
-                    })
+        yield first_coupon_row
+        for row in _iter_voucher_rows_for_coupon_report(first_coupon_voucher, offer_url, is_query_coupon):
+            yield row
 
-                    rows.append(new_row)
+        for coupon_voucher in coupon_vouchers:
+            yield _get_coupon_row_for_coupon_report(coupon_voucher)
+            for row in _iter_voucher_rows_for_coupon_report(coupon_voucher, offer_url, is_query_coupon):
+                yield row
 
-    if 'Catalog Query' in rows[0]:
+    if is_query_coupon:
         field_names.remove('Course ID')
         field_names.remove('Organization')
     else:
@@ -249,7 +358,156 @@ def generate_coupon_report(coupon_vouchers):
         field_names.remove('Course Seat Types')
         field_names.remove('Redeemed For Course ID')
 
-    return field_names, rows
+    return field_names, _iter_rows()
+
+
+def generate_coupon_report(coupon_vouchers):
+    """
+    Generate coupon report data
+
+    Args:
+        coupon_vouchers (List[CouponVouchers]): List of coupon_vouchers the report should be generated for
+
+    Returns:
+        List[str]
+        List[dict]
+    """
+    field_names, rows = stream_coupon_report(coupon_vouchers)
+    return field_names, list(rows)
+
+
+class _Echo(object):
+    """File-like object that returns written values instead of buffering them, for use with csv writers."""
+
+    def write(self, value):
+        return value
+
+
+def iter_coupon_report_csv(field_names, rows):
+    """
+    Yield the CSV-encoded header and rows of a coupon report, one line at a time.
+
+    Args:
+        field_names (List[str]): Report columns.
+        rows (Iterable[dict]): Report rows.
+
+    Yields:
+        str
+    """
+    writer = csv.DictWriter(_Echo(), fieldnames=field_names)
+    yield writer.writerow(dict(zip(field_names, field_names)))
+    for row in rows:
+        for key, value in row.items():
+            if isinstance(row[key], unicode):
+                row[key] = value.encode('utf-8')
+        yield writer.writerow(row)
+
+
+def _get_coupon_report_version_cache_key(coupon_id):
+    return 'coupon_report_version_{}'.format(coupon_id)
+
+
+def invalidate_coupon_report(coupon):
+    """
+    Invalidate the cached report files of a coupon.
+
+    Changes to coupon data that are not reflected in the report watermark
+    (e.g. bulk updates of voucher dates or offers) must call this.
+
+    Args:
+        coupon (Product): Coupon product.
+    """
+    key = _get_coupon_report_version_cache_key(coupon.id)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key was evicted between add and incr.
+        cache.set(key, 1, None)
+
+
+def get_coupon_report_watermark(coupon):
+    """
+    Compute a value which changes whenever the report of a coupon would change.
+
+    The watermark covers the coupon vouchers, their applications, the coupon invoice,
+    the coupon itself and the current date (voucher statuses depend on it).
+
+    Args:
+        coupon (Product): Coupon product.
+
+    Returns:
+        str
+    """
+    vouchers = Voucher.objects.filter(coupon_vouchers__coupon=coupon).aggregate(
+        count=Count('id'), last_id=Max('id')
+    )
+    applications = VoucherApplication.objects.filter(voucher__coupon_vouchers__coupon=coupon).aggregate(
+        count=Count('id'), last_created=Max('date_created')
+    )
+    invoices = Invoice.objects.filter(order__lines__product=coupon).aggregate(last_modified=Max('modified'))
+    version = cache.get(_get_coupon_report_version_cache_key(coupon.id), 0)
+
+    watermark = '{version}|{date}|{coupon_updated}|{vouchers}|{applications}|{invoices}'.format(
+        version=version,
+        date=datetime.date.today().isoformat(),
+        coupon_updated=coupon.date_updated.isoformat() if coupon.date_updated else '',
+        vouchers='{count}-{last_id}'.format(**vouchers),
+        applications='{count}-{last_created}'.format(**applications),
+        invoices='{last_modified}'.format(**invoices),
+    )
+    return hashlib.md5(watermark).hexdigest()
+
+
+def get_coupon_report_path(coupon):
+    """
+    Return the file storage path of the report of a coupon, for its current watermark.
+
+    Args:
+        coupon (Product): Coupon product.
+
+    Returns:
+        str
+    """
+    return '{directory}/{coupon_id}/{watermark}.csv'.format(
+        directory=COUPON_REPORT_STORAGE_DIRECTORY,
+        coupon_id=coupon.id,
+        watermark=get_coupon_report_watermark(coupon)
+    )
+
+
+def _get_or_create_offer_condition_and_benefit(product_range, benefit_type, benefit_value):
+    """
+    Return the condition and benefit of the offers for a range of products.
+
+    Args:
+        product_range (Range): Range of products associated with condition
+        benefit_type (str): Type of benefit associated with the offer
+        benefit_value (Decimal): Value of benefit associated with the offer
+
+    Returns:
+        tuple(Condition, Benefit)
+    """
+    offer_condition, __ = Condition.objects.get_or_create(
+        range=product_range,
+        type=Condition.COUNT,
+        value=1,
+    )
+    offer_benefit, __ = Benefit.objects.get_or_create(
+        range=product_range,
+        type=benefit_type,
+        value=benefit_value,
+        max_affected_items=1,
+    )
+    return offer_condition, offer_benefit
+
+
+def _get_offer_name(coupon_id, offer_benefit, offer_number=None):
+    """ Return the name of a coupon offer. """
+    offer_name = "Coupon [{}]-{}-{}".format(coupon_id, offer_benefit.type, offer_benefit.value)
+    if offer_number:
+        offer_name = "{} [{}]".format(offer_name, offer_number)
+    return offer_name
 
 
 def _get_or_create_offer(
@@ -277,24 +535,12 @@ def _get_or_create_offer(
     Returns:
         Offer
     """
-    offer_condition, __ = Condition.objects.get_or_create(
-        range=product_range,
-        type=Condition.COUNT,
-        value=1,
-    )
-    offer_benefit, __ = Benefit.objects.get_or_create(
-        range=product_range,
-        type=benefit_type,
-        value=benefit_value,
-        max_affected_items=1,
+    offer_condition, offer_benefit = _get_or_create_offer_condition_and_benefit(
+        product_range, benefit_type, benefit_value
     )
 
-    offer_name = "Coupon [{}]-{}-{}".format(coupon_id, offer_benefit.type, offer_benefit.value)
-    if offer_number:
-        offer_name = "{} [{}]".format(offer_name, offer_number)
-
     offer, __ = ConditionalOffer.objects.get_or_create(
-        name=offer_name,
+        name=_get_offer_name(coupon_id, offer_benefit, offer_number),
         offer_type=ConditionalOffer.VOUCHER,
         condition=offer_condition,
         benefit=offer_benefit,
@@ -305,64 +551,192 @@ def _get_or_create_offer(
     return offer
 
 
-def _generate_code_string(length):
+def _get_or_create_offers(product_range, benefit_type, benefit_value, coupon_id, max_uses, quantity, email_domains):
+    """
+    Return one offer per voucher of a multi-use coupon.
+
+    The offers share a single condition and benefit. Offers which do not exist yet are
+    inserted in batches of VOUCHER_BULK_CREATE_BATCH_SIZE, like the vouchers themselves.
+
+    Args:
+        product_range (Range): Range of products associated with condition
+        benefit_type (str): Type of benefit associated with the offers
+        benefit_value (Decimal): Value of benefit associated with the offers
+        coupon_id (int): ID of the coupon
+        max_uses (int): number of maximum global application number each offer can have
+        quantity (int): Number of offers
+        email_domains (str): a comma-separated string of email domains allowed to apply
+                            the offers
+
+    Returns:
+        List[Offer]
+    """
+    offer_condition, offer_benefit = _get_or_create_offer_condition_and_benefit(
+        product_range, benefit_type, benefit_value
+    )
+    offer_fields = {
+        'offer_type': ConditionalOffer.VOUCHER,
+        'condition': offer_condition,
+        'benefit': offer_benefit,
+        'max_global_applications': max_uses,
+        'email_domains': email_domains,
+    }
+    batch_size = settings.VOUCHER_BULK_CREATE_BATCH_SIZE
+    offers = []
+
+    for batch_start in range(0, quantity, batch_size):
+        names = [
+            _get_offer_name(coupon_id, offer_benefit, offer_number)
+            for offer_number in range(batch_start, min(batch_start + batch_size, quantity))
+        ]
+        existing_names = set(
+            ConditionalOffer.objects.filter(name__in=names, **offer_fields).values_list('name', flat=True)
+        )
+        ConditionalOffer.objects.bulk_create([
+            ConditionalOffer(name=name, **offer_fields) for name in names if name not in existing_names
+        ])
+
+        # bulk_create does not set primary keys on MySQL, so the offers are read back by name.
+        offers_by_name = {offer.name: offer for offer in ConditionalOffer.objects.filter(name__in=names)}
+        offers.extend(offers_by_name[name] for name in names)
+
+    return offers
+
+
+def _generate_random_code(length):
     """
-    Create a string of random characters of specified length
+    Create a string of random characters of specified length, without checking it for uniqueness.
 
     Args:
         length (int): Defines the length of randomly generated string.
 
+    Returns:
+        str
+    """
+    h = hashlib.sha256()
+    h.update(uuid.uuid4().get_bytes())
+    return base64.b32encode(h.digest())[0:length]
+
+
+def _generate_code_strings(length, quantity):
+    """
+    Create a list of unique random voucher codes of specified length.
+
+    All candidates are generated in memory and checked against existing vouchers
+    with a single query per round; only the codes that collide are regenerated.
+    Oscar stores voucher codes upper-cased, so candidates are normalized the same
+    way and compared with an exact (indexed) lookup rather than a case-insensitive one.
+
+    Args:
+        length (int): Defines the length of randomly generated strings.
+        quantity (int): Number of codes to generate.
+
     Raises:
-        ValueError raised if length is less than one.
+        ValueError raised if length is less than one, or if there are not enough
+        codes of the given length to satisfy the requested quantity.
 
     Returns:
-        str
+        List[str]
     """
     if length < 1:
         raise ValueError("Voucher code length must be a positive number.")
 
-    h = hashlib.sha256()
-    h.update(uuid.uuid4().get_bytes())
-    voucher_code = base64.b32encode(h.digest())[0:length]
-    if Voucher.objects.filter(code__iexact=voucher_code).exists():
-        return _generate_code_string(length)
+    code_space = VOUCHER_CODE_ALPHABET_SIZE ** length
+    if quantity > code_space:
+        raise ValueError(
+            "Cannot generate [{quantity}] unique voucher codes of length [{length}].".format(
+                quantity=quantity, length=length
+            )
+        )
+    if quantity ** 2 > code_space:
+        # Past the square root of the code space, collisions become likely (birthday bound).
+        logger.warning(
+            'Generating [%d] voucher codes of length [%d] is likely to cause collisions. '
+            'Consider increasing VOUCHER_CODE_LENGTH.', quantity, length
+        )
+
+    codes = set()
+    while len(codes) < quantity:
+        candidates = set()
+        while len(codes) + len(candidates) < quantity:
+            candidate = _generate_random_code(length).upper()
+            if candidate not in codes:
+                candidates.add(candidate)
 
-    return voucher_code
+        existing = set(Voucher.objects.filter(code__in=candidates).values_list('code', flat=True))
+        if existing:
+            logger.info('Regenerating [%d] colliding voucher codes.', len(existing))
+        codes.update(candidates - existing)
 
+    return list(codes)
 
-def _create_new_voucher(code, coupon, end_datetime, name, offer, start_datetime, voucher_type):
+
+def _create_new_vouchers(coupon, end_datetime, name, offers, quantity, start_datetime, voucher_type, code=None):
     """
-    Creates a voucher.
+    Creates vouchers in bulk.
 
-    If randomly generated voucher code already exists, new code will be generated and reverified.
+    Vouchers, and their offer and coupon relations, are inserted in batches of
+    VOUCHER_BULK_CREATE_BATCH_SIZE, so the number of queries per batch does not
+    depend on the number of vouchers being created.
 
     Args:
-        code (str): Code associated with vouchers. If not provided, one will be generated.
-        coupon (Product): Coupon product associated with voucher.
-        end_datetime (datetime): Voucher end date.
-        name (str): Voucher name.
-        offer (Offer): Offer associated with voucher.
-        start_datetime (datetime): Voucher start date.
-        voucher_type (str): Voucher usage.
+        coupon (Product): Coupon product associated with vouchers.
+        end_datetime (datetime): Vouchers end date.
+        name (str): Vouchers name.
+        offers (List[Offer]): Offers associated with vouchers. Either one offer shared by
+                              all vouchers, or one offer per voucher.
+        quantity (int): Number of vouchers to be created.
+        start_datetime (datetime): Vouchers start date.
+        voucher_type (str): Vouchers usage.
+        code (str): Code associated with vouchers. If not provided, codes will be generated.
 
     Returns:
-        Voucher
+        List[Voucher]
     """
-    voucher_code = code or _generate_code_string(settings.VOUCHER_CODE_LENGTH)
-
-    voucher = Voucher.objects.create(
-        name=name,
-        code=voucher_code,
-        usage=voucher_type,
-        start_datetime=start_datetime,
-        end_datetime=end_datetime
-    )
-    voucher.offers.add(offer)
+    VoucherOffer = Voucher.offers.through
+    CouponVoucher = CouponVouchers.vouchers.through
 
     coupon_voucher, __ = CouponVouchers.objects.get_or_create(coupon=coupon)
-    coupon_voucher.vouchers.add(voucher)
+    batch_size = settings.VOUCHER_BULK_CREATE_BATCH_SIZE
+    vouchers = []
+
+    for batch_start in range(0, quantity, batch_size):
+        batch_quantity = min(batch_size, quantity - batch_start)
+        if code:
+            # Oscar normalizes voucher codes to upper case on save, which bulk_create bypasses.
+            codes = [code.upper()] * batch_quantity
+        else:
+            codes = _generate_code_strings(settings.VOUCHER_CODE_LENGTH, batch_quantity)
+
+        Voucher.objects.bulk_create([
+            Voucher(
+                name=name,
+                code=voucher_code,
+                usage=voucher_type,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime
+            ) for voucher_code in codes
+        ])
+
+        # bulk_create does not set primary keys on MySQL, so the new vouchers are read back by code.
+        vouchers_by_code = {voucher.code: voucher for voucher in Voucher.objects.filter(code__in=codes)}
+        batch_vouchers = [vouchers_by_code[voucher_code] for voucher_code in codes]
+
+        VoucherOffer.objects.bulk_create([
+            VoucherOffer(
+                voucher_id=voucher.id,
+                conditionaloffer_id=offers[batch_start + i].id if len(offers) > 1 else offers[0].id
+            ) for i, voucher in enumerate(batch_vouchers)
+        ])
+        CouponVoucher.objects.bulk_create([
+            CouponVoucher(couponvouchers_id=coupon_voucher.id, voucher_id=voucher.id) for voucher in batch_vouchers
+        ])
+
+        vouchers.extend(batch_vouchers)
+
+    CouponVouchers.objects.filter(id=coupon_voucher.id).update(num_vouchers=F('num_vouchers') + len(vouchers))
 
-    return voucher
+    return vouchers
 
 
 def create_vouchers(
@@ -402,8 +776,6 @@ def create_vouchers(
             List[Voucher]
     """
     logger.info("Creating [%d] vouchers product [%s]", quantity, coupon.id)
-    vouchers = []
-    offers = []
 
     if _range:
         # Enrollment codes use a custom range.
@@ -424,32 +796,37 @@ def create_vouchers(
     # mean all vouchers will have their usage decreased by one, hence each voucher needs
     # its own offer to keep track of its own usages without interfering with others.
     multi_offer = True if quantity > 1 and max_uses > 1 else False
-    num_of_offers = quantity if multi_offer else 1
-    for num in range(num_of_offers):
-        offer = _get_or_create_offer(
+    if multi_offer:
+        offers = _get_or_create_offers(
             product_range=product_range,
             benefit_type=benefit_type,
             benefit_value=benefit_value,
-            max_uses=max_uses,
             coupon_id=coupon.id,
-            offer_number=num,
+            max_uses=max_uses,
+            quantity=quantity,
             email_domains=email_domains
         )
-        offers.append(offer)
-
-    for i in range(quantity):
-        voucher = _create_new_voucher(
-            coupon=coupon,
-            end_datetime=end_datetime,
-            offer=offers[i] if multi_offer else offers[0],
-            start_datetime=start_datetime,
-            voucher_type=voucher_type,
-            code=code,
-            name=name
-        )
-        vouchers.append(voucher)
+    else:
+        offers = [_get_or_create_offer(
+            product_range=product_range,
+            benefit_type=benefit_type,
+            benefit_value=benefit_value,
+            max_uses=max_uses,
+            coupon_id=coupon.id,
+            offer_number=0,
+            email_domains=email_domains
+        )]
 
-    return vouchers
+    return _create_new_vouchers(
+        coupon=coupon,
+        end_datetime=end_datetime,
+        name=name,
+        offers=offers,
+        quantity=quantity,
+        start_datetime=start_datetime,
+        voucher_type=voucher_type,
+        code=code
+    )
 
 
 def get_voucher_discount_info(benefit, price):
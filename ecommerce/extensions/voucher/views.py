@@ -1,18 +1,23 @@
-import csv
-
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View
 from oscar.core.loading import get_model
+import waffle
 
 from ecommerce.core.views import StaffOnlyMixin
-from ecommerce.extensions.voucher.utils import generate_coupon_report
+from ecommerce.extensions.voucher.tasks import generate_coupon_report_file
+from ecommerce.extensions.voucher.utils import get_coupon_report_path, iter_coupon_report_csv, stream_coupon_report
 
 Benefit = get_model('offer', 'Benefit')
 CouponVouchers = get_model('voucher', 'CouponVouchers')
 Product = get_model('catalogue', 'Product')
 
+# Time, in seconds, after which a report generation job that has not completed can be enqueued again.
+COUPON_REPORT_JOB_TIMEOUT = 60 * 60
+
 
 class CouponReportCSVView(StaffOnlyMixin, View):
     """Generates coupon report and returns it in CSV format."""
@@ -20,24 +25,32 @@ class CouponReportCSVView(StaffOnlyMixin, View):
     def get(self, request, coupon_id):  # pylint: disable=unused-argument
         """
         Generate coupon report for vouchers associated with the coupon.
+
+        The report is streamed to the client as it is generated. If the async_coupon_reports
+        switch is active, the report is instead generated by a Celery task and stored, and
+        served from storage for as long as the coupon data does not change.
         """
         coupon = Product.objects.get(id=coupon_id)
         filename = _("Coupon Report for {coupon_name}").format(coupon_name=unicode(coupon))
-        coupons_vouchers = CouponVouchers.objects.filter(coupon=coupon)
-
         filename = "{}.csv".format(slugify(filename))
 
-        field_names, rows = generate_coupon_report(coupons_vouchers)
+        if waffle.switch_is_active('async_coupon_reports'):
+            path = get_coupon_report_path(coupon)
+            if default_storage.exists(path):
+                response = FileResponse(default_storage.open(path), content_type='text/csv')
+            else:
+                # Only enqueue one job per report, regardless of how many times it is requested.
+                if cache.add(path, True, COUPON_REPORT_JOB_TIMEOUT):
+                    generate_coupon_report_file.delay(coupon.id, request.site.id, path)
+                return HttpResponse(
+                    _('The report is being generated. Please try again in a few minutes.'),
+                    status=202
+                )
+        else:
+            coupons_vouchers = CouponVouchers.objects.filter(coupon=coupon)
+            field_names, rows = stream_coupon_report(coupons_vouchers)
+            response = StreamingHttpResponse(iter_coupon_report_csv(field_names, rows), content_type='text/csv')
 
-        response = HttpResponse(content_type='text/csv')
         response['Content-Disposition'] = 'attachment; filename={}'.format(filename)
 
-        writer = csv.DictWriter(response, fieldnames=field_names)
-        writer.writeheader()
-        for row in rows:
-            for key, value in row.items():
-                if isinstance(row[key], unicode):
-                    row[key] = value.encode('utf-8')
-            writer.writerow(row)
-
         return response
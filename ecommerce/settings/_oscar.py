@@ -132,6 +132,9 @@ PAYMENT_PROCESSOR_CONFIG = {
 }
 
 PAYMENT_PROCESSOR_SWITCH_PREFIX = 'payment_processor_active_'
+
+# Number of seconds for which the payment processors enabled for each site are cached
+PAYMENT_PROCESSORS_CACHE_TIMEOUT = 60
 # END PAYMENT PROCESSING
 
 
@@ -259,9 +262,28 @@ OSCAR_DASHBOARD_NAVIGATION = [
 # Default timeout for Enrollment API calls
 ENROLLMENT_FULFILLMENT_TIMEOUT = 7
 
+# Maximum number of keep-alive connections to the Enrollment API kept open by each process
+ENROLLMENT_FULFILLMENT_POOL_SIZE = 10
+
+# Maximum number of concurrent Enrollment API calls made while fulfilling a single order
+ENROLLMENT_FULFILLMENT_MAX_WORKERS = 5
+
+# Maximum number of concurrent Enrollment API calls made while revoking the lines of a single refund
+ENROLLMENT_REVOCATION_MAX_WORKERS = 10
+
+# Fulfillment retries: lines that fail due to network errors or timeouts are retried with exponential backoff,
+# capped at FULFILLMENT_RETRY_MAX_DELAY seconds, until FULFILLMENT_RETRY_MAX_ATTEMPTS retries have been made.
+FULFILLMENT_RETRY_BASE_DELAY = 60
+FULFILLMENT_RETRY_MAX_DELAY = 3600
+FULFILLMENT_RETRY_MAX_ATTEMPTS = 8
+FULFILLMENT_RETRY_BATCH_SIZE = 100
+
 # Coupon code length
 VOUCHER_CODE_LENGTH = 16
 
+# Number of vouchers inserted per query when creating vouchers in bulk
+VOUCHER_BULK_CREATE_BATCH_SIZE = 1000
+
 THUMBNAIL_DEBUG = False
 
 OSCAR_FROM_EMAIL = 'testing@example.com'
@@ -210,11 +210,14 @@ MIDDLEWARE_CLASSES = (
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware',
+    'ecommerce.core.middleware.SiteConfigurationMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'waffle.middleware.WaffleMiddleware',
     # NOTE: The overridden BasketMiddleware relies on request.site. This middleware
     # MUST appear AFTER CurrentSiteMiddleware.
     'ecommerce.extensions.basket.middleware.BasketMiddleware',
+    # Sends the signals deferred by views once their transaction is committed.
+    'ecommerce.core.middleware.DeferredSignalsMiddleware',
     'django.contrib.flatpages.middleware.FlatpageFallbackMiddleware',
     'social.apps.django_app.middleware.SocialAuthExceptionMiddleware',
     'simple_history.middleware.HistoryRequestMiddleware',
@@ -232,8 +235,40 @@ ROOT_URLCONF = '{}.urls'.format(SITE_NAME)
 # Commerce API settings used for publishing information to LMS.
 COMMERCE_API_TIMEOUT = 7
 
+# REST API clients (see ecommerce.core.clients) reuse keep-alive sessions, keyed by site, service and principal.
+# Default timeout, in seconds, of the calls made by these clients.
+API_CLIENT_TIMEOUT = 5
+# Maximum number of connections kept open by each session.
+API_CLIENT_POOL_SIZE = 10
+# Maximum number of sessions kept by each process. The least recently used session is closed first.
+API_CLIENT_MAX_SESSIONS = 100
+
+# Number of seconds ahead of its expiration at which a site's access token is refreshed.
+ACCESS_TOKEN_REFRESH_MARGIN = 300
+# Maximum number of seconds a process may hold the lock used to refresh an access token.
+ACCESS_TOKEN_REFRESH_LOCK_TIMEOUT = 30
+# Number of seconds between checks for a new access token, while another process retrieves it.
+ACCESS_TOKEN_REFRESH_POLL_INTERVAL = 0.1
+
 # Cache course info from course API.
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
+# Number of seconds during which stale course info is served while it is being refreshed.
+COURSES_API_STALE_CACHE_TIMEOUT = 86400
+# Number of seconds during which courses unknown to the course API are not requested again.
+COURSES_API_NEGATIVE_CACHE_TIMEOUT = 300
+# Maximum number of seconds a process may hold the lock used to refresh a stale cached value.
+CACHE_REFRESH_LOCK_TIMEOUT = 30
+# Maximum number of concurrent calls made to the course API when retrieving several courses.
+COURSES_API_MAX_WORKERS = 5
+
+# Cache the enrollment status of users in courses, retrieved from the enrollment API.
+ENROLLMENT_STATUS_CACHE_TIMEOUT = 300  # Value is in seconds
+
+# Cache the product IDs of catalogs, under the current version of their stock records.
+CATALOG_PRODUCT_IDS_CACHE_TIMEOUT = 3600  # Value is in seconds
+
+# Cache the partner SKUs of the products to switch to between seats and enrollment codes, for each course.
+BASKET_SWITCH_SKUS_CACHE_TIMEOUT = 3600  # Value is in seconds
 
 # PROVIDER DATA PROCESSING
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
@@ -484,6 +519,8 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.org/en/latest/configuration.html#celery-imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.extensions.voucher.tasks',
+    'ecommerce.extensions.fulfillment.tasks',
 )
 
 CELERY_ROUTES = {'ecommerce_worker.fulfillment.v1.tasks.fulfill_order': {'queue': 'fulfillment'},
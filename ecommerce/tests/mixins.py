@@ -17,6 +17,7 @@ from oscar.test import factories
 from social.apps.django_app.default.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.clients import close_sessions
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
@@ -266,6 +267,9 @@ class SiteMixin(object):
         self.request.site = self.site
         set_thread_variable('request', self.request)
 
+        # Connections kept alive by one test must not be reused, possibly mocked, by the next.
+        self.addCleanup(close_sessions)
+
 
 class TestServerUrlMixin(object):
     def get_full_url(self, path, site=None):